@@ -2,19 +2,44 @@
 Admin Reports API - Raporlama & Analitik modülü.
 Sadece ADMIN rolü erişebilir. /api/admin/reports/* altında.
 """
+import json
+import time
+from collections import deque
 from datetime import datetime, timedelta
-
-from django.db.models import Count, Max, Q
-from django.db.models.functions import TruncDay
+from itertools import chain, islice
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import (
+    CharField, Count, DurationField, ExpressionWrapper, F, IntegerField, OuterRef, Q, Subquery, Sum, Value,
+)
+from django.db.models.functions import Coalesce, Concat, NullIf, Trim
+from django.http import FileResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
 
-from .models import User, TeacherProfile, StudentProfile, AuthEventLog
+from .models import (
+    User, TeacherProfile, StudentProfile, AuthEventLog, LoginDailyRollup, ReportJob, UserLastActivity,
+)
 from .permissions import IsAdminOnly
+from .report_cache import TOPIC_AUTH_EVENTS, TOPIC_CATALOG, TOPIC_USERS, ReportCacheMixin, report_cache
+from .report_export import EXPORT_CHUNK_SIZE, EventStreamRenderer, ReportExportMixin, chunked
+from .report_jobs import enqueue, get_report_view
+from .services import estimate_unique_users
+from .utils.auth_event_archive import count_archived_events, has_archived_months, iter_archived_events
+from .utils.auth_event_stream import hub
+from .utils.auth_logging import normalize_attempted_email
+from .utils.client_info import classify_ip, parse_user_agent
+from .utils.risk_scoring import RiskScoringEngine, load_teacher_risk_columns
 from catalog.models import Course
+from shared.utils import InvalidCursor, encode_cursor, estimate_count, keyset_filter_rows, keyset_page
 
 
 def _parse_date_range(request, default_days=30):
@@ -53,11 +78,71 @@ def _parse_date_range(request, default_days=30):
         return default_start, now
 
 
+def _rollup_logins(date_from, date_to):
+    """Tarih aralığındaki LOGIN_SUCCESS rollup satırları (gün granülerliğinde, TIME_ZONE'a göre)."""
+    return LoginDailyRollup.objects.filter(
+        event_type=AuthEventLog.EventType.LOGIN_SUCCESS,
+        day__gte=timezone.localdate(date_from),
+        day__lte=timezone.localdate(date_to),
+    )
+
+
+def _last_logins(user_ids):
+    """user_id -> son LOGIN_SUCCESS zamanı (UserLastActivity, PK ile okunur)."""
+    return dict(
+        UserLastActivity.objects.filter(
+            user_id__in=user_ids, last_login_success_at__isnull=False
+        ).values_list("user_id", "last_login_success_at")
+    )
+
+
 def _teacher_name(user):
     name = f"{user.first_name or ''} {user.last_name or ''}".strip()
     return name or user.email
 
 
+# --- Report cache ---
+class DateRangeReportCacheMixin(ReportCacheMixin):
+    """
+    Rapor önbelleği: date_from / date_to anahtara _parse_date_range ile normalize edilerek girer.
+    Snapshot eşleşmesinde son 30 günü kapsayan aralık (gün bazında) varsayılan sayılır.
+    windowed=True raporlar yalnızca tarih aralığını okur; aralık dışına düşen yeni auth eventler
+    kaydı bayatlatmaz (date_to verilmezse pencere açık uçludur). Son giriş gibi aralıktan bağımsız
+    alan içeren raporlarda her yeni event kaydı bayatlatır. windowed raporların ve aralıktaki
+    girişleri sayan raporların varsayılan penceresi "şimdi"de bittiğinden gece snapshot'ları
+    bugünün eventlerini gizler; bu raporlar snapshot_variants = () ile snapshot'tan servis edilmez.
+    """
+
+    windowed = False
+
+    def get_cache_params(self, request):
+        params = super().get_cache_params(request)
+        date_from, date_to = _parse_date_range(request, 30)
+        for name, value in (("date_from", date_from), ("date_to", date_to)):
+            if name in params:
+                params[name] = value.isoformat()
+        return params
+
+    def get_snapshot_params(self, request):
+        # Tarih aralığı gün bazında varsayılana (son 30 gün, bugün dahil) eşitse yok sayılır
+        params = super().get_snapshot_params(request)
+        date_from, date_to = _parse_date_range(request, 30)
+        today = timezone.localdate()
+        if (
+            timezone.localdate(date_from) == today - timedelta(days=30)
+            and timezone.localdate(date_to) == today
+        ):
+            params.pop("date_from", None)
+            params.pop("date_to", None)
+        return params
+
+    def get_cache_window(self, request):
+        if not self.windowed:
+            return None, None
+        date_from, date_to = _parse_date_range(request, 30)
+        return date_from, (date_to if "date_to" in request.query_params else None)
+
+
 # --- Pagination ---
 class ReportsPagePagination(PageNumberPagination):
     page_size = 20
@@ -66,91 +151,93 @@ class ReportsPagePagination(PageNumberPagination):
 
 
 # --- (1) Teacher Performance ---
-class TeacherPerformanceReportView(APIView):
+class TeacherPerformanceReportView(DateRangeReportCacheMixin, ReportExportMixin, APIView):
     """
     GET /api/admin/reports/teacher-performance/
-    Query: date_from, date_to (ISO), ordering (students_count|logins_count|last_login_at)
+    Query: date_from, date_to (ISO), branch_id, ordering (students_count|logins_count|last_login_at),
+    page, page_size, format (csv|jsonl: akış halinde dışa aktarma, sayfalama yok)
+    Sayaçlar, aralıktaki girişler (rollup alt sorgusu) ve son giriş (UserLastActivity) tek
+    annotate'li sorguda; sıralama ve sayfalama veritabanında yapılır.
 
     Example response:
     {"results": [{"teacher_profile_id": 1, "teacher_user_id": 2, "teacher_name": "Ali Veli",
       "branch_label": "Matematik", "students_count": 5, "logins_count": 42,
-      "last_login_at": "2026-02-16T10:30:00+00:00", "must_change_password_count": 1}]}
+      "last_login_at": "2026-02-16T10:30:00+00:00", "must_change_password_count": 1}],
+     "total": 1, "page": 1, "page_size": 20}
     """
     permission_classes = [IsAuthenticated, IsAdminOnly]
+    pagination_class = ReportsPagePagination
+    export_name = "teacher-performance"
+    snapshot_variants = ()  # logins_count penceresi "şimdi"de biter
 
-    def get(self, request):
+    ORDERINGS = {
+        "students_count": ["students_count", "id"],
+        "logins_count": ["logins_count", "id"],
+        "last_login_at": [F("last_login_at").desc(nulls_last=True), "id"],
+    }
+
+    def get_report(self, request):
         date_from, date_to = _parse_date_range(request, 30)
         branch_id = request.query_params.get("branch_id")
         ordering = request.query_params.get("ordering", "students_count")
 
-        qs = TeacherProfile.objects.select_related("user", "branch").prefetch_related(
-            "students", "students__user"
+        logins_in_range = (
+            _rollup_logins(date_from, date_to)
+            .filter(user_id=OuterRef("user_id"))
+            .order_by()
+            .values("user_id")
+            .annotate(c=Sum("count"))
+            .values("c")
+        )
+        qs = (
+            TeacherProfile.objects.select_related("user", "branch")
+            .annotate(
+                students_count=Count("students"),
+                must_change_password_count=Count(
+                    "students", filter=Q(students__user__must_change_password=True)
+                ),
+                logins_count=Coalesce(Subquery(logins_in_range, output_field=IntegerField()), 0),
+                last_login_at=F("user__last_activity__last_login_success_at"),
+            )
+            .order_by(*self.ORDERINGS.get(ordering, ["id"]))
         )
 
         if branch_id:
             qs = qs.filter(branch_id=branch_id)
 
-        teacher_profiles = list(qs)
-        teacher_user_ids = [tp.user_id for tp in teacher_profiles]
-        login_counts = dict(
-            AuthEventLog.objects.filter(
-                user_id__in=teacher_user_ids,
-                event_type=AuthEventLog.EventType.LOGIN_SUCCESS,
-                created_at__gte=date_from,
-                created_at__lte=date_to,
+        if self.get_export_format():
+            return self.export_response(
+                _teacher_performance_row(tp) for tp in qs.iterator(chunk_size=EXPORT_CHUNK_SIZE)
             )
-            .values("user_id")
-            .annotate(c=Count("id"))
-            .values_list("user_id", "c")
-        )
-        last_logins_raw = (
-            AuthEventLog.objects.filter(
-                user_id__in=teacher_user_ids,
-                event_type=AuthEventLog.EventType.LOGIN_SUCCESS,
-            )
-            .values("user_id")
-            .annotate(created_at=Max("created_at"))
-        )
-        last_logins = {r["user_id"]: r["created_at"] for r in last_logins_raw}
-
-        teachers = []
-        for tp in teacher_profiles:
-            user = tp.user
-            students = list(tp.students.all())
-            students_count = len(students)
-            must_change_password_count = sum(1 for s in students if s.user.must_change_password)
-            logins_count = login_counts.get(user.id, 0)
-            last_login_at = last_logins.get(user.id)
-
-            teachers.append({
-                "teacher_profile_id": tp.id,
-                "teacher_user_id": user.id,
-                "teacher_name": _teacher_name(user),
-                "branch_label": tp.branch.label if tp.branch else None,
-                "students_count": students_count,
-                "logins_count": logins_count,
-                "last_login_at": last_login_at.isoformat() if last_login_at else None,
-                "must_change_password_count": must_change_password_count,
-            })
 
-        valid_orderings = ["students_count", "logins_count", "last_login_at"]
-        if ordering in valid_orderings:
-            reverse = ordering == "last_login_at"
-            teachers.sort(
-                key=lambda x: (x[ordering] or 0) if ordering != "last_login_at" else (x[ordering] or ""),
-                reverse=reverse if ordering != "last_login_at" else True,
-            )
-        if ordering == "last_login_at":
-            teachers.sort(key=lambda x: x["last_login_at"] or "", reverse=True)
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(qs, request, view=self)
+        return Response({
+            "results": [_teacher_performance_row(tp) for tp in page],
+            "total": paginator.page.paginator.count,
+            "page": paginator.page.number,
+            "page_size": paginator.get_page_size(request),
+        })
+
 
-        return Response({"results": teachers})
+def _teacher_performance_row(tp):
+    return {
+        "teacher_profile_id": tp.id,
+        "teacher_user_id": tp.user_id,
+        "teacher_name": _teacher_name(tp.user),
+        "branch_label": tp.branch.label if tp.branch else None,
+        "students_count": tp.students_count,
+        "logins_count": tp.logins_count,
+        "last_login_at": tp.last_login_at.isoformat() if tp.last_login_at else None,
+        "must_change_password_count": tp.must_change_password_count,
+    }
 
 
 # --- (2) Student Progress ---
-class StudentProgressReportView(APIView):
+class StudentProgressReportView(DateRangeReportCacheMixin, ReportExportMixin, APIView):
     """
     GET /api/admin/reports/student-progress/
-    Query: date_from, date_to, teacher_profile_id, search, ordering (last_login_at)
+    Query: date_from, date_to, teacher_profile_id, search, ordering (last_login_at), format (csv|jsonl)
     Progress tablosu yok, progress_percent şimdilik NULL.
 
     Example response:
@@ -161,7 +248,10 @@ class StudentProgressReportView(APIView):
     """
     permission_classes = [IsAuthenticated, IsAdminOnly]
 
-    def get(self, request):
+    export_name = "student-progress"
+    snapshot_defaults = {**ReportCacheMixin.snapshot_defaults, "ordering": "last_login_at"}
+
+    def get_report(self, request):
         date_from, date_to = _parse_date_range(request, 30)
         teacher_profile_id = request.query_params.get("teacher_profile_id")
         search = request.query_params.get("search", "").strip()
@@ -169,7 +259,7 @@ class StudentProgressReportView(APIView):
 
         qs = StudentProfile.objects.select_related(
             "user", "teacher__user", "grade", "target_exam"
-        )
+        ).annotate(last_login=F("user__last_activity__last_login_success_at"))
 
         if teacher_profile_id:
             qs = qs.filter(teacher_id=teacher_profile_id)
@@ -181,114 +271,104 @@ class StudentProgressReportView(APIView):
                 | Q(user__email__icontains=search)
             )
 
-        profiles = list(qs)
-        student_user_ids = [sp.user_id for sp in profiles]
-        last_logins_students = {
-            r["user_id"]: r["created_at"]
-            for r in AuthEventLog.objects.filter(
-                user_id__in=student_user_ids,
-                event_type=AuthEventLog.EventType.LOGIN_SUCCESS,
-            )
-            .values("user_id")
-            .annotate(created_at=Max("created_at"))
-        }
-
-        results = []
-        for sp in profiles:
-            user = sp.user
-            teacher_name = _teacher_name(sp.teacher.user) if sp.teacher else None
-            last_login = last_logins_students.get(user.id)
-
-            results.append({
-                "student_profile_id": sp.id,
-                "student_user_id": user.id,
-                "student_name": _teacher_name(user),
-                "teacher_name": teacher_name,
-                "grade_label": sp.grade.label if sp.grade else None,
-                "target_exam_label": sp.target_exam.label if sp.target_exam else None,
-                "progress_percent": None,  # Enrollment/progress tablosu gerekir
-                "last_login_at": last_login.isoformat() if last_login else None,
-                "must_change_password": user.must_change_password,
-            })
+        # progress_percent henüz hep NULL: sıralama yalnızca last_login_at için anlamlı
+        if ordering == "last_login_at":
+            qs = qs.order_by(F("last_login").desc(nulls_last=True), "id")
 
-        valid_orderings = ["last_login_at", "progress_percent"]
-        if ordering in valid_orderings:
-            reverse = True
-            results.sort(
-                key=lambda x: (x[ordering] or 0) if ordering == "progress_percent" else (x[ordering] or ""),
-                reverse=reverse,
+        if self.get_export_format():
+            return self.export_response(
+                _student_progress_row(sp) for sp in qs.iterator(chunk_size=EXPORT_CHUNK_SIZE)
             )
+        return Response({"results": [_student_progress_row(sp) for sp in qs]})
 
-        return Response({"results": results})
+
+def _student_progress_row(sp):
+    user = sp.user
+    return {
+        "student_profile_id": sp.id,
+        "student_user_id": user.id,
+        "student_name": _teacher_name(user),
+        "teacher_name": _teacher_name(sp.teacher.user) if sp.teacher else None,
+        "grade_label": sp.grade.label if sp.grade else None,
+        "target_exam_label": sp.target_exam.label if sp.target_exam else None,
+        "progress_percent": None,  # Enrollment/progress tablosu gerekir
+        "last_login_at": sp.last_login.isoformat() if sp.last_login else None,
+        "must_change_password": user.must_change_password,
+    }
 
 
 # --- (3) Most Active Teachers ---
-class MostActiveTeachersReportView(APIView):
+class MostActiveTeachersReportView(DateRangeReportCacheMixin, ReportExportMixin, APIView):
     """
     GET /api/admin/reports/most-active-teachers/
-    Query: date_from, date_to, limit (default 10). LOGIN_SUCCESS sayısına göre.
+    Query: date_from, date_to, limit (default 10), format (csv|jsonl).
+    LOGIN_SUCCESS sayısına göre (LoginDailyRollup).
 
     Example response:
     {"results": [{"teacher_profile_id": 1, "teacher_name": "Ali Veli",
       "logins_count": 42, "last_login_at": "2026-02-16T10:30:00+00:00"}]}
     """
     permission_classes = [IsAuthenticated, IsAdminOnly]
+    export_name = "most-active-teachers"
+    snapshot_variants = ()  # giriş sayıları penceresi "şimdi"de biter
 
-    def get(self, request):
+    def get_report(self, request):
         date_from, date_to = _parse_date_range(request, 30)
         limit = int(request.query_params.get("limit", 10))
 
-        qs = (
-            TeacherProfile.objects.filter(user__role=User.Role.TEACHER)
-            .annotate(
-                logins_count=Count(
-                    "user__auth_event_logs",
-                    filter=Q(
-                        user__auth_event_logs__event_type=AuthEventLog.EventType.LOGIN_SUCCESS,
-                        user__auth_event_logs__created_at__gte=date_from,
-                        user__auth_event_logs__created_at__lte=date_to,
-                    ),
-                ),
-                last_login_at=Max(
-                    "user__auth_event_logs__created_at",
-                    filter=Q(
-                        user__auth_event_logs__event_type=AuthEventLog.EventType.LOGIN_SUCCESS
-                    ),
-                ),
-            )
+        top = list(
+            _rollup_logins(date_from, date_to)
+            .filter(user__role=User.Role.TEACHER, user__teacher_profile__isnull=False)
+            .values("user_id")
+            .annotate(logins_count=Sum("count"))
             .filter(logins_count__gt=0)
-            .order_by("-logins_count")[:limit]
-            .select_related("user")
+            .order_by("-logins_count", "user_id")[:limit]
         )
+        profiles = {
+            tp.user_id: tp
+            for tp in TeacherProfile.objects.filter(
+                user_id__in=[r["user_id"] for r in top]
+            ).select_related("user")
+        }
 
-        results = [
-            {
+        last_logins = _last_logins(list(profiles))
+
+        results = []
+        for r in top:
+            tp = profiles.get(r["user_id"])
+            if tp is None:
+                continue
+            last_login_at = last_logins.get(tp.user_id)
+            results.append({
                 "teacher_profile_id": tp.id,
                 "teacher_name": _teacher_name(tp.user),
-                "logins_count": tp.logins_count,
-                "last_login_at": tp.last_login_at.isoformat() if tp.last_login_at else None,
-            }
-            for tp in qs
-        ]
+                "logins_count": r["logins_count"],
+                "last_login_at": last_login_at.isoformat() if last_login_at else None,
+            })
 
+        if self.get_export_format():
+            return self.export_response(results)
         return Response({"results": results})
 
 
 # --- (4) Most Used Courses ---
 # NOT: Gerçek kullanım metriği için enrollment/progress tablosu gerekir.
 # Şu an proxy: topics_count (konu sayısı) + related_teachers_count (branşı eşleşen öğretmen sayısı).
-class MostUsedCoursesReportView(APIView):
+class MostUsedCoursesReportView(DateRangeReportCacheMixin, ReportExportMixin, APIView):
     """
     GET /api/admin/reports/most-used-courses/
-    Query: limit (default 10). Proxy metrik: topics_count, related_teachers_count.
+    Query: limit (default 10), format (csv|jsonl). Proxy metrik: topics_count, related_teachers_count.
 
     Example response:
     {"results": [{"course_id": 1, "course_label": "TYT Matematik", "subject_label": "Matematik",
       "topics_count": 24, "related_teachers_count": 3, "is_proxy_metric": true}]}
     """
     permission_classes = [IsAuthenticated, IsAdminOnly]
+    export_name = "most-used-courses"
+    snapshot_defaults = {**ReportCacheMixin.snapshot_defaults, "limit": "10"}
+    cache_topics = (TOPIC_USERS, TOPIC_CATALOG)
 
-    def get(self, request):
+    def get_report(self, request):
         limit = int(request.query_params.get("limit", 10))
 
         qs = (
@@ -313,70 +393,94 @@ class MostUsedCoursesReportView(APIView):
                 "is_proxy_metric": True,
             })
 
+        if self.get_export_format():
+            return self.export_response(results)
         return Response({"results": results})
 
 
 # --- (5) Daily Logins ---
-class DailyLoginsReportView(APIView):
+class DailyLoginsReportView(DateRangeReportCacheMixin, ReportExportMixin, APIView):
     """
     GET /api/admin/reports/daily-logins/
-    Query: date_from, date_to.
+    Query: date_from, date_to, format (csv|jsonl). LoginDailyRollup'tan okunur (gün granülerliğinde).
+    period_unique_users: aralığın tamamındaki tekil kullanıcı (günlük HyperLogLog sketch'lerinin
+    birleşimi, ~%2 hata); günlük unique_users toplanarak bulunamaz.
 
     Example response:
-    {"results": [{"date": "2026-02-16", "logins": 120, "unique_users": 45}]}
+    {"results": [{"date": "2026-02-16", "logins": 120, "unique_users": 45}], "period_unique_users": 210}
     """
     permission_classes = [IsAuthenticated, IsAdminOnly]
+    export_name = "daily-logins"
+    cache_topics = (TOPIC_AUTH_EVENTS,)
+    windowed = True
+    snapshot_variants = ()
 
-    def get(self, request):
+    def get_report(self, request):
         date_from, date_to = _parse_date_range(request, 30)
 
         qs = (
-            AuthEventLog.objects.filter(
-                event_type=AuthEventLog.EventType.LOGIN_SUCCESS,
-                created_at__gte=date_from,
-                created_at__lte=date_to,
-            )
-            .annotate(date=TruncDay("created_at"))
-            .values("date")
+            _rollup_logins(date_from, date_to)
+            .values("day")
             .annotate(
-                logins=Count("id"),
+                logins=Sum("count"),
                 unique_users=Count("user", distinct=True),
             )
-            .order_by("date")
+            .order_by("day")
         )
 
         results = [
             {
-                "date": r["date"].strftime("%Y-%m-%d"),
+                "date": r["day"].strftime("%Y-%m-%d"),
                 "logins": r["logins"],
                 "unique_users": r["unique_users"],
             }
             for r in qs
         ]
 
-        return Response({"results": results})
+        if self.get_export_format():
+            return self.export_response(results)
+        return Response({
+            "results": results,
+            "period_unique_users": estimate_unique_users(
+                timezone.localdate(date_from), timezone.localdate(date_to)
+            ),
+        })
 
 
 # --- (6) Login Logs (paginated) ---
-class LoginLogsReportView(APIView):
+class LoginLogsReportView(DateRangeReportCacheMixin, ReportExportMixin, APIView):
     """
     GET /api/admin/reports/login-logs/
-    Query: date_from, date_to, event_type, user_id, search, page, page_size.
+    Query: date_from, date_to, event_type, user_id, search, device_family, ip_class,
+    page, page_size, cursor, include_total (estimate|exact), format (csv|jsonl).
+    Aralık arşivlenmiş aylara uzanıyorsa arşiv dosyaları da okunur (sıcak tablodan sonra gelir).
+    format verilirse sayfalama yok: tüm eşleşen satırlar akış halinde yazılır.
+
+    cursor parametresi varsa (ilk sayfa için boş) keyset modu: (created_at, id) üzerinden kesilir,
+    COUNT ve OFFSET yok. Yanıt: {"items", "next_cursor", "has_more", "page_size"}; toplam yalnızca
+    include_total ile eklenir ("total_estimate": planner / rollup tahmini, "total": kesin sayım).
+    page parametreli eski mod geriye dönük uyumluluk için korunur.
 
     Example response:
     {"items": [{"id": 1, "created_at": "2026-02-16T10:30:00+00:00", "event_type": "LOGIN_SUCCESS",
       "user": {"id": 2, "email": "a@b.com", "name": "Ali", "role": "TEACHER"},
-      "ip_address": "127.0.0.1", "user_agent": "Mozilla/5.0...", "meta": null}],
+      "ip_address": "127.0.0.1", "user_agent": "Mozilla/5.0...", "device_family": "DESKTOP",
+      "os": "Windows", "browser": "Chrome", "ip_class": "LOCAL", "via_proxy": false, "meta": null}],
      "total": 100, "page": 1, "page_size": 20}
     """
     permission_classes = [IsAuthenticated, IsAdminOnly]
     pagination_class = ReportsPagePagination
+    export_name = "login-logs"
+    cache_topics = (TOPIC_USERS, TOPIC_AUTH_EVENTS)
+    windowed = True
+    snapshot_variants = ()
 
-    def get(self, request):
+    def get_report(self, request):
         date_from, date_to = _parse_date_range(request, 30)
         event_type = request.query_params.get("event_type")
         user_id = request.query_params.get("user_id")
         search = request.query_params.get("search", "").strip()
+        client = _client_filters(request)
 
         qs = AuthEventLog.objects.select_related("user").order_by("-created_at")
 
@@ -387,178 +491,529 @@ class LoginLogsReportView(APIView):
         if user_id:
             qs = qs.filter(user_id=user_id)
         if search:
-            qs = qs.filter(
-                Q(user__email__icontains=search)
-                | Q(user__first_name__icontains=search)
-                | Q(user__last_name__icontains=search)
-                | Q(meta__email__icontains=search)  # LOGIN_FAIL için meta.email
+            qs = qs.filter(_log_search_q(search))
+        if client:
+            qs = qs.filter(**client)
+
+        if self.get_export_format():
+            rows = chain(
+                qs.iterator(chunk_size=EXPORT_CHUNK_SIZE),
+                _iter_archived_logs(date_from, date_to, event_type, user_id, search, client),
             )
+            return self.export_response(_log_export_row(log) for log in rows)
+
+        if "cursor" in request.query_params:
+            return Response(_keyset_logs(
+                qs, request, date_from, date_to, (event_type, user_id, search, client)
+            ))
+
+        if has_archived_months(date_from, date_to):
+            return Response(_paginate_with_archive(
+                qs, request, date_from, date_to, (event_type, user_id, search, client)
+            ))
 
         paginator = self.pagination_class()
         page = paginator.paginate_queryset(qs, request)
 
-        items = [
-            {
-                "id": log.id,
-                "created_at": log.created_at.isoformat(),
-                "event_type": log.event_type,
-                "user": {
-                    "id": log.user_id,
-                    "email": log.user.email if log.user else None,
-                    "name": _teacher_name(log.user) if log.user else None,
-                    "role": getattr(log.user, "role", None) if log.user else None,
-                }
-                if log.user
-                else None,
-                "ip_address": log.ip_address,
-                "user_agent": log.user_agent,
-                "meta": log.meta,
-            }
-            for log in (page or [])
-        ]
-
         return Response({
-            "items": items,
+            "items": [_log_item(log) for log in (page or [])],
             "total": paginator.page.paginator.count,
             "page": paginator.page.number,
             "page_size": paginator.page.paginator.per_page,
         })
 
 
-# --- (7) Risky Teachers ---
-def _low_login_activity_score(logins_last_14: int) -> float:
-    """0=>1.0, 1-2=>0.6, 3-5=>0.3, 6+=>0.0"""
-    if logins_last_14 == 0:
-        return 1.0
-    if logins_last_14 <= 2:
-        return 0.6
-    if logins_last_14 <= 5:
-        return 0.3
-    return 0.0
-
+def _keyset_logs(qs, request, date_from, date_to, filters):
+    """
+    Login-logs keyset sayfası. Sıcak tablo bittiği sayfada arşivden devam edilir: arşivdeki
+    satırların tamamı sıcak tablodakilerden eski olduğu için aynı (created_at, id) cursor'u geçerlidir.
+    """
+    try:
+        page_size = int(request.query_params.get("page_size", ReportsPagePagination.page_size))
+    except ValueError:
+        page_size = ReportsPagePagination.page_size
+    page_size = max(1, min(page_size, ReportsPagePagination.max_page_size))
+    cursor = request.query_params.get("cursor") or None
 
-class RiskyTeachersReportView(APIView):
+    try:
+        rows, next_cursor = keyset_page(qs, cursor, page_size)
+        if next_cursor is None:
+            archived = keyset_filter_rows(_iter_archived_logs(date_from, date_to, *filters), cursor)
+            rows += list(islice(archived, page_size + 1 - len(rows)))
+            if len(rows) > page_size:
+                rows = rows[:page_size]
+                next_cursor = encode_cursor(rows[-1].created_at, rows[-1].pk)
+    except InvalidCursor as e:
+        raise ValidationError({"cursor": str(e)})
+
+    data = {
+        "items": [_log_item(log) for log in rows],
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None,
+        "page_size": page_size,
+    }
+    include_total = request.query_params.get("include_total")
+    if include_total == "estimate":
+        data["total_estimate"] = _estimate_log_total(qs, date_from, date_to, *filters)
+    elif include_total == "exact":
+        data["total"] = qs.count() + _count_archived_logs(date_from, date_to, *filters)
+    return data
+
+
+def _estimate_log_total(qs, date_from, date_to, event_type, user_id, search, client):
     """
-    GET /api/admin/reports/risky-teachers/
-    Query: date_from, date_to, limit (default 20).
-    Risk skoru: inactive_students_ratio, must_change_password_ratio, low_login_activity.
+    Yaklaşık toplam: PostgreSQL'de planner tahmini; diğerlerinde (search / istemci filtresi yoksa)
+    LoginDailyRollup toplamı. Rollup yalnızca user'ı olan eventleri sayar, gün granülerliğindedir.
+    Tahmin üretilemezse None.
+    """
+    estimate = estimate_count(qs)
+    if estimate is not None or search or client:
+        return estimate
+    rollups = LoginDailyRollup.objects.filter(
+        day__gte=timezone.localdate(date_from), day__lte=timezone.localdate(date_to)
+    )
+    if event_type:
+        rollups = rollups.filter(event_type=event_type)
+    if user_id:
+        rollups = rollups.filter(user_id=user_id)
+    return rollups.aggregate(n=Sum("count"))["n"] or 0
+
+
+def _log_search_q(search):
+    """
+    Log araması: denenen e-postada önek (startswith; PostgreSQL'de db_index'li CharField için
+    oluşan varchar_pattern_ops "_like" indeksi kullanılır, sonuç collation'a bağlı değildir),
+    kullanıcı alanlarında eşleşen user id'leri (user, created_at) indeksine alt sorgu olarak.
+    Arama, yazımdaki gibi normalize_attempted_email ile normalize edilir (bkz. _log_matches).
+    Log satırlarında JSON çözümleme / tam tarama yapılmaz.
+    """
+    prefix = normalize_attempted_email(search)
+    users = User.objects.filter(
+        Q(email__icontains=search)
+        | Q(first_name__icontains=search)
+        | Q(last_name__icontains=search)
+    ).values("id")
+    return Q(attempted_email__startswith=prefix) | Q(user_id__in=users)
+
+
+CLIENT_FILTER_FIELDS = ("device_family", "os", "browser", "ip_class")
+
+
+def _client_filters(request):
+    """device_family / os / browser / ip_class query param'ları -> indeksli kolon filtresi."""
+    return {
+        f: request.query_params[f]
+        for f in CLIENT_FILTER_FIELDS
+        if request.query_params.get(f)
+    }
+
+
+def _client_fields(log):
+    return {
+        "device_family": log.device_family,
+        "os": log.os,
+        "browser": log.browser,
+        "ip_class": log.ip_class,
+        "via_proxy": log.via_proxy,
+    }
+
+
+def _log_item(log):
+    return {
+        "id": log.id,
+        "created_at": log.created_at.isoformat(),
+        "event_type": log.event_type,
+        "user": {
+            "id": log.user_id,
+            "email": log.user.email if log.user else None,
+            "name": _teacher_name(log.user) if log.user else None,
+            "role": getattr(log.user, "role", None) if log.user else None,
+        }
+        if log.user
+        else None,
+        "ip_address": log.ip_address,
+        "user_agent": log.user_agent,
+        **_client_fields(log),
+        "meta": log.meta,
+    }
+
+
+def _log_export_row(log):
+    """Dışa aktarma için düz satır (CSV sütunları)."""
+    user = log.user
+    return {
+        "id": log.id,
+        "created_at": log.created_at.isoformat(),
+        "event_type": log.event_type,
+        "user_id": log.user_id,
+        "user_email": user.email if user else None,
+        "user_name": _teacher_name(user) if user else None,
+        "user_role": getattr(user, "role", None) if user else None,
+        "ip_address": log.ip_address,
+        "user_agent": log.user_agent,
+        **_client_fields(log),
+        "meta": log.meta,
+    }
+
+
+def _fill_client_fields(event):
+    """İstemci kolonlarından önce arşivlenmiş satırlar için sınıfları yerinde hesaplar."""
+    if not event.device_family and event.user_agent:
+        event.device_family, event.os, event.browser = parse_user_agent(event.user_agent)
+    if not event.ip_class and event.ip_address:
+        event.ip_class = classify_ip(event.ip_address)
+        event.via_proxy = "x_forwarded_for" in (event.meta or {})
+    return event
+
+
+def _log_matches(e, event_type, user_id, search, client):
+    """Bellekteki (arşiv / canlı akış) event için login-logs filtreleri; e.user yüklü olmalı."""
+    if event_type and e.event_type != event_type:
+        return False
+    if user_id and str(e.user_id) != str(user_id):
+        return False
+    if any(getattr(e, f) != v for f, v in client.items()):
+        return False
+    if search:
+        u = e.user
+        prefix, needle = normalize_attempted_email(search), search.lower()
+        attempted = e.attempted_email or normalize_attempted_email((e.meta or {}).get("email"))
+        user_fields = [u.email, u.first_name or "", u.last_name or ""] if u else []
+        if not attempted.startswith(prefix) and not any(needle in h.lower() for h in user_fields):
+            return False
+    return True
+
+
+def _iter_archived_logs(date_from, date_to, event_type, user_id, search, client=None):
+    """Arşivlenmiş aylardan aynı filtrelerle eşleşen eventler (yeniden eskiye, user bağlı)."""
+    client = client or {}
+    for events in chunked(iter_archived_events(date_from, date_to)):
+        users = User.objects.in_bulk({e.user_id for e in events if e.user_id})
+        for e in events:
+            _fill_client_fields(e)
+            e.user = users.get(e.user_id) if e.user_id else None
+            if _log_matches(e, event_type, user_id, search, client):
+                yield e
+
+
+def _count_archived_logs(date_from, date_to, event_type, user_id, search, client):
+    """Arşivde eşleşen satır sayısı; user / arama / istemci filtresi yoksa aylık indeksten."""
+    if user_id or search or client:
+        return sum(1 for _ in _iter_archived_logs(date_from, date_to, event_type, user_id, search, client))
+    return count_archived_events(date_from, date_to, event_type)
+
+
+def _paginate_with_archive(qs, request, date_from, date_to, filters):
+    """
+    Sıcak tablo (yeni) + arşiv (eski) ardışık tek liste gibi sayfalanır. Arşiv akış halinde
+    okunur ve sayfanın son satırında bırakılır; arşiv listesi bellekte tutulmaz.
+    """
+    try:
+        page = max(1, int(request.query_params.get("page", 1)))
+        page_size = int(request.query_params.get("page_size", ReportsPagePagination.page_size))
+    except ValueError:
+        page, page_size = 1, ReportsPagePagination.page_size
+    page_size = max(1, min(page_size, ReportsPagePagination.max_page_size))
+
+    hot_count = qs.count()
+    start = (page - 1) * page_size
+    rows = list(qs[start:start + page_size]) if start < hot_count else []
+    if len(rows) < page_size:
+        archive_start = max(0, start - hot_count)
+        archived = _iter_archived_logs(date_from, date_to, *filters)
+        rows += list(islice(archived, archive_start, archive_start + page_size - len(rows)))
+
+    return {
+        "items": [_log_item(log) for log in rows],
+        "total": hot_count + _count_archived_logs(date_from, date_to, *filters),
+        "page": page,
+        "page_size": page_size,
+    }
+
+
+# --- (6a) Login Logs live tail (SSE) ---
+class LoginLogsStreamView(APIView):
+    """
+    GET /api/admin/reports/login-logs/stream/
+    Query: after_id (veya Last-Event-ID header), event_type, user_id, search, device_family, ip_class.
+    text/event-stream: after_id'den sonra yazılan eventler "logs" olayı olarak, login-logs item
+    biçiminde gelir. Yeni satırlar log yazıcısının süreç içi yayınından okunur; COUNT ve sayfa
+    sorgusu yapılmaz. Bağlantı AUTH_EVENT_STREAM_MAX_SECONDS sonra kapanır, istemci son id ile
+    yeniden bağlanır.
+
+    Example event:
+    id: 1042
+    event: logs
+    data: {"items": [{"id": 1042, "event_type": "LOGIN_SUCCESS", ...}]}
     """
     permission_classes = [IsAuthenticated, IsAdminOnly]
+    renderer_classes = [*APIView.renderer_classes, EventStreamRenderer]
 
     def get(self, request):
-        date_from, date_to = _parse_date_range(request, 30)
-        limit = int(request.query_params.get("limit", 20))
-        inactive_days = 14
-        cutoff = timezone.now() - timedelta(days=inactive_days)
+        after_id = request.query_params.get("after_id") or request.headers.get("Last-Event-ID")
+        try:
+            after_id = int(after_id)
+        except (TypeError, ValueError):
+            after_id = AuthEventLog.objects.order_by("-id").values_list("id", flat=True).first() or 0
+        filters = (
+            request.query_params.get("event_type"),
+            request.query_params.get("user_id"),
+            request.query_params.get("search", "").strip(),
+            _client_filters(request),
+        )
 
-        teacher_profiles = list(
-            TeacherProfile.objects.select_related("user", "branch").prefetch_related(
-                "students", "students__user"
-            )
+        response = StreamingHttpResponse(
+            _stream_logs(after_id, filters), content_type="text/event-stream; charset=utf-8"
         )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+
+STREAM_SYNC_BATCH = 500
+
 
-        if not teacher_profiles:
-            return Response({"results": []})
+def _attach_users(events):
+    missing = {e.user_id for e in events if e.user_id and not AuthEventLog.user.is_cached(e)}
+    users = User.objects.in_bulk(missing) if missing else {}
+    for e in events:
+        if e.user_id in users:
+            e.user = users[e.user_id]
 
-        teacher_user_ids = [tp.user_id for tp in teacher_profiles]
-        student_user_ids = []
-        for tp in teacher_profiles:
-            for s in tp.students.all():
-                student_user_ids.append(s.user_id)
 
-        last_login_students = {
-            r["user_id"]: r["created_at"]
-            for r in AuthEventLog.objects.filter(
-                user_id__in=student_user_ids,
-                event_type=AuthEventLog.EventType.LOGIN_SUCCESS,
+def _stream_logs(after_id, filters):
+    """
+    SSE üreteci. Hub'dan gelen eventler (bağlantıdan sonra yayınlananlar, pk sırasından bağımsız)
+    sorgusuz yayınlanır; SYNC_SECONDS'da bir veritabanı taraması başka worker'larda yazılanları
+    (veya tampondan taşanları) yakalar. Tarama id > db_cursor'a ek olarak son taramadan
+    SYNC_OVERLAP_SECONDS öncesine kadar yazılan satırları yeniden okur: başka bir worker'da daha
+    düşük id ile geç commit edilen satır kaçmaz. Aynı id birden çok kez gelirse bir kez gönderilir.
+    """
+    sync_seconds = getattr(settings, "AUTH_EVENT_STREAM_SYNC_SECONDS", 5)
+    heartbeat = getattr(settings, "AUTH_EVENT_STREAM_HEARTBEAT_SECONDS", 15)
+    deadline = time.monotonic() + getattr(settings, "AUTH_EVENT_STREAM_MAX_SECONDS", 300)
+    overlap = timedelta(seconds=getattr(settings, "AUTH_EVENT_STREAM_SYNC_OVERLAP_SECONDS", 60))
+
+    hub_cursor = hub.seq
+    db_cursor = after_id
+    synced_at = None  # son tamamlanan taramanın başladığı an
+    scan, scan_started, scan_after = None, None, 0  # süren tarama: filtre ve id sayfalaması
+    sent_order = deque(maxlen=5000)
+    sent = set()
+    next_sync = time.monotonic()  # bağlanınca after_id'den sonrasını bir kez veritabanından al
+    last_write = time.monotonic()
+
+    yield "retry: 3000\n\n"
+    while True:
+        now = time.monotonic()
+        if now >= deadline:
+            return
+        hub_cursor, events = hub.wait(
+            hub_cursor, max(0, min(next_sync, last_write + heartbeat, deadline) - now)
+        )
+
+        if time.monotonic() >= next_sync:
+            if scan is None:
+                scan, scan_started, scan_after = Q(id__gt=db_cursor), timezone.now(), 0
+                if synced_at is not None:
+                    scan |= Q(created_at__gte=synced_at - overlap)
+            rows = list(
+                AuthEventLog.objects.filter(scan, id__gt=scan_after).order_by("id")[:STREAM_SYNC_BATCH]
             )
-            .values("user_id")
-            .annotate(created_at=Max("created_at"))
-        }
+            if rows:
+                scan_after = rows[-1].pk
+                db_cursor = max(db_cursor, scan_after)
+                events = events + rows
+            if len(rows) == STREAM_SYNC_BATCH:
+                # Taramada daha çok satır var: beklemeden sonraki sayfa
+                next_sync = time.monotonic()
+            else:
+                synced_at, scan = scan_started, None
+                next_sync = time.monotonic() + sync_seconds
+
+        fresh = []
+        for e in events:
+            if e.pk in sent:
+                continue
+            if len(sent_order) == sent_order.maxlen:
+                sent.discard(sent_order[0])
+            sent_order.append(e.pk)
+            sent.add(e.pk)
+            fresh.append(e)
+        _attach_users(fresh)
+        items = [_log_item(e) for e in fresh if _log_matches(e, *filters)]
+
+        if items:
+            items.sort(key=lambda item: item["id"], reverse=True)
+            data = json.dumps({"items": items}, cls=DjangoJSONEncoder, ensure_ascii=False)
+            # Yeniden bağlanma noktası db_cursor: hub, başka worker'ın henüz görülmemiş satırlarını
+            # atlamış olabilir. Tekrar gelen satırları istemci id ile ayıklar.
+            yield f"id: {db_cursor}\nevent: logs\ndata: {data}\n\n"
+            last_write = time.monotonic()
+        elif time.monotonic() - last_write >= heartbeat:
+            yield ": ping\n\n"
+            last_write = time.monotonic()
+
+
+# --- (6b) Login Clients ---
+class LoginClientsReportView(DateRangeReportCacheMixin, ReportExportMixin, APIView):
+    """
+    GET /api/admin/reports/login-clients/
+    Query: date_from, date_to, event_type (varsayılan LOGIN_SUCCESS), group_by
+    (device_family | os | browser | ip_class, varsayılan device_family), format (csv|jsonl).
+    Yazım anında doldurulan indeksli kolonlar üzerinden tek GROUP BY; arşiv okunmaz.
 
-        teacher_logins_14d = dict(
+    Example response:
+    {"group_by": "device_family", "results": [{"value": "DESKTOP", "count": 120, "unique_users": 45}]}
+    """
+    permission_classes = [IsAuthenticated, IsAdminOnly]
+    export_name = "login-clients"
+    snapshot_defaults = {
+        **ReportCacheMixin.snapshot_defaults,
+        "group_by": "device_family",
+        "event_type": AuthEventLog.EventType.LOGIN_SUCCESS,
+    }
+    cache_topics = (TOPIC_AUTH_EVENTS,)
+    windowed = True
+    snapshot_variants = ()
+
+    def get_report(self, request):
+        date_from, date_to = _parse_date_range(request, 30)
+        event_type = request.query_params.get("event_type") or AuthEventLog.EventType.LOGIN_SUCCESS
+        group_by = request.query_params.get("group_by") or "device_family"
+        if group_by not in CLIENT_FILTER_FIELDS:
+            group_by = "device_family"
+
+        qs = (
             AuthEventLog.objects.filter(
-                user_id__in=teacher_user_ids,
-                event_type=AuthEventLog.EventType.LOGIN_SUCCESS,
-                created_at__gte=cutoff,
+                event_type=event_type, created_at__gte=date_from, created_at__lte=date_to
             )
-            .values("user_id")
-            .annotate(c=Count("id"))
-            .values_list("user_id", "c")
+            .values(group_by)
+            .annotate(count=Count("id"), unique_users=Count("user", distinct=True))
+            .order_by("-count", group_by)
         )
+        results = [
+            {"value": r[group_by], "count": r["count"], "unique_users": r["unique_users"]}
+            for r in qs
+        ]
 
-        results = []
-        for tp in teacher_profiles:
-            students = list(tp.students.all())
-            students_count = len(students)
-            if students_count == 0:
-                score = 0.0
-                inactive_ratio = 0.0
-                mcp_ratio = 0.0
-                inactive_count = 0
-                mcp_count = 0
-                teacher_logins = 0
-            else:
-                inactive_count = sum(
-                    1 for s in students
-                    if last_login_students.get(s.user_id) is None or last_login_students[s.user_id] < cutoff
-                )
-                mcp_count = sum(1 for s in students if s.user.must_change_password)
-                inactive_ratio = inactive_count / students_count
-                mcp_ratio = mcp_count / students_count
-                teacher_logins = teacher_logins_14d.get(tp.user_id, 0)
-                low_activity = _low_login_activity_score(teacher_logins)
-                raw_score = (
-                    40 * inactive_ratio +
-                    30 * mcp_ratio +
-                    30 * low_activity
-                )
-                score = max(0.0, min(100.0, raw_score))
+        if self.get_export_format():
+            return self.export_response(results)
+        return Response({"group_by": group_by, "results": results})
+
+
+# --- Rapor önbelleği metrikleri ---
+class ReportCacheStatsView(APIView):
+    """
+    GET /api/admin/reports/cache-stats/
+    Bu süreçteki rapor önbelleği sayaçları (süreç başladığından beri).
 
+    Example response:
+    {"hit": 40, "stale": 2, "miss": 10, "hit_rate": 0.8077, "entries": 12,
+     "by_report": {"DailyLoginsReportView": {"hit": 8, "stale": 0, "miss": 2}}}
+    """
+    permission_classes = [IsAuthenticated, IsAdminOnly]
+
+    def get(self, request):
+        return Response(report_cache.snapshot())
+
+
+# --- (7) Risky Teachers ---
+class RiskyTeachersReportView(DateRangeReportCacheMixin, ReportExportMixin, APIView):
+    """
+    GET /api/admin/reports/risky-teachers/
+    Query: date_from, date_to, limit (default 20), format (csv|jsonl).
+    Risk skoru: inactive_students_ratio, must_change_password_ratio, low_login_activity
+    (ağırlıklar / eşikler: RISKY_TEACHER_WEIGHTS, RISKY_TEACHER_LOGIN_BUCKETS).
+    Skorlama vektörel (accounts/utils/risk_scoring.py); yalnızca ilk <limit> öğretmen nesne olarak yüklenir.
+    Pasiflik ve öğretmen girişleri RISKY_TEACHER_INACTIVE_DAYS penceresinde sayılır: pencere
+    login_window_days alanındadır; teacher_logins_last_14_days adı geriye dönük uyumluluk için
+    korunur ve bu penceredeki giriş sayısını taşır.
+    """
+    permission_classes = [IsAuthenticated, IsAdminOnly]
+    export_name = "risky-teachers"
+    snapshot_variants = ()  # öğretmen girişleri penceresi "şimdi"de biter
+
+    def get_report(self, request):
+        limit = int(request.query_params.get("limit", 20))
+        inactive_days = getattr(settings, "RISKY_TEACHER_INACTIVE_DAYS", 14)
+        cutoff = timezone.now() - timedelta(days=inactive_days)
+
+        columns = load_teacher_risk_columns(cutoff)
+        engine = RiskScoringEngine()
+        risk, inactive_ratio, mcp_ratio = engine.score(columns)
+        top = engine.top(risk, columns, limit)
+
+        profiles = TeacherProfile.objects.select_related("user", "branch").in_bulk(
+            columns["teacher_profile_id"][top].tolist()
+        )
+        results = []
+        for i in top.tolist():
+            tp = profiles.get(int(columns["teacher_profile_id"][i]))
+            if tp is None:  # skorlamadan sonra silinmiş
+                continue
             results.append({
                 "teacher_profile_id": tp.id,
                 "teacher_user_id": tp.user_id,
                 "teacher_name": _teacher_name(tp.user),
                 "branch_label": tp.branch.label if tp.branch else None,
-                "students_count": students_count,
-                "inactive_students_count": inactive_count,
-                "inactive_students_ratio": round(inactive_ratio, 4),
-                "must_change_password_count": mcp_count,
-                "must_change_password_ratio": round(mcp_ratio, 4),
-                "teacher_logins_last_14_days": teacher_logins,
-                "risk_score": round(score, 2),
+                "students_count": int(columns["students_count"][i]),
+                "inactive_students_count": int(columns["inactive_students_count"][i]),
+                "inactive_students_ratio": round(float(inactive_ratio[i]), 4),
+                "must_change_password_count": int(columns["must_change_password_count"][i]),
+                "must_change_password_ratio": round(float(mcp_ratio[i]), 4),
+                "teacher_logins_last_14_days": int(columns["teacher_logins"][i]),
+                "login_window_days": inactive_days,
+                "risk_score": float(risk[i]),
             })
 
-        results.sort(key=lambda x: (-x["risk_score"], -x["students_count"]))
-        return Response({"results": results[:limit]})
+        if self.get_export_format():
+            return self.export_response(results)
+        return Response({"results": results})
 
 
-# --- (8) Inactive Students ---
-class InactiveStudentsReportView(APIView):
+class InactiveStudentsReportView(DateRangeReportCacheMixin, ReportExportMixin, APIView):
     """
     GET /api/admin/reports/inactive-students/
-    Query: days (default 14), teacher_profile_id, search, page, page_size.
+    Query: days (default 14), teacher_profile_id, search, page, page_size, format (csv|jsonl).
     Pasif öğrenci = son <days> gün LOGIN_SUCCESS yok.
+    Pasiflik süresi, sıralama ve LIMIT/OFFSET veritabanında; yanıt süresi sayfa boyutuna bağlıdır.
     """
     permission_classes = [IsAuthenticated, IsAdminOnly]
+    export_name = "inactive-students"
+    snapshot_defaults = {**ReportCacheMixin.snapshot_defaults, "days": "14"}
 
-    def get(self, request):
+    def get_report(self, request):
         days = int(request.query_params.get("days", 14))
         teacher_profile_id = request.query_params.get("teacher_profile_id")
         search = request.query_params.get("search", "").strip()
 
-        cutoff = timezone.now() - timedelta(days=days)
+        now = timezone.now()
+        cutoff = now - timedelta(days=days)
 
-        last_logins = {
-            r["user_id"]: r["created_at"]
-            for r in AuthEventLog.objects.filter(
-                event_type=AuthEventLog.EventType.LOGIN_SUCCESS,
+        # Pasiflik filtresi SQL'de: last_login_success_at üzerinde indeksli aralık taraması.
+        # Hiç giriş yapmamış öğrencinin pasiflik süresi <days> gün sayılır (eski davranış).
+        qs = (
+            StudentProfile.objects.select_related("user", "teacher__user")
+            .annotate(
+                last_login=F("user__last_activity__last_login_success_at"),
+                inactive_for=Coalesce(
+                    ExpressionWrapper(Value(now) - F("last_login"), output_field=DurationField()),
+                    Value(timedelta(days=days), output_field=DurationField()),
+                ),
+                display_name=Coalesce(
+                    NullIf(
+                        Trim(Concat("user__first_name", Value(" "), "user__last_name", output_field=CharField())),
+                        Value(""),
+                    ),
+                    "user__email",
+                    output_field=CharField(),
+                ),
             )
-            .values("user_id")
-            .annotate(created_at=Max("created_at"))
-        }
-
-        qs = StudentProfile.objects.select_related("user", "teacher__user")
+            .filter(Q(last_login__isnull=True) | Q(last_login__lt=cutoff))
+            # En uzun süredir pasif olanlar önce, eşitlikte ada göre
+            .order_by(F("inactive_for").desc(), "display_name", "id")
+        )
 
         if teacher_profile_id:
             qs = qs.filter(teacher_id=teacher_profile_id)
@@ -569,39 +1024,104 @@ class InactiveStudentsReportView(APIView):
                 | Q(user__last_name__icontains=search)
             )
 
-        profiles = list(qs)
-        items = []
-        for sp in profiles:
-            last_login = last_logins.get(sp.user_id)
-            last_login_dt = last_login
-            if last_login is None or last_login < cutoff:
-                days_inactive = days
-                if last_login:
-                    delta = timezone.now() - last_login
-                    days_inactive = delta.days
-                items.append({
-                    "student_profile_id": sp.id,
-                    "student_user_id": sp.user_id,
-                    "student_name": _teacher_name(sp.user),
-                    "teacher_name": _teacher_name(sp.teacher.user) if sp.teacher else None,
-                    "last_login_at": last_login_dt.isoformat() if last_login_dt else None,
-                    "days_inactive": days_inactive,
-                    "must_change_password": sp.user.must_change_password,
-                })
-
-        items.sort(key=lambda x: (-(x["days_inactive"] or 0), x["student_name"] or ""))
-
-        page_num = int(request.query_params.get("page", 1))
+        if self.get_export_format():
+            return self.export_response(
+                _inactive_student_row(sp) for sp in qs.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+            )
+
+        page_num = max(int(request.query_params.get("page", 1)), 1)
         page_size = int(request.query_params.get("page_size", 20))
         page_size = min(page_size, 100)
-        total = len(items)
         start = (page_num - 1) * page_size
-        end = start + page_size
-        page_items = items[start:end]
 
         return Response({
-            "items": page_items,
-            "total": total,
+            "items": [_inactive_student_row(sp) for sp in qs[start:start + page_size]],
+            "total": qs.count(),
             "page": page_num,
             "page_size": page_size,
         })
+
+
+def _inactive_student_row(sp):
+    last_login = sp.last_login
+    return {
+        "student_profile_id": sp.id,
+        "student_user_id": sp.user_id,
+        "student_name": _teacher_name(sp.user),
+        "teacher_name": _teacher_name(sp.teacher.user) if sp.teacher else None,
+        "last_login_at": last_login.isoformat() if last_login else None,
+        "days_inactive": sp.inactive_for.days,
+        "must_change_password": sp.user.must_change_password,
+    }
+
+
+# --- Arka plan rapor işleri ---
+def _report_job_item(job, request):
+    download_url = None
+    if job.status == ReportJob.Status.SUCCEEDED and job.result_file:
+        download_url = request.build_absolute_uri(reverse("admin-report-job-download", args=[job.pk]))
+    return {
+        "id": job.id,
+        "report": job.report,
+        "format": job.format,
+        "params": job.params,
+        "status": job.status,
+        "rows_written": job.rows_written,
+        "attempts": job.attempts,
+        "error": job.error or None,
+        "created_at": job.created_at.isoformat(),
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "download_url": download_url,
+    }
+
+
+class ReportJobListCreateView(APIView):
+    """
+    GET  /api/admin/reports/jobs/  -> son 50 iş
+    POST /api/admin/reports/jobs/  body: {"report": "login-logs", "params": {"date_from": "2025-01-01"},
+    "format": "csv|jsonl|json"} -> 202, iş QUEUED. İşleri run_report_jobs worker'ı çalıştırır.
+    Uzun aralıklar / tam dışa aktarmalar için; rapor mantığı ilgili view'ın get_report'udur.
+    """
+    permission_classes = [IsAuthenticated, IsAdminOnly]
+
+    def get(self, request):
+        jobs = ReportJob.objects.all()[:50]
+        return Response({"results": [_report_job_item(job, request) for job in jobs]})
+
+    def post(self, request):
+        report = request.data.get("report")
+        fmt = request.data.get("format") or ReportJob.Format.CSV
+        params = request.data.get("params") or {}
+        if not report or get_report_view(report) is None:
+            raise ValidationError({"report": "Bilinmeyen rapor."})
+        if fmt not in ReportJob.Format.values:
+            raise ValidationError({"format": "csv, jsonl veya json olmalı."})
+        if not isinstance(params, dict) or any(isinstance(v, (dict, list)) for v in params.values()):
+            raise ValidationError({"params": "Düz anahtar-değer sözlüğü olmalı."})
+        params = {str(k): str(v) for k, v in params.items() if k != "format" and v not in (None, "")}
+        job = enqueue(report, params, fmt, user=request.user)
+        return Response(_report_job_item(job, request), status=status.HTTP_202_ACCEPTED)
+
+
+class ReportJobDetailView(APIView):
+    """GET /api/admin/reports/jobs/<id>/ -> durum, ilerleme (rows_written), download_url."""
+    permission_classes = [IsAuthenticated, IsAdminOnly]
+
+    def get(self, request, pk):
+        return Response(_report_job_item(get_object_or_404(ReportJob, pk=pk), request))
+
+
+class ReportJobDownloadView(APIView):
+    """GET /api/admin/reports/jobs/<id>/download/ -> sonuç dosyası (yalnızca admin, MEDIA üzerinden değil)."""
+    permission_classes = [IsAuthenticated, IsAdminOnly]
+
+    def get(self, request, pk):
+        job = get_object_or_404(ReportJob, pk=pk)
+        if job.status != ReportJob.Status.SUCCEEDED or not job.result_file:
+            raise NotFound("Sonuç dosyası hazır değil.")
+        return FileResponse(
+            job.result_file.open("rb"),
+            as_attachment=True,
+            filename=job.result_file.name.rsplit("/", 1)[-1],
+        )
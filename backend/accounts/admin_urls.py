@@ -12,8 +12,14 @@ from .admin_reports_views import (
     MostUsedCoursesReportView,
     DailyLoginsReportView,
     LoginLogsReportView,
+    LoginLogsStreamView,
+    LoginClientsReportView,
+    ReportCacheStatsView,
     RiskyTeachersReportView,
     InactiveStudentsReportView,
+    ReportJobListCreateView,
+    ReportJobDetailView,
+    ReportJobDownloadView,
 )
 
 urlpatterns = [
@@ -25,6 +31,16 @@ urlpatterns = [
     path("reports/most-used-courses/", MostUsedCoursesReportView.as_view()),
     path("reports/daily-logins/", DailyLoginsReportView.as_view()),
     path("reports/login-logs/", LoginLogsReportView.as_view()),
+    path("reports/login-logs/stream/", LoginLogsStreamView.as_view()),
+    path("reports/login-clients/", LoginClientsReportView.as_view()),
+    path("reports/cache-stats/", ReportCacheStatsView.as_view()),
     path("reports/risky-teachers/", RiskyTeachersReportView.as_view()),
     path("reports/inactive-students/", InactiveStudentsReportView.as_view()),
+    path("reports/jobs/", ReportJobListCreateView.as_view()),
+    path("reports/jobs/<int:pk>/", ReportJobDetailView.as_view()),
+    path(
+        "reports/jobs/<int:pk>/download/",
+        ReportJobDownloadView.as_view(),
+        name="admin-report-job-download",
+    ),
 ]
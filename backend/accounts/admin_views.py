@@ -10,7 +10,9 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
-from .models import User, TeacherProfile, StudentProfile
+from shared.utils import HyperLogLog
+
+from .models import User, TeacherProfile, StudentProfile, AuthEventLog, LoginDailySketch
 from .permissions import IsAdminOnly
 
 
@@ -91,37 +93,55 @@ def _students_per_teacher():
     return result
 
 
-def _weekly_active_trend():
-    """
-    Son 8 hafta için haftalık aktiflik trendi.
+def _daily_login_sketches(days):
+    """Son N günün LOGIN_SUCCESS sketch'leri: {gün: HyperLogLog} (tek sorgu)."""
+    since = timezone.localdate() - timedelta(days=days - 1)
+    return {
+        day: HyperLogLog.from_bytes(registers)
+        for day, registers in LoginDailySketch.objects.filter(
+            event_type=AuthEventLog.EventType.LOGIN_SUCCESS, day__gte=since
+        ).values_list("day", "registers")
+    }
+
+
+def _unique_between(sketches, first_day, last_day):
+    merged = HyperLogLog()
+    for day, sketch in sketches.items():
+        if first_day <= day <= last_day:
+            merged.merge(sketch)
+    return merged.count()
 
-    FALLBACK: Login/API log tablosu yok - şimdilik haftalık yeni kayıt sayısı
-    kullanılıyor. İleride UserLoginLog veya ApiAccessLog tablosu eklendiğinde
-    bu fonksiyon içinde sadece sorguyu değiştirmek yeterli olacak.
+
+def _weekly_active_trend(sketches):
     """
-    # TODO: Login log tablosu geldiğinde burayı güncelle.
-    # Örnek: UserLoginLog.objects.filter(created_at__range=(start, end)).values('user').distinct().count()
-    now = timezone.now()
+    Son 8 hafta için haftalık tekil aktif kullanıcı (giriş yapan).
+    Günlük HyperLogLog sketch'leri hafta penceresinde birleştirilir (yaklaşık, ~%2 hata).
+    """
+    today = timezone.localdate()
     result = []
 
     for i in range(7, -1, -1):
-        # ISO week: Pazartesi başlangıç
-        week_end = now - timedelta(weeks=i)
-        week_start = week_end - timedelta(days=7)
-
-        # Haftalık yeni kayıt sayısı (fallback)
-        count = User.objects.filter(
-            created_at__gte=week_start,
-            created_at__lt=week_end,
-        ).count()
-
+        week_end = today - timedelta(weeks=i)
+        week_start = week_end - timedelta(days=6)
         year, week, _ = week_start.isocalendar()
-        week_str = f"{year}-W{week:02d}"
-        result.append({"week": week_str, "count": count})
+        result.append({
+            "week": f"{year}-W{week:02d}",
+            "count": _unique_between(sketches, week_start, week_end),
+        })
 
     return result
 
 
+def _active_users(sketches):
+    """DAU / WAU / MAU (bugün, son 7 gün, son 30 gün) - sketch birleşimi."""
+    today = timezone.localdate()
+    return {
+        "dau": _unique_between(sketches, today, today),
+        "wau": _unique_between(sketches, today - timedelta(days=6), today),
+        "mau": _unique_between(sketches, today - timedelta(days=29), today),
+    }
+
+
 class DashboardAnalyticsView(APIView):
     """
     GET /api/admin/analytics/dashboard/
@@ -169,7 +189,9 @@ class DashboardAnalyticsView(APIView):
         monthly_new_users = _monthly_new_users()
         role_distribution = _role_distribution()
         students_per_teacher = _students_per_teacher()
-        weekly_active_trend = _weekly_active_trend()
+        sketches = _daily_login_sketches(days=56)
+        weekly_active_trend = _weekly_active_trend(sketches)
+        active_users = _active_users(sketches)
 
         return Response({
             "total_users": total_users,
@@ -182,4 +204,5 @@ class DashboardAnalyticsView(APIView):
             "role_distribution": role_distribution,
             "students_per_teacher": students_per_teacher,
             "weekly_active_trend": weekly_active_trend,
+            "active_users": active_users,
         })
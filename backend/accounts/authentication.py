@@ -2,21 +2,166 @@
 JWT Authentication with token_version validation.
 Logout-all işlemi token_version'ı artırır; eski tokenlar geçersiz olur.
 """
+from django.conf import settings
+from rest_framework.authentication import BaseAuthentication, SessionAuthentication
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
+from .utils import token_denylist, token_version
+
+
+def add_user_claims(token, user):
+    """Token'a token_version ve claims-only mod için gereken yetki alanlarını ekler."""
+    token["token_version"] = getattr(user, "token_version", 0)
+    token["role"] = getattr(user, "role", None)
+    token["is_approved"] = getattr(user, "is_approved", False)
+    token["is_staff"] = user.is_staff
+    token["is_superuser"] = user.is_superuser
+    return token
+
+
+def _version_mismatch():
+    return AuthenticationFailed(
+        _("Token geçersiz. Lütfen tekrar giriş yapın."),
+        code="token_version_mismatch",
+    )
+
+
+class ClaimsUser(TokenUser):
+    """
+    JWT claim'lerinden kurulan hafif user (DB satırı yok).
+    role / is_approved / is_staff / is_superuser claim'lerden okunur.
+    """
+
+    @cached_property
+    def id(self):
+        user_id = self.token[api_settings.USER_ID_CLAIM]
+        try:
+            return int(user_id)
+        except (TypeError, ValueError):
+            return user_id
+
+    @cached_property
+    def is_approved(self):
+        return bool(self.token.get("is_approved", False))
+
 
 class TRJWTAuthentication(JWTAuthentication):
-    """Access token doğrulamasında token_version kontrolü yapar."""
+    """
+    Access token doğrulamasında jti denylist ve token_version kontrolü yapar.
+    user_select_related verilirse user satırı ilişkileriyle tek sorguda yüklenir.
+    """
 
-    def get_user(self, validated_token):
-        user = super().get_user(validated_token)
-        token_version = validated_token.get("token_version", 0)
-        user_version = getattr(user, "token_version", 0)
-        if token_version != user_version:
+    user_select_related = ()
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        if token_denylist.is_token_revoked(validated_token):
             raise AuthenticationFailed(
-                _("Token geçersiz. Lütfen tekrar giriş yapın."),
-                code="token_version_mismatch",
+                _("Oturum sonlandırıldı. Lütfen tekrar giriş yapın."),
+                code="token_revoked",
             )
+        return validated_token
+
+    def _get_user_row(self, validated_token):
+        if not self.user_select_related:
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+        try:
+            user = self.user_model.objects.select_related(*self.user_select_related).get(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
+
+    def get_user(self, validated_token):
+        user = self._get_user_row(validated_token)
+        token_version_claim = validated_token.get("token_version", 0)
+        user_version = getattr(user, "token_version", 0)
+        if token_version_claim != user_version:
+            raise _version_mismatch()
+        # Satır zaten yüklendi: claims-only ve refresh yolları için önbelleği ısıt
+        token_version.remember_user(user)
+        return user
+
+
+class TRJWTClaimsAuthentication(TRJWTAuthentication):
+    """
+    Claims-only mod: okuma isteklerinde (GET/HEAD/OPTIONS) users tablosuna gidilmez.
+    token_version ve is_active önbellekten kontrol edilir, request.user bir ClaimsUser olur.
+    Yazma isteklerinde tam User satırı yüklenir.
+
+    Not: role/is_approved claim'leri login anındaki değerlerdir; değişiklikler yeniden
+    girişte (veya token_version artırıldığında) yansır.
+    """
+
+    def authenticate(self, request):
+        self._safe_request = request.method in SAFE_METHODS
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        if not getattr(self, "_safe_request", False) or "role" not in validated_token:
+            return super().get_user(validated_token)
+
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = ClaimsUser(validated_token)
+        state = token_version.get_auth_state(user.id)
+        if state is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        current_version, is_active = state
+        if not is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if validated_token.get("token_version", 0) != current_version:
+            raise _version_mismatch()
         return user
+
+
+class TRRoutingAuthentication(BaseAuthentication):
+    """
+    Varsayılan kimlik doğrulama: Authorization header'ına göre yönlendirir.
+    Bearer token varsa doğrudan JWT doğrulanır (session hiç çözülmez).
+    SessionAuthentication yalnızca SESSION_AUTH_PATH_PREFIXES (varsayılan /admin/)
+    altındaki isteklerde denenir.
+    """
+
+    jwt_class = TRJWTAuthentication
+    session_class = SessionAuthentication
+
+    def __init__(self):
+        self.jwt = self.jwt_class()
+        self.session_prefixes = tuple(getattr(settings, "SESSION_AUTH_PATH_PREFIXES", ("/admin/",)))
+
+    def authenticate(self, request):
+        header = self.jwt.get_header(request)
+        if header is not None and self.jwt.get_raw_token(header) is not None:
+            return self.jwt.authenticate(request)
+        if request.path.startswith(self.session_prefixes):
+            return self.session_class().authenticate(request)
+        return None
+
+    def authenticate_header(self, request):
+        # 401 + WWW-Authenticate: Bearer (session'a düşmediği için 403 yerine)
+        return self.jwt.authenticate_header(request)
+
+
+class TRProfileJWTAuthentication(TRJWTAuthentication):
+    user_select_related = ("approved_by",)
+
+
+class TRProfileAuthentication(TRRoutingAuthentication):
+    """/auth/me/ için: approved_by user satırıyla aynı sorguda gelir."""
+
+    jwt_class = TRProfileJWTAuthentication
@@ -0,0 +1,25 @@
+"""
+Şifre hash politikası.
+Tercih edilen algoritma PASSWORD_HASHERS listesinin ilk elemanıdır; PBKDF2 iteration
+sayısı PASSWORD_HASH_ITERATIONS ayarından okunur (None = Django varsayılanı).
+Politika değişince Django, kullanıcının bir sonraki başarılı login'inde şifreyi
+yeni ayarlarla yeniden hash'ler (check_password -> must_update -> setter).
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, PBKDF2SHA1PasswordHasher
+
+
+def _configured_iterations(default):
+    return getattr(settings, "PASSWORD_HASH_ITERATIONS", None) or default
+
+
+class TRPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return _configured_iterations(PBKDF2PasswordHasher.iterations)
+
+
+class TRPBKDF2SHA1PasswordHasher(PBKDF2SHA1PasswordHasher):
+    @property
+    def iterations(self):
+        return _configured_iterations(PBKDF2SHA1PasswordHasher.iterations)
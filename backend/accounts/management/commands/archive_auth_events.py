@@ -0,0 +1,49 @@
+"""
+Management command: saklama süresinden eski AuthEventLog satırlarını aylık gzip JSONL
+arşivine taşır ve sıcak tablodan siler. Günlük cron ile çalıştırılabilir.
+
+Örnek: python manage.py archive_auth_events --days 90 --batch-size 5000
+"""
+from django.core.management.base import BaseCommand
+
+from accounts.models import AuthEventLog
+from accounts.utils.auth_event_archive import archive_events, get_archive_cutoff, get_archive_dir
+
+
+class Command(BaseCommand):
+    help = "Eski auth event loglarını gzip JSONL arşivine taşır ve tablodan siler."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help="Saklama süresi (gün). Varsayılan: AUTH_EVENT_LOG_RETENTION_DAYS.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            default=None,
+            help="Tek çalışmada işlenecek en fazla batch (varsayılan: sınırsız).",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Yalnızca sayıyı göster.")
+
+    def handle(self, *args, **options):
+        cutoff = get_archive_cutoff(options["days"])
+        if options["dry_run"]:
+            count = AuthEventLog.objects.filter(created_at__lt=cutoff).count()
+            self.stdout.write(f"{cutoff.isoformat()} öncesi {count} satır arşivlenecek.")
+            return
+
+        moved, batches = archive_events(
+            cutoff, batch_size=options["batch_size"], max_batches=options["max_batches"]
+        )
+        if moved:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{moved} satır {batches} batch'te {get_archive_dir()} altına arşivlendi."
+                )
+            )
+        else:
+            self.stdout.write("Arşivlenecek satır yok.")
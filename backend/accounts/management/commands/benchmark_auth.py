@@ -0,0 +1,110 @@
+"""
+Management command: API kimlik doğrulama katmanının istek başı gecikmesini ölçer.
+Eski zincir (SessionAuthentication + TRJWTAuthentication) ile TRRoutingAuthentication'ı
+aynı Bearer isteği (tarayıcıda session cookie'si de varken) üzerinde karşılaştırır.
+Geçici kullanıcı ve session transaction içinde oluşturulur ve geri alınır.
+"""
+import statistics
+import time
+
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.authentication import TRJWTAuthentication, TRRoutingAuthentication, add_user_claims
+from accounts.management.utils import rolled_back
+from accounts.models import User
+
+
+def _make_view(auth_classes):
+    class BenchView(APIView):
+        authentication_classes = auth_classes
+        permission_classes = [IsAuthenticated]
+
+        def get(self, request):
+            return Response({"ok": True})
+
+    return BenchView.as_view()
+
+
+VARIANTS = [
+    ("session+jwt (eski)", [SessionAuthentication, TRJWTAuthentication]),
+    ("routing", [TRRoutingAuthentication]),
+]
+
+
+class Command(BaseCommand):
+    help = "Kimlik doğrulama katmanı için istek başı gecikme (önce/sonra) ölçer."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--warmup", type=int, default=200)
+        parser.add_argument("--path", default="/api/health/")
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            self._run(options)
+
+    def _run(self, options):
+        user = User.objects.create_user(
+            email="bench-auth@edumath.local", password="bench-pass-123", is_approved=True
+        )
+        access = str(add_user_claims(RefreshToken.for_user(user), user).access_token)
+
+        # SPA ile aynı domainde admin'e giriş yapmış bir tarayıcıyı taklit et
+        session = SessionStore()
+        session[SESSION_KEY] = str(user.pk)
+        session[BACKEND_SESSION_KEY] = "django.contrib.auth.backends.ModelBackend"
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.create()
+
+        factory = RequestFactory()
+        middleware = [
+            SessionMiddleware(lambda r: None),
+            AuthenticationMiddleware(lambda r: None),
+        ]
+
+        def make_request():
+            request = factory.get(options["path"], HTTP_AUTHORIZATION=f"Bearer {access}")
+            request.COOKIES[settings.SESSION_COOKIE_NAME] = session.session_key
+            for mw in middleware:
+                mw.process_request(request)
+            return request
+
+        self.stdout.write(f"{options['requests']} istek, path={options['path']}")
+        for label, auth_classes in VARIANTS:
+            view = _make_view(auth_classes)
+            for _ in range(options["warmup"]):
+                view(make_request())
+
+            with CaptureQueriesContext(connection) as ctx:
+                response = view(make_request())
+            if response.status_code != 200:
+                self.stderr.write(f"{label}: beklenmeyen durum {response.status_code}")
+                continue
+            queries = len(ctx.captured_queries)
+
+            samples = []
+            for _ in range(options["requests"]):
+                request = make_request()
+                t0 = time.perf_counter()
+                view(request)
+                samples.append((time.perf_counter() - t0) * 1e6)
+            samples.sort()
+            self.stdout.write(
+                f"{label:<20} ort={statistics.mean(samples):8.1f}µs "
+                f"p50={samples[len(samples) // 2]:8.1f}µs "
+                f"p95={samples[int(len(samples) * 0.95)]:8.1f}µs "
+                f"sorgu/istek={queries}"
+            )
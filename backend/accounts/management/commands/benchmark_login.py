@@ -0,0 +1,78 @@
+"""
+Management command: login (authenticate) throughput'unu çekirdek başına ölçer.
+Her PBKDF2 iteration değeri için geçici kullanıcılar seed edilir, ModelBackend üzerinden
+authenticate() tek thread'de çalıştırılır. Seed verisi transaction sonunda geri alınır.
+
+Örnek: python manage.py benchmark_login --iterations 390000,600000,1000000 --logins 50
+"""
+import os
+import statistics
+import time
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from accounts.management.utils import rolled_back
+from accounts.models import User
+
+BENCH_PASSWORD = "Bench-Pass-2026!"
+
+
+class Command(BaseCommand):
+    help = "Şifre hash maliyetine göre çekirdek başına login throughput'unu ölçer."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            default="",
+            help="Virgülle ayrılmış PBKDF2 iteration değerleri (boş: mevcut ayar).",
+        )
+        parser.add_argument("--users", type=int, default=20, help="Seed edilecek kullanıcı sayısı.")
+        parser.add_argument("--logins", type=int, default=50, help="Her değer için login sayısı.")
+
+    def handle(self, *args, **options):
+        try:
+            values = [int(v) for v in options["iterations"].split(",") if v.strip()]
+        except ValueError:
+            raise CommandError("--iterations tam sayı listesi olmalı (ör. 600000,1000000).")
+        if not values:
+            values = [None]
+
+        hasher = get_hasher()
+        cores = os.cpu_count() or 1
+        self.stdout.write(
+            f"hasher={hasher.algorithm} kullanıcı={options['users']} login={options['logins']} "
+            f"çekirdek={cores}"
+        )
+
+        for value in values:
+            with override_settings(PASSWORD_HASH_ITERATIONS=value), rolled_back():
+                self._bench(value, options, cores)
+
+    def _bench(self, value, options, cores):
+        iterations = getattr(get_hasher(), "iterations", None)
+        encoded = make_password(BENCH_PASSWORD)
+        users = User.objects.bulk_create(
+            User(email=f"bench-login-{i}@edumath.local", password=encoded, is_approved=True)
+            for i in range(options["users"])
+        )
+
+        samples = []
+        for i in range(options["logins"]):
+            email = users[i % len(users)].email
+            t0 = time.perf_counter()
+            user = authenticate(email=email, password=BENCH_PASSWORD)
+            samples.append(time.perf_counter() - t0)
+            if user is None:
+                raise CommandError("Seed kullanıcısı doğrulanamadı.")
+
+        samples.sort()
+        mean = statistics.mean(samples)
+        per_core = 1 / mean if mean else 0
+        self.stdout.write(
+            f"iterations={iterations or '-':>9} "
+            f"ort={mean * 1000:7.1f}ms p95={samples[int(len(samples) * 0.95)] * 1000:7.1f}ms "
+            f"login/sn/çekirdek={per_core:6.1f} tahmini toplam={per_core * cores:7.1f}/sn"
+        )
@@ -0,0 +1,153 @@
+"""
+Management command: riskli öğretmen skorlamasını ölçer (varsayılan 10k öğretmen).
+Eski yol (öğrencileri prefetch edip öğretmen başı Python döngüsü + tam sıralama) ile
+vektörel motor (aggregate sütunlar + NumPy + argpartition) aynı seed verisinde karşılaştırılır.
+Seed verisi transaction sonunda geri alınır.
+
+Örnek: python manage.py benchmark_risk_scoring --teachers 10000 --students-per-teacher 3
+"""
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.management.utils import rolled_back
+from accounts.models import AuthEventLog, StudentProfile, TeacherProfile, User, UserLastActivity
+from accounts.utils.risk_scoring import DEFAULT_LOGIN_BUCKETS, DEFAULT_WEIGHTS, RiskScoringEngine, load_teacher_risk_columns
+
+
+def _legacy_low_login(logins):
+    for limit, score in DEFAULT_LOGIN_BUCKETS:
+        if logins <= limit:
+            return score
+    return 0.0
+
+
+def _legacy_top(cutoff, limit):
+    """Vektörel motordan önceki uygulama (karşılaştırma için)."""
+    profiles = list(TeacherProfile.objects.prefetch_related("students", "students__user"))
+    student_ids = [s.user_id for tp in profiles for s in tp.students.all()]
+    last_logins = dict(
+        UserLastActivity.objects.filter(user_id__in=student_ids, last_login_success_at__isnull=False)
+        .values_list("user_id", "last_login_success_at")
+    )
+    teacher_logins = {}
+    for user_id in AuthEventLog.objects.filter(
+        user_id__in=[tp.user_id for tp in profiles],
+        event_type=AuthEventLog.EventType.LOGIN_SUCCESS,
+        created_at__gte=cutoff,
+    ).values_list("user_id", flat=True):
+        teacher_logins[user_id] = teacher_logins.get(user_id, 0) + 1
+    results = []
+    for tp in profiles:
+        students = list(tp.students.all())
+        score = 0.0
+        if students:
+            inactive = sum(1 for s in students if last_logins.get(s.user_id) is None or last_logins[s.user_id] < cutoff)
+            mcp = sum(1 for s in students if s.user.must_change_password)
+            score = min(100.0, (
+                DEFAULT_WEIGHTS["inactive_students"] * inactive / len(students)
+                + DEFAULT_WEIGHTS["must_change_password"] * mcp / len(students)
+                + DEFAULT_WEIGHTS["low_login_activity"] * _legacy_low_login(teacher_logins.get(tp.user_id, 0))
+            ))
+        results.append((round(score, 2), len(students), tp.id))
+    results.sort(key=lambda x: (-x[0], -x[1]))
+    return [teacher_id for _, _, teacher_id in results[:limit]]
+
+
+def _vectorised_top(cutoff, limit):
+    columns = load_teacher_risk_columns(cutoff)
+    engine = RiskScoringEngine()
+    risk, _, _ = engine.score(columns)
+    return columns["teacher_profile_id"][engine.top(risk, columns, limit)].tolist()
+
+
+class Command(BaseCommand):
+    help = "Riskli öğretmen skorlaması için eski döngü ile vektörel motoru karşılaştırır."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--teachers", type=int, default=10000)
+        parser.add_argument("--students-per-teacher", type=int, default=3)
+        parser.add_argument("--limit", type=int, default=20)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            self._run(options)
+
+    def _seed(self, teachers, per_teacher):
+        rng = random.Random(42)
+        now = timezone.now()
+        password = make_password("bench-pass-123")
+        teacher_users = User.objects.bulk_create(
+            [User(email=f"bench-risk-t{i}@edumath.local", password=password) for i in range(teachers)],
+            batch_size=2000,
+        )
+        profiles = TeacherProfile.objects.bulk_create(
+            [TeacherProfile(user=u) for u in teacher_users], batch_size=2000
+        )
+        student_users = User.objects.bulk_create(
+            [
+                User(
+                    email=f"bench-risk-s{i}@edumath.local",
+                    password=password,
+                    must_change_password=rng.random() < 0.2,
+                )
+                for i in range(teachers * per_teacher)
+            ],
+            batch_size=2000,
+        )
+        StudentProfile.objects.bulk_create(
+            [StudentProfile(user=u, teacher=profiles[i // per_teacher]) for i, u in enumerate(student_users)],
+            batch_size=2000,
+        )
+        UserLastActivity.objects.bulk_create(
+            [
+                UserLastActivity(user=u, last_login_success_at=now - timedelta(days=rng.randint(0, 40)))
+                for u in student_users
+                if rng.random() < 0.7
+            ],
+            batch_size=2000,
+        )
+        AuthEventLog.objects.bulk_create(
+            [
+                AuthEventLog(user=u, event_type=AuthEventLog.EventType.LOGIN_SUCCESS, created_at=now)
+                for u in teacher_users
+                for _ in range(rng.choice((0, 0, 1, 3, 8)))
+            ],
+            batch_size=2000,
+        )
+
+    def _run(self, options):
+        self.stdout.write(
+            f"seed: {options['teachers']} öğretmen x {options['students_per_teacher']} öğrenci ..."
+        )
+        self._seed(options["teachers"], options["students_per_teacher"])
+        cutoff = timezone.now() - timedelta(days=14)
+
+        outputs = {}
+        for label, fn in (("eski (döngü)", _legacy_top), ("vektörel", _vectorised_top)):
+            samples = []
+            try:
+                for _ in range(options["repeat"]):
+                    with CaptureQueriesContext(connection) as ctx:
+                        t0 = time.perf_counter()
+                        outputs[label] = fn(cutoff, options["limit"])
+                        samples.append((time.perf_counter() - t0) * 1000)
+            except DatabaseError as exc:
+                # Eski yol büyük prefetch IN listelerinde SQLite sınırlarına takılabiliyor
+                self.stdout.write(f"{label:<14} başarısız: {exc}")
+                continue
+            self.stdout.write(
+                f"{label:<14} ort={statistics.mean(samples):9.1f}ms "
+                f"min={min(samples):9.1f}ms sorgu={len(ctx.captured_queries)}"
+            )
+
+        if len(outputs) == 2 and outputs["eski (döngü)"] != outputs["vektörel"]:
+            self.stderr.write("UYARI: iki yolun top-N sonucu farklı.")
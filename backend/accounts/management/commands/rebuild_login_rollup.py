@@ -0,0 +1,84 @@
+"""
+Management command: LoginDailyRollup ve LoginDailySketch tablolarını AuthEventLog'dan yeniden üretir.
+İlk kurulumda (backfill) veya tutarsızlık şüphesinde çalıştırılır.
+--days verilirse yalnızca son N gün silinip yeniden hesaplanır. Verilmezse sıcak tablodaki
+en eski günden itibaren hesaplanır; arşivlenmiş günlerin rollup satırlarına dokunulmaz.
+Toplama SQL'de (gün, user, event tipi) bazında yapılır; yoğun trafikte değil, sakin saatte çalıştırın.
+"""
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Min
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from accounts.models import AuthEventLog, LoginDailyRollup, LoginDailySketch
+from shared.utils import HyperLogLog
+
+BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = "LoginDailyRollup ve tekil kullanıcı sketch'lerini auth event loglarından yeniden oluşturur."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help="Yalnızca son N günü yeniden hesapla (varsayılan: sıcak tablonun tamamı).",
+        )
+
+    def handle(self, *args, **options):
+        days = options["days"]
+        rollups = LoginDailyRollup.objects.all()
+        sketches_qs = LoginDailySketch.objects.all()
+        events = AuthEventLog.objects.filter(user__isnull=False)
+        if days is not None:
+            start_day = timezone.localdate() - timedelta(days=days)
+        else:
+            oldest = AuthEventLog.objects.aggregate(m=Min("created_at"))["m"]
+            start_day = timezone.localdate(oldest) if oldest else timezone.localdate()
+        start = timezone.make_aware(datetime.combine(start_day, datetime.min.time()))
+        rollups = rollups.filter(day__gte=start_day)
+        sketches_qs = sketches_qs.filter(day__gte=start_day)
+        events = events.filter(created_at__gte=start)
+
+        rows = (
+            events.annotate(day=TruncDate("created_at"))
+            .values("day", "user_id", "event_type")
+            .annotate(c=Count("id"))
+            .order_by()
+        )
+
+        created = 0
+        sketches = {}
+        with transaction.atomic():
+            deleted, _ = rollups.delete()
+            sketches_qs.delete()
+            batch = []
+            for r in rows.iterator(chunk_size=BATCH_SIZE):
+                sketches.setdefault((r["day"], r["event_type"]), HyperLogLog()).add(r["user_id"])
+                batch.append(
+                    LoginDailyRollup(
+                        day=r["day"], user_id=r["user_id"], event_type=r["event_type"], count=r["c"]
+                    )
+                )
+                if len(batch) >= BATCH_SIZE:
+                    LoginDailyRollup.objects.bulk_create(batch)
+                    created += len(batch)
+                    batch = []
+            if batch:
+                LoginDailyRollup.objects.bulk_create(batch)
+                created += len(batch)
+            LoginDailySketch.objects.bulk_create(
+                LoginDailySketch(day=day, event_type=event_type, registers=sketch.to_bytes())
+                for (day, event_type), sketch in sketches.items()
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{deleted} rollup satırı silindi, {created} satır ve {len(sketches)} sketch yeniden oluşturuldu."
+            )
+        )
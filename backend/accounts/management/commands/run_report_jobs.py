@@ -0,0 +1,71 @@
+"""
+Management command: ReportJob kuyruğunu işleyen worker.
+Sürekli çalışır (systemd / supervisor), --once ile kuyruk boşalınca çıkar (cron).
+--workers N: N thread aynı kuyruğu işler; işler koşullu UPDATE ile sahiplenildiği için
+birden fazla süreç de güvenle çalıştırılabilir.
+
+Örnek: python manage.py run_report_jobs --workers 2
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from accounts.report_jobs import claim_next, requeue_stale, run_job
+
+
+class Command(BaseCommand):
+    help = "Arka plan rapor işlerini (ReportJob) çalıştırır."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=1)
+        parser.add_argument("--once", action="store_true", help="Kuyruk boşalınca çık.")
+        parser.add_argument(
+            "--poll",
+            type=float,
+            default=None,
+            help="Boş kuyrukta bekleme süresi (sn, varsayılan REPORT_JOB_POLL_SECONDS).",
+        )
+
+    def handle(self, *args, **options):
+        poll = options["poll"] or getattr(settings, "REPORT_JOB_POLL_SECONDS", 2)
+        stop = threading.Event()
+        requeue_stale()
+
+        if options["workers"] <= 1:
+            done = self._work(stop, poll, options["once"])
+        else:
+            with ThreadPoolExecutor(max_workers=options["workers"], thread_name_prefix="report-job") as pool:
+                futures = [
+                    pool.submit(self._work_in_thread, stop, poll, options["once"])
+                    for _ in range(options["workers"])
+                ]
+                try:
+                    done = sum(f.result() for f in futures)
+                except KeyboardInterrupt:
+                    stop.set()
+                    done = sum(f.result() for f in futures)
+        self.stdout.write(self.style.SUCCESS(f"{done} rapor işi işlendi."))
+
+    def _work_in_thread(self, stop, poll, once):
+        try:
+            return self._work(stop, poll, once)
+        finally:
+            close_old_connections()
+
+    def _work(self, stop, poll, once):
+        done = 0
+        while not stop.is_set():
+            job = claim_next()
+            if job is None:
+                if once:
+                    break
+                requeue_stale()
+                stop.wait(poll)
+                continue
+            job = run_job(job)
+            done += 1
+            self.stdout.write(f"#{job.pk} {job.report}.{job.format}: {job.status} ({job.rows_written} satır)")
+        return done
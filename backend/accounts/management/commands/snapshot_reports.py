@@ -0,0 +1,57 @@
+"""
+Management command: /api/admin/reports/* raporlarının varsayılan sonuçlarını ReportSnapshot'a yazar.
+Rapor view'ları admin URL'lerinden bulunur (get_report tanımlayanlar); her view'ın
+snapshot_variants parametre setleri yetkilendirme olmadan doğrudan get_report ile hesaplanır.
+Gece cron ile çalıştırılabilir (snapshot'lar yalnızca üretildiği gün servis edilir).
+
+Örnek: python manage.py snapshot_reports --only student-progress,inactive-students
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from accounts.report_jobs import call_report, report_views
+from accounts.report_snapshots import snapshot_key, store_snapshot
+
+
+def build_snapshot(view_class, params):
+    generated_at = timezone.now()
+    started = time.perf_counter()
+    view, request, response = call_report(view_class, params)
+    duration_ms = int((time.perf_counter() - started) * 1000)
+    if response.status_code != 200:
+        raise CommandError(f"{view_class.__name__} {params}: HTTP {response.status_code}")
+    return store_snapshot(
+        view_class.__name__,
+        snapshot_key(view.get_snapshot_params(request)),
+        response.data,
+        generated_at,
+        duration_ms,
+    )
+
+
+class Command(BaseCommand):
+    help = "Admin raporlarının varsayılan sonuçlarını önceden hesaplayıp ReportSnapshot'a yazar."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--only",
+            default="",
+            help="Virgülle ayrılmış rapor yolları (ör. student-progress,inactive-students); boş: hepsi.",
+        )
+
+    def handle(self, *args, **options):
+        only = {name.strip().strip("/") for name in options["only"].split(",") if name.strip()}
+        count = 0
+        for name, view_class in report_views():
+            if only and name not in only:
+                continue
+            for params in view_class.snapshot_variants:
+                snapshot = build_snapshot(view_class, params)
+                count += 1
+                self.stdout.write(
+                    f"{name:<24} {snapshot.params_key or '-':<32} "
+                    f"satır={snapshot.row_count} {snapshot.duration_ms}ms {len(snapshot.data)}B"
+                )
+        self.stdout.write(self.style.SUCCESS(f"{count} snapshot yazıldı."))
@@ -0,0 +1,21 @@
+"""
+Management command yardımcıları.
+"""
+from contextlib import contextmanager
+
+from django.db import transaction
+
+
+class _Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rolled_back():
+    """Blok içindeki tüm DB yazımlarını sonunda geri alır (benchmark seed verisi için)."""
+    try:
+        with transaction.atomic():
+            yield
+            raise _Rollback
+    except _Rollback:
+        pass
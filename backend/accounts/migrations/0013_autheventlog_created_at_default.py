@@ -0,0 +1,19 @@
+# Generated by Django 6.0.2
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0012_add_token_version_to_user"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="autheventlog",
+            name="created_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
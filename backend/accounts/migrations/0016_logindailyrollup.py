@@ -0,0 +1,29 @@
+# Generated by Django 6.0.2
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0015_user_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LoginDailyRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("day", models.DateField()),
+                ("event_type", models.CharField(choices=[("LOGIN_SUCCESS", "Login Success"), ("LOGIN_FAIL", "Login Fail"), ("LOGOUT", "Logout"), ("REFRESH", "Token Refresh")], max_length=20)),
+                ("count", models.PositiveIntegerField(default=0)),
+                ("user", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="login_daily_rollups", to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                "indexes": [models.Index(fields=["event_type", "day"], name="accounts_lo_event_t_53080c_idx")],
+                "constraints": [models.UniqueConstraint(fields=("day", "user", "event_type"), name="uniq_login_rollup_day_user_event")],
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 6.0.2
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.conf import settings
+
+
+def backfill_last_activity(apps, schema_editor):
+    """Mevcut loglardan kullanıcı başına son LOGIN_SUCCESS / REFRESH zamanları."""
+    AuthEventLog = apps.get_model("accounts", "AuthEventLog")
+    UserLastActivity = apps.get_model("accounts", "UserLastActivity")
+    fields = {
+        "LOGIN_SUCCESS": "last_login_success_at",
+        "REFRESH": "last_refresh_at",
+    }
+    rows = {}
+    latest = (
+        AuthEventLog.objects.filter(user__isnull=False, event_type__in=fields)
+        .values("user_id", "event_type")
+        .annotate(ts=models.Max("created_at"))
+        .order_by()
+    )
+    for r in latest.iterator():
+        row = rows.setdefault(r["user_id"], UserLastActivity(user_id=r["user_id"]))
+        setattr(row, fields[r["event_type"]], r["ts"])
+    UserLastActivity.objects.bulk_create(rows.values(), batch_size=2000)
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0016_logindailyrollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserLastActivity",
+            fields=[
+                ("user", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name="last_activity", serialize=False, to=settings.AUTH_USER_MODEL)),
+                ("last_login_success_at", models.DateTimeField(blank=True, db_index=True, null=True)),
+                ("last_refresh_at", models.DateTimeField(blank=True, db_index=True, null=True)),
+                ("last_failed_at", models.DateTimeField(blank=True, db_index=True, null=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_last_activity, noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 6.0.2
+
+from django.db import migrations, models
+
+BATCH_SIZE = 2000
+
+
+def backfill_attempted_email(apps, schema_editor):
+    """meta.email olan eski satırlar için attempted_email (küçük harf) doldurulur."""
+    AuthEventLog = apps.get_model("accounts", "AuthEventLog")
+    qs = AuthEventLog.objects.filter(meta__has_key="email").only("id", "meta")
+    batch = []
+    for event in qs.iterator(chunk_size=BATCH_SIZE):
+        email = str((event.meta or {}).get("email") or "").strip().lower()[:254]
+        if not email:
+            continue
+        event.attempted_email = email
+        batch.append(event)
+        if len(batch) >= BATCH_SIZE:
+            AuthEventLog.objects.bulk_update(batch, ["attempted_email"])
+            batch = []
+    if batch:
+        AuthEventLog.objects.bulk_update(batch, ["attempted_email"])
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0017_userlastactivity"),
+    ]
+
+    operations = [
+        # db_index: PostgreSQL'de btree'ye ek olarak varchar_pattern_ops "_like" indeksi de oluşur;
+        # login-logs önek araması (attempted_email__startswith) bu indeksi kullanır.
+        migrations.AddField(
+            model_name="autheventlog",
+            name="attempted_email",
+            field=models.CharField(blank=True, db_index=True, default="", max_length=254),
+        ),
+        migrations.RunPython(backfill_attempted_email, noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 6.0.2
+
+from django.db import migrations, models
+
+BATCH_SIZE = 2000
+
+
+def backfill_client_info(apps, schema_editor):
+    """Eski satırlar için UA / IP sınıfları (UA başına tek parse, LRU önbellekli)."""
+    from accounts.utils.client_info import classify_ip, parse_user_agent
+
+    AuthEventLog = apps.get_model("accounts", "AuthEventLog")
+    qs = AuthEventLog.objects.only("id", "user_agent", "ip_address", "meta")
+    fields = ["device_family", "os", "browser", "ip_class", "via_proxy"]
+    batch = []
+    for event in qs.iterator(chunk_size=BATCH_SIZE):
+        event.device_family, event.os, event.browser = parse_user_agent(event.user_agent)
+        event.ip_class = classify_ip(event.ip_address)
+        event.via_proxy = "x_forwarded_for" in (event.meta or {})
+        batch.append(event)
+        if len(batch) >= BATCH_SIZE:
+            AuthEventLog.objects.bulk_update(batch, fields)
+            batch = []
+    if batch:
+        AuthEventLog.objects.bulk_update(batch, fields)
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0018_autheventlog_attempted_email"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="autheventlog",
+            name="device_family",
+            field=models.CharField(blank=True, db_index=True, default="", max_length=16),
+        ),
+        migrations.AddField(
+            model_name="autheventlog",
+            name="os",
+            field=models.CharField(blank=True, db_index=True, default="", max_length=32),
+        ),
+        migrations.AddField(
+            model_name="autheventlog",
+            name="browser",
+            field=models.CharField(blank=True, db_index=True, default="", max_length=32),
+        ),
+        migrations.AddField(
+            model_name="autheventlog",
+            name="ip_class",
+            field=models.CharField(blank=True, db_index=True, default="", max_length=16),
+        ),
+        migrations.AddField(
+            model_name="autheventlog",
+            name="via_proxy",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(backfill_client_info, noop),
+    ]
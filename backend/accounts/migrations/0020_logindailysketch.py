@@ -0,0 +1,25 @@
+# Generated by Django 6.0.2
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0019_autheventlog_client_info"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LoginDailySketch",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("day", models.DateField()),
+                ("event_type", models.CharField(choices=[("LOGIN_SUCCESS", "Login Success"), ("LOGIN_FAIL", "Login Fail"), ("LOGOUT", "Logout"), ("REFRESH", "Token Refresh")], max_length=20)),
+                ("registers", models.BinaryField()),
+            ],
+            options={
+                "constraints": [models.UniqueConstraint(fields=("event_type", "day"), name="uniq_login_sketch_event_day")],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.2
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0020_logindailysketch"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReportSnapshot",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("report", models.CharField(max_length=64)),
+                ("params_key", models.CharField(blank=True, default="", max_length=255)),
+                ("data", models.BinaryField()),
+                ("row_count", models.PositiveIntegerField(default=0)),
+                ("generated_at", models.DateTimeField(db_index=True)),
+                ("duration_ms", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "constraints": [models.UniqueConstraint(fields=("report", "params_key"), name="uniq_report_snapshot_params")],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.2
+
+import accounts.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0022_reportjob"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="reportjob",
+            name="result_file",
+            field=models.FileField(blank=True, storage=accounts.models.ReportJobStorage(), upload_to=accounts.models.report_job_upload_to),
+        ),
+    ]
@@ -1,6 +1,11 @@
+import secrets
+
+from django.conf import settings
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
+from django.core.files.storage import FileSystemStorage
 from django.db import models
 from django.db.models import SET_NULL
+from django.utils import timezone
 from catalog.models import Subject
 
 
@@ -71,6 +76,8 @@ class User(AbstractBaseUser, PermissionsMixin):
     )
 
     created_at = models.DateTimeField(auto_now_add=True)
+    # /auth/me/ ETag'i için sürüm damgası: her save()'de güncellenir
+    updated_at = models.DateTimeField(auto_now=True)
     avatar = models.ImageField(upload_to="avatars/%Y/%m/", null=True, blank=True)
 
     # JWT invalidation: artırıldığında tüm mevcut tokenlar geçersiz olur (tüm cihazlardan çıkış)
@@ -84,6 +91,13 @@ class User(AbstractBaseUser, PermissionsMixin):
     def __str__(self):
         return f"{self.email} ({self.role})"
 
+    def save(self, *args, **kwargs):
+        # update_fields ile kısmi kayıtlarda da updated_at damgası yazılsın
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "updated_at" not in update_fields:
+            kwargs["update_fields"] = [*update_fields, "updated_at"]
+        super().save(*args, **kwargs)
+
 
 class TeacherProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="teacher_profile")
@@ -136,10 +150,21 @@ class AuthEventLog(models.Model):
         related_name="auth_event_logs",
     )
     event_type = models.CharField(max_length=20, choices=EventType.choices)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # auto_now_add değil: toplu yazımda event anı korunur (flush anı değil)
+    created_at = models.DateTimeField(default=timezone.now)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.TextField(blank=True)
     meta = models.JSONField(null=True, blank=True)
+    # Denenen e-posta (küçük harfe normalize): başarısız login aramaları JSON yerine bu indeksten yapılır.
+    # Önek araması startswith ile; PostgreSQL'de db_index bu CharField için varchar_pattern_ops
+    # ("_like") indeksini de oluşturur (bkz. 0018).
+    attempted_email = models.CharField(max_length=254, blank=True, default="", db_index=True)
+    # Yazım anında türetilen istemci sınıfları (bkz. utils/client_info.py)
+    device_family = models.CharField(max_length=16, blank=True, default="", db_index=True)
+    os = models.CharField(max_length=32, blank=True, default="", db_index=True)
+    browser = models.CharField(max_length=32, blank=True, default="", db_index=True)
+    ip_class = models.CharField(max_length=16, blank=True, default="", db_index=True)
+    via_proxy = models.BooleanField(default=False)
 
     class Meta:
         ordering = ["-created_at"]
@@ -151,3 +176,197 @@ class AuthEventLog(models.Model):
 
     def __str__(self):
         return f"{self.event_type} ({self.user_id or 'anon'}) @ {self.created_at}"
+
+
+class LoginDailyRollup(models.Model):
+    """
+    AuthEventLog'un gün / kullanıcı / event tipi bazında özeti (raporlar için).
+    AuthEventLog batch'leri yazılırken artımlı güncellenir (bkz. services.on_auth_events_written);
+    rebuild_login_rollup komutu ile log'dan yeniden üretilebilir.
+    Yalnızca user'ı olan eventler tutulur; gün TIME_ZONE'a göredir.
+    """
+
+    day = models.DateField()
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="login_daily_rollups",
+    )
+    event_type = models.CharField(max_length=20, choices=AuthEventLog.EventType.choices)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "user", "event_type"],
+                name="uniq_login_rollup_day_user_event",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["event_type", "day"]),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.user_id} {self.event_type}={self.count}"
+
+
+class LoginDailySketch(models.Model):
+    """
+    Gün / event tipi bazında tekil kullanıcı HyperLogLog sketch'i (shared.utils.HyperLogLog).
+    Günlük sayılar toplanarak haftalık/aylık tekil kullanıcı bulunamaz; sketch'ler birleştirilir.
+    LoginDailyRollup ile aynı anda güncellenir ve aynı komutla yeniden üretilir.
+    """
+
+    day = models.DateField()
+    event_type = models.CharField(max_length=20, choices=AuthEventLog.EventType.choices)
+    registers = models.BinaryField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["event_type", "day"],
+                name="uniq_login_sketch_event_day",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.event_type}"
+
+
+class ReportSnapshot(models.Model):
+    """
+    Admin raporunun önceden hesaplanmış varsayılan sonucu (gzip'li JSON).
+    snapshot_reports komutu (gece cron) üretir; varsayılan parametrelerle gelen istekler
+    aynı gün üretilmiş snapshot'tan döner (bkz. accounts/report_snapshots.py).
+    params_key: varsayılana eşit parametreler atılmış normalize query ("" = saf varsayılan).
+    """
+
+    report = models.CharField(max_length=64)
+    params_key = models.CharField(max_length=255, blank=True, default="")
+    data = models.BinaryField()
+    row_count = models.PositiveIntegerField(default=0)
+    generated_at = models.DateTimeField(db_index=True)
+    duration_ms = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["report", "params_key"],
+                name="uniq_report_snapshot_params",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.report} {self.params_key or '-'} @ {self.generated_at}"
+
+
+class ReportJobStorage(FileSystemStorage):
+    """
+    Rapor işi sonuçları (e-posta/IP içerir) için MEDIA dışındaki REPORT_JOB_ROOT deposu.
+    Genel URL'i yoktur; dosyalar yalnızca admin indirme view'ından okunur.
+    """
+
+    def __init__(self):
+        super().__init__(location=None, base_url=None)
+
+    @property
+    def base_location(self):
+        return self._value_or_setting(self._location, settings.REPORT_JOB_ROOT)
+
+    @property
+    def location(self):
+        return str(self.base_location)
+
+    def url(self, name):
+        raise NotImplementedError("Rapor işi dosyalarının genel URL'i yoktur.")
+
+
+def report_job_upload_to(instance, filename):
+    """YYYY/MM/<tahmin edilemez dizin>/<okunur ad>: indirme adı okunur kalır, yol tahmin edilemez."""
+    return f"{timezone.now():%Y/%m}/{secrets.token_urlsafe(16)}/{filename}"
+
+
+class ReportJob(models.Model):
+    """
+    Arka planda çalışan rapor işi (uzun aralıklar, tam dışa aktarmalar).
+    Kuyruk bu tablodur: run_report_jobs komutu QUEUED işi koşullu UPDATE ile sahiplenir,
+    rapor view'ının get_report'unu çalıştırır ve sonucu REPORT_JOB_ROOT altına (MEDIA dışı) yazar.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "QUEUED", "Queued"
+        RUNNING = "RUNNING", "Running"
+        SUCCEEDED = "SUCCEEDED", "Succeeded"
+        FAILED = "FAILED", "Failed"
+
+    class Format(models.TextChoices):
+        CSV = "csv", "CSV"
+        JSONL = "jsonl", "JSON Lines"
+        JSON = "json", "JSON"
+
+    requested_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="report_jobs",
+    )
+    report = models.CharField(max_length=64)
+    params = models.JSONField(default=dict, blank=True)
+    format = models.CharField(max_length=8, choices=Format.choices, default=Format.CSV)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.QUEUED)
+    rows_written = models.PositiveIntegerField(default=0)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    result_file = models.FileField(upload_to=report_job_upload_to, storage=ReportJobStorage(), blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"ReportJob({self.pk}) {self.report} {self.status}"
+
+
+class UserLastActivity(models.Model):
+    """
+    Kullanıcı başına son auth aktivitesi (tek satır). AuthEventLog batch'leri yazılırken
+    güncellenir; raporlar log üzerinde Max(created_at) yerine buradan indeksli okur.
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="last_activity",
+    )
+    last_login_success_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    last_refresh_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    last_failed_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    def __str__(self):
+        return f"UserLastActivity({self.user_id})"
+
+
+class RevokedToken(models.Model):
+    """Tekil oturum iptali: logout edilen access/refresh token'ın jti'si, süresi dolana kadar."""
+
+    jti = models.CharField(max_length=255, unique=True)
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="revoked_tokens",
+    )
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"RevokedToken({self.jti})"
@@ -4,6 +4,7 @@ Sadece ADMIN rolü erişebilir.
 """
 import secrets
 import string
+from django.db import transaction
 from django.db.models import Q
 from django.utils import timezone
 from rest_framework import status, viewsets
@@ -16,6 +17,8 @@ from rest_framework.response import Response
 from .models import User, TeacherProfile, StudentProfile
 from billing.views import _check_teacher_quota
 from .permissions import IsAdminOnly
+from .report_cache import TOPIC_USERS, report_cache
+from .utils.token_version import bump_token_version
 from .panel_serializers import (
     PanelUserSerializer,
     PanelUserCreateSerializer,
@@ -25,6 +28,11 @@ from .panel_serializers import (
 )
 
 
+def _invalidate_user_reports():
+    # Toplu update() post_save göndermez; atama değişikliğinde sinyal yerine raporları burada eskit
+    transaction.on_commit(lambda: report_cache.bump(TOPIC_USERS))
+
+
 def _generate_password(length=14):
     """Güçlü rastgele şifre üretir."""
     alphabet = string.ascii_letters + string.digits + "!@#$%&*"
@@ -113,6 +121,8 @@ class PanelUserViewSet(viewsets.ModelViewSet):
         user.set_password(password)
         user.must_change_password = True
         user.save(update_fields=["password", "must_change_password"])
+        # Eski şifreyle alınmış tüm oturumlar kapansın
+        bump_token_version(user)
         # Admin-only: Geçici şifre sadece oluşturulduğu anda 1 kez döner.
         return Response({"generated_password": password})
 
@@ -252,6 +262,8 @@ class TeacherAssignStudentsView(APIView):
             )
 
         updated = StudentProfile.objects.filter(pk__in=ids).update(teacher=tp)
+        if updated:
+            _invalidate_user_reports()
         return Response({"assigned_count": updated})
 
 
@@ -323,4 +335,6 @@ class TeacherUnassignStudentsView(APIView):
         if not ids:
             return Response({"detail": "student_ids zorunludur."}, status=status.HTTP_400_BAD_REQUEST)
         updated = StudentProfile.objects.filter(pk__in=ids, teacher=tp).update(teacher=None)
+        if updated:
+            _invalidate_user_reports()
         return Response({"unassigned_count": updated})
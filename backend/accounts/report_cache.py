@@ -0,0 +1,247 @@
+"""
+Admin raporları için süreç içi sonuç önbelleği.
+Anahtar: rapor adı + normalize edilmiş query parametreleri. Kayıt şu durumlarda bayattır:
+- REPORT_CACHE_TTL saniye geçtiyse,
+- bağlı olduğu konunun (users / catalog) nesli arttıysa (sinyaller, bkz. accounts/signals.py),
+- hesaplandıktan sonra raporun zaman penceresine düşen bir auth event yazıldıysa.
+REPORT_CACHE_STALE_WHILE_REVALIDATE açıksa bayat kayıt hemen döner, arka planda yenilenir.
+Önbellekte yoksa ve istek varsayılan parametrelerle geldiyse gece snapshot'ı denenir
+(bkz. accounts/report_snapshots.py); snapshot_variants boş olan raporlar için denenmez.
+Snapshot üretildikten sonra konusunun nesli arttıysa ya da penceresine event yazıldıysa
+(changed_since) snapshot atlanır ve rapor canlı hesaplanır.
+Nesil ve event bilgisi süreç içidir; diğer worker'larda bayatlık en fazla TTL kadardır.
+"""
+import logging
+import threading
+import time
+from collections import Counter, deque
+
+from django.conf import settings
+from django.db import close_old_connections
+from rest_framework.response import Response
+
+from shared.utils import MISSING, TTLCache
+
+from .report_snapshots import load_snapshot, snapshot_key, snapshot_response
+
+logger = logging.getLogger(__name__)
+
+TOPIC_USERS = "users"
+TOPIC_CATALOG = "catalog"
+TOPIC_AUTH_EVENTS = "auth_events"
+
+
+def get_ttl():
+    return getattr(settings, "REPORT_CACHE_TTL", 60)
+
+
+def get_stale_ttl():
+    return getattr(settings, "REPORT_CACHE_STALE_TTL", 300)
+
+
+def stale_while_revalidate_enabled():
+    return getattr(settings, "REPORT_CACHE_STALE_WHILE_REVALIDATE", False)
+
+
+class ReportCache:
+    def __init__(self, maxsize=256, event_marks=1000):
+        # Kayıtlar TTL + stale süresi kadar tutulur; tazelik okurken ayrıca kontrol edilir
+        self._entries = TTLCache(maxsize=maxsize, ttl=get_ttl() + get_stale_ttl())
+        self._generations = Counter()
+        self._bumped_at = {}
+        # Yazılan auth event batch'leri: (yazım zamanı, en eski created_at, en yeni created_at)
+        self._event_marks = deque(maxlen=event_marks)
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self.stats = Counter()
+
+    # --- invalidation ---
+
+    def bump(self, topic):
+        with self._lock:
+            self._generations[topic] += 1
+            self._bumped_at[topic] = time.time()
+
+    def note_auth_events(self, events):
+        stamps = [e.created_at for e in events if e.created_at]
+        if not stamps:
+            return
+        with self._lock:
+            self._event_marks.append((time.time(), min(stamps), max(stamps)))
+
+    def _events_touch(self, window, since):
+        """since'ten sonra yazılmış bir batch pencereye düşüyor mu? İz kaybolduysa True."""
+        start, end = window
+        with self._lock:
+            marks = list(self._event_marks)
+        if len(marks) == self._event_marks.maxlen and marks[0][0] > since:
+            return True
+        for written_at, oldest, newest in reversed(marks):
+            if written_at <= since:
+                break
+            if (end is None or oldest <= end) and (start is None or newest >= start):
+                return True
+        return False
+
+    def changed_since(self, topics, window, since):
+        """since'ten (epoch sn) sonra konulardan biri bump edildi ya da pencereye event yazıldı mı?"""
+        with self._lock:
+            if any(self._bumped_at.get(t, 0) > since for t in topics):
+                return True
+        return TOPIC_AUTH_EVENTS in topics and self._events_touch(window, since)
+
+    def generations(self, topics):
+        with self._lock:
+            return tuple(self._generations[t] for t in topics)
+
+    # --- okuma / yazma ---
+
+    def lookup(self, key, topics, window):
+        """(data, durum) döner; durum "hit" | "stale" | "miss"."""
+        entry = self._entries.get(key)
+        if entry is MISSING:
+            return None, "miss"
+        computed_at, gens, data = entry
+        fresh = (
+            time.time() - computed_at < get_ttl()
+            and gens == self.generations(topics)
+            and not (TOPIC_AUTH_EVENTS in topics and self._events_touch(window, computed_at))
+        )
+        if fresh:
+            return data, "hit"
+        if stale_while_revalidate_enabled():
+            return data, "stale"
+        return None, "miss"
+
+    def store(self, key, data, stamp):
+        """stamp: hesaplama başındaki (zaman, nesiller); hesaplama sırasında gelen bump kaybolmaz."""
+        computed_at, gens = stamp
+        self._entries.set(key, (computed_at, gens, data))
+
+    def refresh_async(self, key, compute):
+        """Anahtar için arka planda tek yenileme başlatır (aynı anahtar için paralel yenileme yok)."""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                compute()
+            except Exception:
+                logger.exception("Rapor önbelleği yenilenemedi: %s", key[0])
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+                close_old_connections()
+
+        threading.Thread(target=run, name="report-cache-refresh", daemon=True).start()
+
+    def record(self, report, status):
+        with self._lock:
+            self.stats[(report, status)] += 1
+
+    def snapshot(self):
+        """Hit oranı metriği: toplam ve rapor bazında hit / stale / snapshot / miss."""
+        with self._lock:
+            stats = dict(self.stats)
+        by_report = {}
+        for (report, status), n in stats.items():
+            by_report.setdefault(report, {"hit": 0, "stale": 0, "snapshot": 0, "miss": 0})[status] = n
+        totals = {"hit": 0, "stale": 0, "snapshot": 0, "miss": 0}
+        for counts in by_report.values():
+            for status, n in counts.items():
+                totals[status] += n
+        served = sum(totals.values())
+        computed = served - totals["miss"]
+        return {
+            **totals,
+            "hit_rate": round(computed / served, 4) if served else None,
+            "entries": len(self._entries),
+            "by_report": by_report,
+        }
+
+    def clear(self):
+        self._entries.clear()
+        with self._lock:
+            self._generations.clear()
+            self._bumped_at.clear()
+            self._event_marks.clear()
+            self.stats.clear()
+
+
+report_cache = ReportCache(maxsize=getattr(settings, "REPORT_CACHE_MAX_ENTRIES", 256))
+
+
+class ReportCacheMixin:
+    """
+    APIView mixin'i. View get() yerine get_report(request) tanımlar; JSON yanıtları önbelleğe alınır.
+    Dışa aktarma (?format=csv|jsonl) ve 200 dışı yanıtlar önbelleğe girmez.
+    cache_topics: kaydı bayatlatan konular. TOPIC_AUTH_EVENTS varsa get_cache_window()
+    (start, end) penceresine düşen yeni eventler kaydı bayatlatır; None açık uç demektir.
+    snapshot_defaults: değeri buna eşit parametreler snapshot eşleşmesinde yok sayılır.
+    snapshot_variants: snapshot_reports komutunun hesapladığı parametre setleri; boşsa rapor
+    snapshot'tan hiç servis edilmez. Penceresi "şimdi"de biten event sayımı yapan raporlar
+    (girişler vb.) boş bırakmalıdır: bugünün eventleri gece snapshot'ında yoktur ve diğer
+    worker'ların yazdığı eventler bu süreçte changed_since ile görülmez.
+    """
+
+    cache_topics = (TOPIC_USERS, TOPIC_AUTH_EVENTS)
+    snapshot_defaults = {"page": "1", "page_size": "20"}
+    snapshot_variants = ({},)
+
+    def get_cache_window(self, request):
+        return None, None
+
+    def get_cache_params(self, request):
+        return {k: ",".join(v) for k, v in request.query_params.lists() if k != "format"}
+
+    def get_cache_key(self, request):
+        params = self.get_cache_params(request)
+        return (type(self).__name__, tuple(sorted((k, str(v)) for k, v in params.items())))
+
+    def get_snapshot_params(self, request):
+        """Varsayılana eşit parametreler atılmış cache parametreleri."""
+        defaults = self.snapshot_defaults
+        return {
+            k: v for k, v in self.get_cache_params(request).items()
+            if k not in defaults or str(defaults[k]) != str(v)
+        }
+
+    def get(self, request, *args, **kwargs):
+        export = getattr(self, "get_export_format", None)
+        if export and export():
+            return self.get_report(request)
+
+        key = self.get_cache_key(request)
+        topics = self.cache_topics
+        window = self.get_cache_window(request)
+        data, status = report_cache.lookup(key, topics, window)
+        snapshot = None
+        if status == "miss" and self.snapshot_variants:
+            snapshot = load_snapshot(key[0], snapshot_key(self.get_snapshot_params(request)))
+            if snapshot is not None and report_cache.changed_since(
+                topics, window, snapshot.generated_at.timestamp()
+            ):
+                snapshot = None
+            if snapshot is not None:
+                status = "snapshot"
+        report_cache.record(key[0], status)
+
+        def compute():
+            stamp = (time.time(), report_cache.generations(topics))
+            response = self.get_report(request)
+            if response.status_code == 200 and isinstance(response, Response):
+                report_cache.store(key, response.data, stamp)
+            return response
+
+        if status == "miss":
+            response = compute()
+        elif status == "snapshot":
+            response = snapshot_response(snapshot)
+        else:
+            if status == "stale":
+                report_cache.refresh_async(key, compute)
+            response = Response(data)
+        response["X-Report-Cache"] = status.upper()
+        return response
@@ -0,0 +1,129 @@
+"""
+Admin raporları için akış (streaming) dışa aktarma: ?format=csv | ?format=jsonl.
+Satırlar üreteçten (generator) tek tek yazılır; liste kurulmaz, bellek kullanımı sabit kalır.
+CSV, Excel (TR) uyumu için BOM + ';' ayırıcı ile üretilir (panelin eski istemci tarafı CSV'si gibi).
+"""
+import csv
+import json
+from itertools import chain, islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.renderers import BaseRenderer
+from rest_framework.settings import api_settings
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+class _ExportRenderer(BaseRenderer):
+    """
+    DRF içerik anlaşması ?format=csv|jsonl'i tanısın diye kayıtlıdır (yoksa 404).
+    Başarılı yanıtlar StreamingHttpResponse ile döner; bu renderer yalnızca hata gövdelerini yazar.
+    """
+
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False).encode()
+
+
+class CSVExportRenderer(_ExportRenderer):
+    media_type = "text/csv"
+    format = "csv"
+
+
+class JSONLExportRenderer(_ExportRenderer):
+    media_type = "application/x-ndjson"
+    format = "jsonl"
+
+
+class EventStreamRenderer(_ExportRenderer):
+    """SSE uçları için (Accept: text/event-stream); yalnızca hata gövdelerini yazar."""
+
+    media_type = "text/event-stream"
+    format = "sse"
+
+
+class _Echo:
+    """csv.writer için: yazılan satırı tamponlamadan geri döndürür."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, cls=DjangoJSONEncoder, ensure_ascii=False)
+    if value is None:
+        return ""
+    return value
+
+
+def _stream_csv(rows, fields):
+    writer = csv.writer(_Echo(), delimiter=";")
+    yield "\ufeff" + writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([_csv_value(row.get(f)) for f in fields])
+
+
+def _stream_jsonl(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+
+
+def chunked(iterable, size=EXPORT_CHUNK_SIZE):
+    """Yinelenebiliri size'lık listeler halinde verir (toplu yardımcı sorgular için)."""
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _counted(rows, callback):
+    for n, row in enumerate(rows, 1):
+        callback(n)
+        yield row
+
+
+class ReportExportMixin:
+    """
+    APIView mixin'i. View, get_export_format() doluysa export_response(rows) döndürür.
+    rows: düz dict üreteci. export_fields verilmezse ilk satırın anahtarları kullanılır.
+    export_progress: verilirse yazılan her satırda toplam satır sayısıyla çağrılır (rapor işleri).
+    """
+
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, CSVExportRenderer, JSONLExportRenderer]
+    export_name = "report"
+    export_fields = None
+    export_progress = None
+
+    def get_export_format(self):
+        fmt = self.request.query_params.get(api_settings.URL_FORMAT_OVERRIDE or "format")
+        return fmt if fmt in ("csv", "jsonl") else None
+
+    def export_response(self, rows, fields=None):
+        fmt = self.get_export_format()
+        rows = iter(rows)
+        fields = fields or self.export_fields
+        if fields is None:
+            first = next(rows, None)
+            fields = list(first) if first else []
+            rows = chain([first], rows) if first else rows
+        if self.export_progress is not None:
+            rows = _counted(rows, self.export_progress)
+
+        if fmt == "csv":
+            response = StreamingHttpResponse(_stream_csv(rows, fields), content_type="text/csv; charset=utf-8")
+        else:
+            response = StreamingHttpResponse(
+                _stream_jsonl(rows), content_type="application/x-ndjson; charset=utf-8"
+            )
+        stamp = timezone.localdate().isoformat()
+        response["Content-Disposition"] = f'attachment; filename="{self.export_name}-{stamp}.{fmt}"'
+        response["Cache-Control"] = "no-store"
+        return response
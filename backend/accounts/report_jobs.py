@@ -0,0 +1,247 @@
+"""
+Arka plan rapor işleri (ReportJob). Kuyruk veritabanındadır, harici broker gerekmez.
+- enqueue: iş QUEUED olarak yazılır (POST /api/admin/reports/jobs/).
+- claim_next: en eski QUEUED iş koşullu UPDATE (status=QUEUED ise) ile sahiplenilir; aynı işi
+  iki worker alamaz ve SELECT ... FOR UPDATE gerekmez (SQLite'ta da çalışır).
+- run_job: rapor view'ının get_report'u iş parametreleriyle dışa aktarma modunda çalışır ve akış
+  MEDIA_ROOT/report_jobs/ altına yazılır; json işleri de tüm satırları alır (jsonl akışı
+  {"results": [...]} dizisine çevrilir), sayfalı raporlarda yalnızca ilk sayfa kalmaz.
+Çalışan iş, satır akışından bağımsız bir thread ile REPORT_JOB_HEARTBEAT_SECONDS'da bir heartbeat
+yazar. Heartbeat'i REPORT_JOB_STALE_SECONDS'tan eski RUNNING işler (çöken worker) yeniden kuyruğa
+alınır; REPORT_JOB_MAX_ATTEMPTS denemeden sonra FAILED olur. Sahiplenme attempts değeriyle
+işaretlenir: heartbeat ve sonuç yazımı yalnızca iş hâlâ o denemeye aitse uygulanır, böylece
+yeniden kuyruğa alınmış bir işin eski çalıştırıcısı yeni çalışmanın sonucunu ezemez.
+"""
+import logging
+import tempfile
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import close_old_connections
+from django.db.models import F
+from django.http import HttpRequest, QueryDict
+from django.utils import timezone
+
+from .models import ReportJob
+
+logger = logging.getLogger(__name__)
+
+REPORT_ROUTE_PREFIX = "reports/"
+
+
+def report_views():
+    """(rapor adı, view sınıfı): admin URL'lerinde reports/ altındaki get_report'lu view'lar."""
+    from . import admin_urls
+
+    for pattern in admin_urls.urlpatterns:
+        view_class = getattr(pattern.callback, "view_class", None)
+        route = str(pattern.pattern)
+        if route.startswith(REPORT_ROUTE_PREFIX) and view_class and hasattr(view_class, "get_report"):
+            yield route[len(REPORT_ROUTE_PREFIX):].strip("/"), view_class
+
+
+def get_report_view(name):
+    return dict(report_views()).get(name)
+
+
+def _build_request(params):
+    """Verilen query parametreleriyle kimliksiz GET isteği (HTTP katmanı olmadan)."""
+    query = QueryDict(mutable=True)
+    for name, value in params.items():
+        query.setlist(name, [str(v) for v in value] if isinstance(value, (list, tuple)) else [str(value)])
+    request = HttpRequest()
+    request.method = "GET"
+    request.path = request.path_info = "/"
+    request.GET = query
+    request.META.update({
+        "REQUEST_METHOD": "GET",
+        "QUERY_STRING": query.urlencode(),
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "80",
+    })
+    return request
+
+
+def call_report(view_class, params, export_progress=None):
+    """
+    view_class.get_report'u verilen query parametreleriyle (yetkilendirme olmadan) çalıştırır.
+    (view, request, response) döner.
+    """
+    django_request = _build_request(params)
+    view = view_class()
+    view.setup(django_request)
+    request = view.initialize_request(django_request)
+    view.request = request
+    view.format_kwarg = None
+    if export_progress is not None:
+        view.export_progress = export_progress
+    return view, request, view.get_report(request)
+
+
+def enqueue(report, params, fmt, user=None):
+    return ReportJob.objects.create(requested_by=user, report=report, params=params, format=fmt)
+
+
+def requeue_stale():
+    """Heartbeat'i eskimiş RUNNING işleri kuyruğa geri alır (deneme hakkı bittiyse FAILED)."""
+    now = timezone.now()
+    stale = ReportJob.objects.filter(
+        status=ReportJob.Status.RUNNING,
+        heartbeat_at__lt=now - timedelta(seconds=getattr(settings, "REPORT_JOB_STALE_SECONDS", 600)),
+    )
+    max_attempts = getattr(settings, "REPORT_JOB_MAX_ATTEMPTS", 3)
+    failed = stale.filter(attempts__gte=max_attempts).update(
+        status=ReportJob.Status.FAILED, error="Worker yanıt vermedi.", finished_at=now
+    )
+    requeued = stale.filter(attempts__lt=max_attempts).update(status=ReportJob.Status.QUEUED)
+    return requeued, failed
+
+
+def claim_next():
+    """En eski QUEUED işi sahiplenir; yoksa None."""
+    candidates = (
+        ReportJob.objects.filter(status=ReportJob.Status.QUEUED)
+        .order_by("created_at", "id")
+        .values_list("id", flat=True)[:10]
+    )
+    for job_id in candidates:
+        now = timezone.now()
+        claimed = ReportJob.objects.filter(pk=job_id, status=ReportJob.Status.QUEUED).update(
+            status=ReportJob.Status.RUNNING,
+            started_at=now,
+            heartbeat_at=now,
+            attempts=F("attempts") + 1,
+        )
+        if claimed:
+            return ReportJob.objects.get(pk=job_id)
+    return None
+
+
+class ClaimLost(Exception):
+    """İş yeniden kuyruğa alınıp başka bir denemeye geçti; bu çalıştırıcı durmalı."""
+
+
+def _claimed(job):
+    """İşin hâlâ bu çalıştırıcının denemesine ait olduğu satır kümesi."""
+    return ReportJob.objects.filter(pk=job.pk, status=ReportJob.Status.RUNNING, attempts=job.attempts)
+
+
+class _Heartbeat:
+    """
+    Çalışan iş için satır sayısından bağımsız heartbeat thread'i. Sahiplik kaybedilirse
+    lost işaretlenir; akış bir sonraki satırda ClaimLost ile kesilir.
+    """
+
+    def __init__(self, job):
+        self.job = job
+        self.rows = 0
+        self.lost = False
+        self._interval = getattr(settings, "REPORT_JOB_HEARTBEAT_SECONDS", 30)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"report-job-{job.pk}-heartbeat", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def beat(self):
+        if not _claimed(self.job).update(rows_written=self.rows, heartbeat_at=timezone.now()):
+            self.lost = True
+
+    def _run(self):
+        try:
+            while not self._stop.wait(self._interval) and not self.lost:
+                self.beat()
+        except Exception:
+            logger.exception("Rapor işi heartbeat'i yazılamadı: %s", self.job.pk)
+        finally:
+            close_old_connections()
+
+    def __call__(self, rows):
+        """export_progress: yazılan satır sayısı."""
+        if self.lost:
+            raise ClaimLost()
+        self.rows = rows
+
+
+def _write_json(chunks, fh):
+    """jsonl akışını {"results": [...]} belgesine çevirerek yazar (satırlar bellekte toplanmaz)."""
+    fh.write(b'{"results":[')
+    pending = b""
+    first = True
+    for chunk in chunks:
+        pending += chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if line:
+                fh.write(line if first else b"," + line)
+                first = False
+    if pending.strip():
+        fh.write(pending if first else b"," + pending)
+    fh.write(b"]}")
+
+
+def run_job(job):
+    """İşi çalıştırır ve sonucu (SUCCEEDED / FAILED) yalnızca iş hâlâ bu denemeye aitse kaydeder."""
+    started = time.perf_counter()
+    saved_name = None
+    try:
+        view_class = get_report_view(job.report)
+        if view_class is None:
+            raise ValueError(f"Bilinmeyen rapor: {job.report}")
+        params = dict(job.params)
+        # json da dışa aktarma yolundan geçer: sayfalı raporlarda tüm satırlar yazılır
+        params["format"] = ReportJob.Format.JSONL if job.format == ReportJob.Format.JSON else job.format
+
+        with _Heartbeat(job) as heartbeat, tempfile.TemporaryFile() as fh:
+            _, _, response = call_report(view_class, params, export_progress=heartbeat)
+            if response.status_code != 200 or not response.streaming:
+                raise ValueError(f"Rapor HTTP {response.status_code} döndü: {getattr(response, 'data', '')}")
+            if job.format == ReportJob.Format.JSON:
+                _write_json(response.streaming_content, fh)
+            else:
+                for chunk in response.streaming_content:
+                    fh.write(chunk)
+            fh.seek(0)
+            stamp = timezone.localdate().isoformat()
+            job.result_file.save(f"{job.report}-{stamp}-{job.pk}.{job.format}", File(fh), save=False)
+            saved_name = job.result_file.name
+            rows = heartbeat.rows
+
+        job.status = ReportJob.Status.SUCCEEDED
+        job.rows_written = rows
+        job.error = ""
+    except ClaimLost:
+        logger.warning("Rapor işi %s başka bir denemeye geçti; bu çalıştırma bırakıldı.", job.pk)
+        return job
+    except Exception as exc:
+        logger.exception("Rapor işi başarısız: %s", job.pk)
+        job.status = ReportJob.Status.FAILED
+        job.error = str(exc)[:2000]
+    job.finished_at = job.heartbeat_at = timezone.now()
+    written = _claimed(job).update(
+        status=job.status,
+        rows_written=job.rows_written,
+        error=job.error,
+        result_file=job.result_file.name or "",
+        finished_at=job.finished_at,
+        heartbeat_at=job.heartbeat_at,
+    )
+    if not written:
+        # Yeniden kuyruğa alınmış işin eski çalıştırması: sonucu yazılmaz, dosyası silinir
+        logger.warning("Rapor işi %s başka bir denemeye geçti; sonuç yazılmadı.", job.pk)
+        if saved_name:
+            job.result_file.storage.delete(saved_name)
+        return job
+    logger.info(
+        "Rapor işi %s (%s) %s: %s satır, %.0f ms",
+        job.pk, job.report, job.status, job.rows_written, (time.perf_counter() - started) * 1000,
+    )
+    return job
@@ -0,0 +1,82 @@
+"""
+Admin raporları için gece snapshot'ları (ReportSnapshot, gzip'li JSON).
+snapshot_reports komutu her raporun varsayılan sonucunu önceden hesaplar. İstek parametreleri
+varsayılana eşitse (tarih aralığı gün bazında, bkz. ReportCacheMixin.get_snapshot_params)
+sonuç canlı hesaplanmadan snapshot'tan döner. Snapshot yalnızca üretildiği gün geçerlidir;
+yaşı yanıtta "snapshot" alanı ve X-Report-Snapshot-Age başlığıyla bildirilir.
+Penceresi "şimdi"de biten event raporlarının (windowed ve giriş sayan raporlar) snapshot'ı
+yoktur: bugünün eventleri gece snapshot'ında görünmez. Snapshot sonrası konusu değişen raporlar
+(bkz. ReportCache.changed_since) snapshot yerine canlı hesaplanır.
+Arama sonucu (yoksa None da) süreç içinde REPORT_SNAPSHOT_LOOKUP_TTL saniye tutulur; her
+önbellek ıskasında veritabanına gidilmez.
+"""
+import gzip
+import json
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from rest_framework.response import Response
+
+from shared.utils import MISSING, TTLCache
+
+from .models import ReportSnapshot
+
+snapshot_lookups = TTLCache(maxsize=256, ttl=getattr(settings, "REPORT_SNAPSHOT_LOOKUP_TTL", 60))
+
+
+def snapshots_enabled():
+    return getattr(settings, "REPORT_SNAPSHOTS_ENABLED", True)
+
+
+def snapshot_key(params):
+    return urlencode(sorted(params.items()))
+
+
+def row_count(data):
+    """Yanıttaki satır listesinin uzunluğu (results / items)."""
+    for name in ("results", "items"):
+        if isinstance(data.get(name), list):
+            return len(data[name])
+    return 0
+
+
+def store_snapshot(report, key, data, generated_at, duration_ms=0):
+    payload = gzip.compress(json.dumps(data, cls=DjangoJSONEncoder).encode("utf-8"))
+    snapshot, _ = ReportSnapshot.objects.update_or_create(
+        report=report,
+        params_key=key,
+        defaults={
+            "data": payload,
+            "row_count": row_count(data),
+            "generated_at": generated_at,
+            "duration_ms": duration_ms,
+        },
+    )
+    snapshot_lookups.delete((report, key))
+    return snapshot
+
+
+def load_snapshot(report, key):
+    """Bugün üretilmiş snapshot; yoksa (veya kapalıysa) None."""
+    if not snapshots_enabled():
+        return None
+    snapshot = snapshot_lookups.get((report, key))
+    if snapshot is MISSING:
+        snapshot = ReportSnapshot.objects.filter(report=report, params_key=key).first()
+        snapshot_lookups.set((report, key), snapshot)
+    if snapshot is None or timezone.localdate(snapshot.generated_at) != timezone.localdate():
+        return None
+    return snapshot
+
+
+def snapshot_response(snapshot):
+    data = json.loads(gzip.decompress(bytes(snapshot.data)))
+    age = max(0, int((timezone.now() - snapshot.generated_at).total_seconds()))
+    response = Response({
+        **data,
+        "snapshot": {"generated_at": snapshot.generated_at.isoformat(), "age_seconds": age},
+    })
+    response["X-Report-Snapshot-Age"] = str(age)
+    return response
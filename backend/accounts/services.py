@@ -0,0 +1,236 @@
+"""
+Accounts business logic.
+"""
+import operator
+from collections import Counter
+from functools import reduce
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, DateTimeField, F, IntegerField, Q, Value, When
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from shared.utils import HyperLogLog
+
+from .models import User, AuthEventLog, LoginDailyRollup, LoginDailySketch, UserLastActivity
+from .utils.auth_logging import log_auth_event, normalize_attempted_email
+
+
+def record_login_success(request, user):
+    """
+    Başarılı login'i tek yazım birimi olarak kaydeder.
+    LOGIN_SUCCESS event'i kuyruğa atılır; last_login aynı batch içinde,
+    event insert'iyle aynı transaction'da güncellenir (bkz. on_auth_events_written).
+    """
+    log_auth_event(request, AuthEventLog.EventType.LOGIN_SUCCESS, user=user)
+
+
+def _latest_by_user(events, event_type):
+    latest = {}
+    for e in events:
+        if e.event_type != event_type or not e.user_id:
+            continue
+        if e.user_id not in latest or e.created_at > latest[e.user_id]:
+            latest[e.user_id] = e.created_at
+    return latest
+
+
+def _update_last_login(events):
+    """Kullanıcı başına en yeni LOGIN_SUCCESS zamanını tek UPDATE ile last_login'e yazar."""
+    latest = _latest_by_user(events, AuthEventLog.EventType.LOGIN_SUCCESS)
+    if not latest:
+        return
+    new = Case(
+        *[When(pk=uid, then=Value(ts)) for uid, ts in latest.items()],
+        output_field=DateTimeField(),
+    )
+    # Sıra dışı gelen batch'ler daha yeni last_login'i ezmesin
+    User.objects.filter(pk__in=latest).update(
+        last_login=Greatest(Coalesce(F("last_login"), new), new)
+    )
+
+
+_LAST_ACTIVITY_FIELDS = {
+    AuthEventLog.EventType.LOGIN_SUCCESS: "last_login_success_at",
+    AuthEventLog.EventType.REFRESH: "last_refresh_at",
+}
+
+
+def _latest_failed_by_user(events):
+    """
+    LOGIN_FAIL eventlerinde user yoktur; normalize edilmiş denenen e-posta (attempted_email)
+    kullanıcı e-postasına büyük/küçük harf duyarsız eşlenir (Foo@x.com -> foo@x.com).
+    """
+    latest_by_email = {}
+    for e in events:
+        if e.event_type != AuthEventLog.EventType.LOGIN_FAIL:
+            continue
+        email = e.attempted_email or normalize_attempted_email((e.meta or {}).get("email"))
+        if email and (email not in latest_by_email or e.created_at > latest_by_email[email]):
+            latest_by_email[email] = e.created_at
+    if not latest_by_email:
+        return {}
+    matches = reduce(operator.or_, (Q(email__iexact=email) for email in latest_by_email))
+    latest = {}
+    for uid, email in User.objects.filter(matches).values_list("id", "email"):
+        latest[uid] = latest_by_email[normalize_attempted_email(email)]
+    return latest
+
+
+def _update_last_activity(events):
+    """
+    UserLastActivity satırlarını günceller: eksik satırlar tek INSERT (çakışanlar atlanır),
+    her zaman alanı için tek UPDATE. Daha eski bir batch yeni değeri ezmez.
+    """
+    updates = {
+        field: _latest_by_user(events, event_type)
+        for event_type, field in _LAST_ACTIVITY_FIELDS.items()
+    }
+    updates["last_failed_at"] = _latest_failed_by_user(events)
+    user_ids = set().union(*updates.values())
+    if not user_ids:
+        return
+
+    UserLastActivity.objects.bulk_create(
+        [UserLastActivity(user_id=uid) for uid in user_ids], ignore_conflicts=True
+    )
+    for field, latest in updates.items():
+        if not latest:
+            continue
+        new = Case(
+            *[When(user_id=uid, then=Value(ts)) for uid, ts in latest.items()],
+            output_field=DateTimeField(),
+        )
+        UserLastActivity.objects.filter(user_id__in=latest).update(
+            **{field: Greatest(Coalesce(F(field), new), new)}
+        )
+
+
+def _rollup_counts(events):
+    return Counter(
+        (timezone.localdate(e.created_at), e.user_id, e.event_type)
+        for e in events
+        if e.user_id
+    )
+
+
+def _update_login_rollup(events):
+    """
+    Batch'teki eventleri LoginDailyRollup sayaçlarına ekler.
+    Var olan satırlar tek UPDATE (count = count + n), yeniler tek bulk_create ile yazılır.
+    """
+    counts = _rollup_counts(events)
+    if not counts:
+        return
+
+    existing = {}
+    for pk, day, user_id, event_type in LoginDailyRollup.objects.filter(
+        day__in={k[0] for k in counts},
+        user_id__in={k[1] for k in counts},
+        event_type__in={k[2] for k in counts},
+    ).values_list("id", "day", "user_id", "event_type"):
+        key = (day, user_id, event_type)
+        if key in counts:
+            existing[key] = pk
+
+    if existing:
+        LoginDailyRollup.objects.filter(pk__in=existing.values()).update(
+            count=F("count") + Case(
+                *[When(pk=pk, then=Value(counts[key])) for key, pk in existing.items()],
+                output_field=IntegerField(),
+            )
+        )
+
+    new = [key for key in counts if key not in existing]
+    if not new:
+        return
+    try:
+        with transaction.atomic():
+            LoginDailyRollup.objects.bulk_create(
+                LoginDailyRollup(day=key[0], user_id=key[1], event_type=key[2], count=counts[key])
+                for key in new
+            )
+    except IntegrityError:
+        # Başka bir süreç aynı satırı araya yazdı: satır satır artır
+        for key in new:
+            day, user_id, event_type = key
+            updated = LoginDailyRollup.objects.filter(
+                day=day, user_id=user_id, event_type=event_type
+            ).update(count=F("count") + counts[key])
+            if not updated:
+                LoginDailyRollup.objects.create(
+                    day=day, user_id=user_id, event_type=event_type, count=counts[key]
+                )
+
+
+def _update_login_sketches(events):
+    """
+    Batch'teki kullanıcıları (gün, event tipi) HyperLogLog sketch'lerine ekler.
+    Satırlar select_for_update ile okunur; ekleme idempotent olduğundan çakışmada tekrar denemek güvenlidir.
+    """
+    users_by_key = {}
+    for day, user_id, event_type in _rollup_counts(events):
+        users_by_key.setdefault((day, event_type), set()).add(user_id)
+    if not users_by_key:
+        return
+
+    existing = {
+        (row.day, row.event_type): row
+        for row in LoginDailySketch.objects.select_for_update().filter(
+            day__in={k[0] for k in users_by_key},
+            event_type__in={k[1] for k in users_by_key},
+        )
+    }
+    changed = []
+    new = []
+    for key, user_ids in users_by_key.items():
+        row = existing.get(key)
+        sketch = HyperLogLog.from_bytes(row.registers) if row else HyperLogLog()
+        sketch.update(user_ids)
+        if row:
+            row.registers = sketch.to_bytes()
+            changed.append(row)
+        else:
+            new.append(LoginDailySketch(day=key[0], event_type=key[1], registers=sketch.to_bytes()))
+
+    if changed:
+        LoginDailySketch.objects.bulk_update(changed, ["registers"])
+    if not new:
+        return
+    try:
+        with transaction.atomic():
+            LoginDailySketch.objects.bulk_create(new)
+    except IntegrityError:
+        # Başka bir süreç aynı günü araya yazdı: kilitleyip birleştir
+        for row in new:
+            current = LoginDailySketch.objects.select_for_update().filter(
+                day=row.day, event_type=row.event_type
+            ).first()
+            if current is None:
+                row.save()
+                continue
+            merged = HyperLogLog.from_bytes(current.registers).merge(HyperLogLog.from_bytes(row.registers))
+            current.registers = merged.to_bytes()
+            current.save(update_fields=["registers"])
+
+
+def estimate_unique_users(day_from, day_to, event_type=AuthEventLog.EventType.LOGIN_SUCCESS):
+    """[day_from, day_to] günlerindeki tekil kullanıcı sayısı (günlük sketch'lerin birleşimi, yaklaşık)."""
+    sketch = HyperLogLog()
+    for registers in LoginDailySketch.objects.filter(
+        event_type=event_type, day__gte=day_from, day__lte=day_to
+    ).values_list("registers", flat=True):
+        sketch.merge(HyperLogLog.from_bytes(registers))
+    return sketch.count()
+
+
+def on_auth_events_written(events):
+    """
+    Denormalizasyon hook'u: AuthEventLog batch'i yazıldıktan hemen sonra,
+    aynı transaction içinde çağrılır. Türetilmiş "son giriş" verileri burada güncellenir;
+    raporlar bu alanları okuyarak log üzerinde Max(created_at) / Count hesaplamaz.
+    """
+    _update_last_login(events)
+    _update_last_activity(events)
+    _update_login_rollup(events)
+    _update_login_sketches(events)
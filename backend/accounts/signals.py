@@ -0,0 +1,47 @@
+"""
+accounts sinyalleri.
+User kaydedildiğinde token_version önbelleği tutarlı kalsın.
+Rapor önbelleği: kullanıcı / profil / katalog yazımları ilgili konunun neslini artırır.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from catalog.models import Course, Subject, Topic
+
+from .models import User, TeacherProfile, StudentProfile
+from .report_cache import TOPIC_CATALOG, TOPIC_USERS, report_cache
+from .utils import token_version
+
+_AUTH_STATE_FIELDS = {"token_version", "is_active"}
+
+
+@receiver(post_save, sender=User)
+def _invalidate_auth_state_on_save(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or _AUTH_STATE_FIELDS.intersection(update_fields):
+        token_version.invalidate(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def _invalidate_auth_state_on_delete(sender, instance, **kwargs):
+    token_version.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=TeacherProfile)
+@receiver(post_delete, sender=TeacherProfile)
+@receiver(post_save, sender=StudentProfile)
+@receiver(post_delete, sender=StudentProfile)
+def _invalidate_user_reports(sender, **kwargs):
+    # Yeni öğrenci, öğretmen ataması, onay vb. -> kullanıcı bazlı raporlar
+    report_cache.bump(TOPIC_USERS)
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=Topic)
+@receiver(post_delete, sender=Topic)
+@receiver(post_save, sender=Subject)
+@receiver(post_delete, sender=Subject)
+def _invalidate_catalog_reports(sender, **kwargs):
+    report_cache.bump(TOPIC_CATALOG)
@@ -1,4 +1,8 @@
-from django.test import TestCase
+from django.db import connection
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from .models import User, AuthEventLog
 
@@ -46,3 +50,1344 @@ class AuthEventLogTests(TestCase):
         for url in endpoints:
             r = self.client.get(url)
             self.assertEqual(r.status_code, 200, f"Failed: {url}")
+
+
+class AuthTestCase(TestCase):
+    """Süreç içi auth önbelleklerini (token_version, login throttle) her testte sıfırlar."""
+
+    def setUp(self):
+        from .report_cache import report_cache
+        from .report_snapshots import snapshot_lookups
+        from .throttling import limiter
+        from .utils import token_denylist, token_version
+        from site_settings.utils import invalidate_site_settings_cache
+        token_version.clear()
+        token_denylist.denylist.clear()
+        report_cache.clear()
+        snapshot_lookups.clear()
+        limiter.clear()
+        invalidate_site_settings_cache()
+        self.client = APIClient()
+
+    @staticmethod
+    def access_token(user):
+        from rest_framework_simplejwt.tokens import RefreshToken
+        from .authentication import add_user_claims
+        return str(add_user_claims(RefreshToken.for_user(user), user).access_token)
+
+    def authenticate(self, user):
+        """self.client isteklerine user'ın Bearer access token'ını ekler."""
+        self.access = self.access_token(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+
+    def authenticate_admin(self):
+        """admin@test.com admin kullanıcısını oluşturur (self.admin) ve istemciyi onunla yetkilendirir."""
+        self.admin = User.objects.create_user(
+            email="admin@test.com", password="test123", role=User.Role.ADMIN, is_approved=True
+        )
+        self.authenticate(self.admin)
+        return self.admin
+
+
+def persist_logins(*users):
+    from .utils.auth_event_writer import persist_events
+    persist_events([AuthEventLog(user=u, event_type=AuthEventLog.EventType.LOGIN_SUCCESS) for u in users])
+
+
+@override_settings(AUTH_EVENT_LOG_ASYNC=False)
+class TokenVersionCacheTests(AuthTestCase):
+    def setUp(self):
+        super().setUp()
+        self.teacher = User.objects.create_user(
+            email="cache@test.com",
+            password="test123",
+            role=User.Role.TEACHER,
+            is_approved=True,
+        )
+        r = self.client.post(
+            "/api/auth/login/", {"email": "cache@test.com", "password": "test123"}, format="json"
+        )
+        self.assertEqual(r.status_code, 200)
+        self.access = r.data["access"]
+
+    def _get_grades(self, token):
+        return self.client.get("/api/catalog/grades/", HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_claims_mode_skips_user_query(self):
+        """Okuma isteğinde (önbellek sıcakken) users tablosuna gidilmez."""
+        self.assertEqual(self._get_grades(self.access).status_code, 200)
+        with CaptureQueriesContext(connection) as ctx:
+            r = self._get_grades(self.access)
+        self.assertEqual(r.status_code, 200)
+        self.assertFalse([q for q in ctx.captured_queries if "accounts_user" in q["sql"]])
+
+    def test_logout_all_invalidates_cached_version(self):
+        self.assertEqual(self._get_grades(self.access).status_code, 200)
+        r = self.client.post("/api/auth/logout-all/", HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(self._get_grades(self.access).status_code, 401)
+
+    def test_deactivated_user_rejected_in_claims_mode(self):
+        self.assertEqual(self._get_grades(self.access).status_code, 200)
+        self.teacher.is_active = False
+        self.teacher.save(update_fields=["is_active"])
+        self.assertEqual(self._get_grades(self.access).status_code, 401)
+
+
+class AuthEventWriterTests(TestCase):
+    def setUp(self):
+        from .utils.auth_event_writer import AuthEventWriter
+        self.writer = AuthEventWriter(max_queue_size=2, batch_size=10, flush_interval_ms=50)
+
+    def _event(self):
+        from .utils.auth_logging import build_auth_event
+        return build_auth_event(None, AuthEventLog.EventType.LOGIN_FAIL, meta={"email": "x@test.com"})
+
+    @override_settings(AUTH_EVENT_LOG_ASYNC=True)
+    def test_queue_full_falls_back_to_sync_and_flush_drains(self):
+        with mock.patch.object(self.writer, "_ensure_started"):
+            for _ in range(3):
+                self.writer.submit(self._event())
+        # 2 event kuyrukta, 3. senkron yazıldı
+        self.assertEqual(AuthEventLog.objects.count(), 1)
+        self.writer.flush()
+        self.assertEqual(AuthEventLog.objects.count(), 3)
+
+    @override_settings(AUTH_EVENT_LOG_ASYNC=False)
+    def test_sync_mode_writes_immediately(self):
+        self.writer.submit(self._event())
+        self.assertEqual(AuthEventLog.objects.count(), 1)
+
+
+@override_settings(AUTH_EVENT_LOG_ASYNC=False)
+class LoginRecordingTests(AuthTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(email="login@test.com", password="test123")
+
+    def test_login_success_sets_last_login_from_event(self):
+        r = self.client.post(
+            "/api/auth/login/", {"email": "login@test.com", "password": "test123"}, format="json"
+        )
+        self.assertEqual(r.status_code, 200)
+        event = AuthEventLog.objects.get(event_type=AuthEventLog.EventType.LOGIN_SUCCESS)
+        self.user.refresh_from_db()
+        self.assertEqual(event.user_id, self.user.id)
+        self.assertEqual(self.user.last_login, event.created_at)
+
+    def test_older_batch_does_not_overwrite_newer_last_login(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from .services import on_auth_events_written
+
+        now = timezone.now()
+        User.objects.filter(pk=self.user.pk).update(last_login=now)
+        old = AuthEventLog(
+            user=self.user,
+            event_type=AuthEventLog.EventType.LOGIN_SUCCESS,
+            created_at=now - timedelta(hours=1),
+        )
+        on_auth_events_written([old])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.last_login, now)
+
+
+@override_settings(AUTH_EVENT_LOG_ASYNC=False)
+class TokenRefreshTests(AuthTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(email="refresh@test.com", password="test123")
+        r = self.client.post(
+            "/api/auth/login/", {"email": "refresh@test.com", "password": "test123"}, format="json"
+        )
+        self.refresh = r.data["refresh"]
+
+    def test_refresh_event_attributed_to_user_without_user_row_query(self):
+        self.client.post("/api/auth/refresh/", {"refresh": self.refresh}, format="json")
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.client.post("/api/auth/refresh/", {"refresh": self.refresh}, format="json")
+        self.assertEqual(r.status_code, 200)
+        self.assertIn("access", r.data)
+        user_selects = [
+            q for q in ctx.captured_queries
+            if q["sql"].startswith("SELECT") and 'FROM "accounts_user"' in q["sql"]
+        ]
+        self.assertFalse(user_selects)
+        events = AuthEventLog.objects.filter(event_type=AuthEventLog.EventType.REFRESH)
+        self.assertEqual(events.count(), 2)
+        self.assertTrue(all(e.user_id == self.user.id for e in events))
+
+    def test_refresh_rejected_after_logout_all(self):
+        from .utils.token_version import bump_token_version
+        bump_token_version(self.user)
+        r = self.client.post("/api/auth/refresh/", {"refresh": self.refresh}, format="json")
+        self.assertEqual(r.status_code, 401)
+
+
+class RoutingAuthenticationTests(AuthTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(email="route@test.com", password="test123")
+        self.access = self.access_token(self.user)
+
+    def test_bearer_request_never_touches_session(self):
+        self.client.force_login(self.user)  # sessionid cookie'si de gönderilir
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.client.get("/api/health/", HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        self.assertEqual(r.status_code, 200)
+        self.assertFalse([q for q in ctx.captured_queries if "django_session" in q["sql"]])
+
+    def test_session_ignored_outside_admin_prefix(self):
+        self.client.force_login(self.user)
+        r = self.client.get("/api/health/")
+        self.assertEqual(r.status_code, 401)
+
+
+@override_settings(AUTH_EVENT_LOG_ASYNC=False)
+class LoginThrottleTests(AuthTestCase):
+    def setUp(self):
+        from site_settings.models import SiteSettings
+        super().setUp()
+        User.objects.create_user(email="victim@test.com", password="test123")
+        SiteSettings.objects.update_or_create(
+            id=1,
+            defaults={"login_throttle_window_seconds": 60, "login_throttle_email_limit": 2},
+        )
+
+    def _login(self, password="wrong-pass", email="victim@test.com"):
+        return self.client.post(
+            "/api/auth/login/", {"email": email, "password": password}, format="json"
+        )
+
+    def test_email_limit_rejects_before_password_hashing(self):
+        self.assertEqual(self._login().status_code, 401)
+        self.assertEqual(self._login(email=" Victim@Test.com ").status_code, 401)
+        with mock.patch("rest_framework_simplejwt.serializers.authenticate") as auth:
+            r = self._login(password="test123")
+        self.assertEqual(r.status_code, 429)
+        auth.assert_not_called()
+        throttled = AuthEventLog.objects.filter(
+            event_type=AuthEventLog.EventType.LOGIN_FAIL, meta__reason="THROTTLED_EMAIL"
+        )
+        self.assertEqual(throttled.count(), 1)
+        self.assertEqual(throttled.get().meta["email"], "victim@test.com")
+
+    def test_successful_login_resets_email_counter(self):
+        self._login()
+        self.assertEqual(self._login(password="test123").status_code, 200)
+        self.assertEqual(self._login().status_code, 401)
+        self.assertEqual(self._login().status_code, 401)
+
+    def test_ip_limit_ignores_spoofed_forwarded_for(self):
+        from site_settings.models import SiteSettings
+        from site_settings.utils import invalidate_site_settings_cache
+        SiteSettings.objects.filter(id=1).update(login_throttle_ip_limit=3, login_throttle_email_limit=100)
+        invalidate_site_settings_cache()
+        codes = [
+            self.client.post(
+                "/api/auth/login/",
+                {"email": "victim@test.com", "password": "wrong-pass"},
+                format="json",
+                HTTP_X_FORWARDED_FOR=f"203.0.113.{i}",
+            ).status_code
+            for i in range(5)
+        ]
+        self.assertEqual(codes, [401, 401, 401, 429, 429])
+
+    def test_trusted_proxy_count_reads_forwarded_for_from_the_right(self):
+        from rest_framework.test import APIRequestFactory
+        from .throttling import get_throttle_ip
+        request = APIRequestFactory().post(
+            "/", HTTP_X_FORWARDED_FOR="1.1.1.1, 203.0.113.7", REMOTE_ADDR="10.0.0.2"
+        )
+        self.assertEqual(get_throttle_ip(request), "10.0.0.2")
+        with self.settings(LOGIN_THROTTLE_TRUSTED_PROXY_COUNT=1):
+            self.assertEqual(get_throttle_ip(request), "203.0.113.7")
+
+    def test_non_object_body_is_rejected_by_serializer(self):
+        r = self.client.post("/api/auth/login/", [{"email": "victim@test.com"}], format="json")
+        self.assertEqual(r.status_code, 400)
+
+
+@override_settings(AUTH_EVENT_LOG_ASYNC=False)
+class PasswordHashPolicyTests(AuthTestCase):
+    def test_login_rehashes_with_new_iteration_count(self):
+        with override_settings(PASSWORD_HASH_ITERATIONS=1000):
+            user = User.objects.create_user(email="hash@test.com", password="test123")
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$1000$"))
+        with override_settings(PASSWORD_HASH_ITERATIONS=2000):
+            r = self.client.post(
+                "/api/auth/login/", {"email": "hash@test.com", "password": "test123"}, format="json"
+            )
+        self.assertEqual(r.status_code, 200)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$2000$"))
+
+
+@override_settings(AUTH_EVENT_LOG_ASYNC=False)
+class LogoutRevocationTests(AuthTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(email="logout@test.com", password="test123")
+        self.session_a = self._login()
+        self.session_b = self._login()
+
+    def _login(self):
+        return self.client.post(
+            "/api/auth/login/", {"email": "logout@test.com", "password": "test123"}, format="json"
+        ).data
+
+    def _me(self, access):
+        return self.client.get("/api/auth/me/", HTTP_AUTHORIZATION=f"Bearer {access}")
+
+    def test_logout_revokes_only_current_session(self):
+        r = self.client.post(
+            "/api/auth/logout/",
+            {"refresh": self.session_a["refresh"]},
+            format="json",
+            HTTP_AUTHORIZATION=f"Bearer {self.session_a['access']}",
+        )
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(self._me(self.session_a["access"]).status_code, 401)
+        r = self.client.post("/api/auth/refresh/", {"refresh": self.session_a["refresh"]}, format="json")
+        self.assertEqual(r.status_code, 401)
+
+        self.assertEqual(self._me(self.session_b["access"]).status_code, 200)
+        r = self.client.post("/api/auth/refresh/", {"refresh": self.session_b["refresh"]}, format="json")
+        self.assertEqual(r.status_code, 200)
+
+    def test_revocation_visible_to_other_processes_after_sync(self):
+        from .models import RevokedToken
+        from .utils.token_denylist import TokenDenylist
+        other = TokenDenylist(sync_seconds=0)
+        other.is_revoked("warmup")
+        self.client.post(
+            "/api/auth/logout/",
+            {"refresh": self.session_a["refresh"]},
+            format="json",
+            HTTP_AUTHORIZATION=f"Bearer {self.session_a['access']}",
+        )
+        self.assertEqual(RevokedToken.objects.filter(user=self.user).count(), 2)
+        jti = RevokedToken.objects.filter(user=self.user).first().jti
+        self.assertTrue(other.is_revoked(jti))
+
+
+class MeConditionalGetTests(AuthTestCase):
+    def setUp(self):
+        super().setUp()
+        admin = User.objects.create_user(email="approver@test.com", password="test123")
+        self.user = User.objects.create_user(
+            email="me@test.com", password="test123", is_approved=True, approved_by=admin
+        )
+        self.authenticate(self.user)
+
+    def test_approved_by_loaded_with_user_row(self):
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.client.get("/api/auth/me/")
+        self.assertEqual(r.data["approved_by_email"], "approver@test.com")
+        user_queries = [q for q in ctx.captured_queries if 'FROM "accounts_user"' in q["sql"]]
+        self.assertEqual(len(user_queries), 1)
+
+    def test_unchanged_profile_returns_304(self):
+        r = self.client.get("/api/auth/me/")
+        etag = r.headers["ETag"]
+        r = self.client.get("/api/auth/me/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(r.status_code, 304)
+        self.assertEqual(r.content, b"")
+
+    def test_profile_update_changes_etag(self):
+        etag = self.client.get("/api/auth/me/").headers["ETag"]
+        r = self.client.patch("/api/auth/me/", {"first_name": "Yeni"}, format="json")
+        self.assertNotEqual(r.headers["ETag"], etag)
+        r = self.client.get("/api/auth/me/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.data["first_name"], "Yeni")
+
+
+class MeEventsKeysetTests(AuthTestCase):
+    def setUp(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        super().setUp()
+        self.user = User.objects.create_user(email="events@test.com", password="test123")
+        now = timezone.now()
+        # Aynı created_at'e sahip satırlar da id ile ayrışmalı
+        AuthEventLog.objects.bulk_create(
+            AuthEventLog(
+                user=self.user,
+                event_type=AuthEventLog.EventType.REFRESH,
+                created_at=now - timedelta(minutes=i // 2),
+            )
+            for i in range(7)
+        )
+        self.authenticate(self.user)
+
+    def test_walks_all_pages_without_gaps_or_duplicates(self):
+        seen, cursor = [], None
+        while True:
+            params = {"page_size": 3}
+            if cursor:
+                params["cursor"] = cursor
+            r = self.client.get("/api/auth/me/events/", params)
+            self.assertEqual(r.status_code, 200)
+            self.assertNotIn("total", r.data)
+            seen.extend(item["id"] for item in r.data["items"])
+            cursor = r.data["next_cursor"]
+            if not cursor:
+                break
+        expected = list(
+            AuthEventLog.objects.filter(user=self.user)
+            .order_by("-created_at", "-id")
+            .values_list("id", flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_total_is_opt_in_and_bad_cursor_is_400(self):
+        r = self.client.get("/api/auth/me/events/", {"include_total": "1"})
+        self.assertEqual(r.data["total"], 7)
+        r = self.client.get("/api/auth/me/events/", {"cursor": "not-a-cursor"})
+        self.assertEqual(r.status_code, 400)
+
+
+class LoginDailyRollupTests(AuthTestCase):
+    def setUp(self):
+        super().setUp()
+        self.authenticate_admin()
+        self.teacher = User.objects.create_user(email="t@test.com", password="test123")
+
+    def test_incremental_rollup_matches_rebuild(self):
+        from django.core.management import call_command
+        from .models import LoginDailyRollup
+        persist_logins(self.teacher, self.teacher, self.admin)
+        persist_logins(self.teacher)
+        self.assertEqual(
+            LoginDailyRollup.objects.get(user=self.teacher).count, 3
+        )
+        incremental = sorted(LoginDailyRollup.objects.values_list("day", "user_id", "event_type", "count"))
+        call_command("rebuild_login_rollup", stdout=mock.MagicMock())
+        rebuilt = sorted(LoginDailyRollup.objects.values_list("day", "user_id", "event_type", "count"))
+        self.assertEqual(incremental, rebuilt)
+
+    def test_daily_logins_report_reads_rollup(self):
+        persist_logins(self.teacher, self.teacher, self.admin)
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.client.get("/api/admin/reports/daily-logins/")
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.data["results"][-1]["logins"], 3)
+        self.assertEqual(r.data["results"][-1]["unique_users"], 2)
+        self.assertFalse([q for q in ctx.captured_queries if "accounts_autheventlog" in q["sql"]])
+
+    def test_teacher_reports_use_rollup_counts(self):
+        from .models import TeacherProfile
+        TeacherProfile.objects.create(user=self.teacher)
+        persist_logins(self.teacher, self.teacher)
+        r = self.client.get("/api/admin/reports/most-active-teachers/")
+        self.assertEqual(r.data["results"][0]["logins_count"], 2)
+        self.assertIsNotNone(r.data["results"][0]["last_login_at"])
+        r = self.client.get("/api/admin/reports/teacher-performance/")
+        self.assertEqual(r.data["results"][0]["logins_count"], 2)
+
+
+class UserLastActivityTests(AuthTestCase):
+    def setUp(self):
+        super().setUp()
+        self.authenticate_admin()
+        self.student = User.objects.create_user(email="s@test.com", password="test123")
+
+    def test_batches_keep_latest_timestamps(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from .models import UserLastActivity
+        from .utils.auth_event_writer import persist_events
+        now = timezone.now()
+        persist_events([
+            AuthEventLog(user=self.student, event_type=AuthEventLog.EventType.LOGIN_SUCCESS, created_at=now),
+            AuthEventLog(
+                event_type=AuthEventLog.EventType.LOGIN_FAIL, meta={"email": "s@test.com"}, created_at=now
+            ),
+        ])
+        # Geç gelen daha eski batch yeni değeri ezmemeli
+        persist_events([
+            AuthEventLog(
+                user=self.student,
+                event_type=AuthEventLog.EventType.LOGIN_SUCCESS,
+                created_at=now - timedelta(hours=1),
+            ),
+        ])
+        activity = UserLastActivity.objects.get(user=self.student)
+        self.assertEqual(activity.last_login_success_at, now)
+        self.assertEqual(activity.last_failed_at, now)
+        self.assertIsNone(activity.last_refresh_at)
+
+    @override_settings(AUTH_EVENT_LOG_ASYNC=False)
+    def test_failed_login_with_mixed_case_email_updates_user(self):
+        from .models import UserLastActivity
+        APIClient().post("/api/auth/login/", {"email": " S@Test.COM ", "password": "wrong"}, format="json")
+        event = AuthEventLog.objects.get(event_type=AuthEventLog.EventType.LOGIN_FAIL)
+        activity = UserLastActivity.objects.get(user=self.student)
+        self.assertEqual(activity.last_failed_at, event.created_at)
+
+    def test_inactive_students_filtered_in_sql(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from .models import StudentProfile, UserLastActivity
+        from .utils.auth_event_writer import persist_events
+        active = User.objects.create_user(email="a@test.com", password="test123")
+        StudentProfile.objects.create(user=self.student)
+        StudentProfile.objects.create(user=active)
+        persist_events([AuthEventLog(user=active, event_type=AuthEventLog.EventType.LOGIN_SUCCESS)])
+        UserLastActivity.objects.create(
+            user=User.objects.create_user(email="old@test.com", password="test123"),
+            last_login_success_at=timezone.now() - timedelta(days=40),
+        )
+        StudentProfile.objects.create(user=User.objects.get(email="old@test.com"))
+
+        r = self.client.get("/api/admin/reports/inactive-students/", {"days": 14})
+        ids = {item["student_user_id"] for item in r.data["items"]}
+        self.assertEqual(ids, {self.student.id, User.objects.get(email="old@test.com").id})
+        self.assertEqual(r.data["total"], 2)
+
+
+class ArchivedEventsTestCase(AuthTestCase):
+    """Geçici arşiv dizini; 2 sıcak, 3 arşivlenecek (90 günden eski) olay."""
+
+    def setUp(self):
+        import tempfile
+        from datetime import timedelta
+        from django.utils import timezone
+        super().setUp()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings_override = override_settings(AUTH_EVENT_ARCHIVE_DIR=tmp.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.authenticate_admin()
+        self.user = User.objects.create_user(email="old@test.com", password="test123")
+        now = timezone.now()
+        AuthEventLog.objects.bulk_create(
+            [
+                AuthEventLog(
+                    user=self.user,
+                    event_type=AuthEventLog.EventType.LOGIN_SUCCESS,
+                    created_at=now - timedelta(days=d),
+                )
+                for d in (1, 2, 100, 120)
+            ]
+            + [
+                AuthEventLog(
+                    event_type=AuthEventLog.EventType.LOGIN_FAIL,
+                    meta={"email": "ghost@test.com"},
+                    created_at=now - timedelta(days=110),
+                )
+            ]
+        )
+
+
+class AuthEventArchiveTests(ArchivedEventsTestCase):
+    def test_command_moves_old_rows_in_batches(self):
+        from django.core.management import call_command
+        call_command("archive_auth_events", days=90, batch_size=2, stdout=mock.MagicMock())
+        self.assertEqual(AuthEventLog.objects.count(), 2)
+
+    def test_login_logs_reads_archived_months_after_hot_rows(self):
+        from django.core.management import call_command
+        call_command("archive_auth_events", days=90, stdout=mock.MagicMock())
+        params = {"date_from": "2000-01-01", "page_size": 3}
+        r = self.client.get("/api/admin/reports/login-logs/", params)
+        self.assertEqual(r.data["total"], 5)
+        first = r.data["items"]
+        r = self.client.get("/api/admin/reports/login-logs/", {**params, "page": 2})
+        items = first + r.data["items"]
+        stamps = [i["created_at"] for i in items]
+        self.assertEqual(stamps, sorted(stamps, reverse=True))
+        self.assertEqual(items[2]["user"]["email"], "old@test.com")
+
+        r = self.client.get("/api/admin/reports/login-logs/", {**params, "search": "ghost"})
+        self.assertEqual(r.data["total"], 1)
+        self.assertEqual(r.data["items"][0]["event_type"], "LOGIN_FAIL")
+
+    def test_months_are_compacted_newest_first_and_streamed(self):
+        import gzip
+        import json
+        from datetime import datetime, timezone as dt_timezone
+        from django.core.management import call_command
+        from .utils import auth_event_archive as archive
+        call_command("archive_auth_events", days=90, stdout=mock.MagicMock())
+        paths = sorted(archive.get_archive_dir().glob("*.jsonl.gz"))
+        self.assertTrue(paths)
+        for path in paths:
+            with gzip.open(path, "rt") as fh:
+                stamps = [json.loads(line)["created_at"] for line in fh]
+            self.assertEqual(stamps, sorted(stamps, reverse=True))
+            self.assertEqual(archive.read_index(path)["rows"], len(stamps))
+
+        start, end = datetime(2000, 1, 1, tzinfo=dt_timezone.utc), datetime.now(dt_timezone.utc)
+        self.assertEqual(archive.count_archived_events(start, end), 3)
+        self.assertEqual(archive.count_archived_events(start, end, "LOGIN_FAIL"), 1)
+        # İndeksi güncel aylar bellekte sıralanmadan okunur
+        with mock.patch.object(archive, "_iter_unsorted_month", side_effect=AssertionError):
+            r = self.client.get(
+                "/api/admin/reports/login-logs/", {"date_from": "2000-01-01", "page_size": 2, "page": 2}
+            )
+        self.assertEqual(r.data["total"], 5)
+        self.assertEqual(len(r.data["items"]), 2)
+
+        # Sıkıştırma öncesi kesinti: tekrar yazılan batch tekilleştirilir
+        with gzip.open(paths[0], "rt") as fh:
+            archive._append(paths[0], [json.loads(fh.readline())])
+        self.assertIsNone(archive.read_index(paths[0]))
+        self.assertEqual(len(list(archive.iter_archived_events(start, end))), 3)
+        self.assertEqual(archive.compact_archives(), 1)
+        self.assertEqual(archive.count_archived_events(start, end), 3)
+
+
+class ReportExportTests(AuthTestCase):
+    def setUp(self):
+        from .models import StudentProfile
+        super().setUp()
+        self.authenticate_admin()
+        for i in range(3):
+            student = User.objects.create_user(
+                email=f"s{i}@test.com", password="test123", first_name="Öğrenci", last_name=str(i)
+            )
+            StudentProfile.objects.create(user=student)
+            AuthEventLog.objects.create(user=student, event_type=AuthEventLog.EventType.REFRESH)
+
+    def _body(self, response):
+        return b"".join(response.streaming_content).decode("utf-8")
+
+    def test_login_logs_csv_streams_all_rows(self):
+        r = self.client.get("/api/admin/reports/login-logs/", {"format": "csv", "page_size": 1})
+        self.assertEqual(r.status_code, 200)
+        self.assertTrue(r.streaming)
+        self.assertIn("attachment;", r["Content-Disposition"])
+        lines = self._body(r).lstrip("\ufeff").splitlines()
+        self.assertTrue(lines[0].startswith("id;created_at;event_type;user_id;user_email"))
+        self.assertEqual(len(lines), 4)
+
+    def test_inactive_students_jsonl(self):
+        import json
+        r = self.client.get("/api/admin/reports/inactive-students/", {"format": "jsonl"})
+        self.assertEqual(r.status_code, 200)
+        rows = [json.loads(line) for line in self._body(r).splitlines()]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]["student_name"], "Öğrenci 0")
+
+    def test_aggregated_report_export_and_permissions(self):
+        r = self.client.get("/api/admin/reports/daily-logins/", {"format": "csv"})
+        self.assertEqual(r.status_code, 200)
+        r = self.client.get("/api/admin/reports/student-progress/", {"format": "jsonl"})
+        self.assertEqual(len(self._body(r).splitlines()), 3)
+        self.client.credentials()
+        r = self.client.get("/api/admin/reports/login-logs/", {"format": "csv"})
+        self.assertEqual(r.status_code, 401)
+
+
+@override_settings(AUTH_EVENT_LOG_ASYNC=False)
+class AttemptedEmailSearchTests(AuthTestCase):
+    def setUp(self):
+        super().setUp()
+        self.authenticate_admin()
+
+    def test_failed_login_stores_normalized_email_and_is_searchable(self):
+        APIClient().post(
+            "/api/auth/login/", {"email": " Attacker@Evil.com ", "password": "x"}, format="json"
+        )
+        event = AuthEventLog.objects.get(event_type=AuthEventLog.EventType.LOGIN_FAIL)
+        self.assertEqual(event.attempted_email, "attacker@evil.com")
+
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.client.get("/api/admin/reports/login-logs/", {"search": "ATTACKER@"})
+        self.assertEqual(r.data["total"], 1)
+        log_queries = [q["sql"] for q in ctx.captured_queries if "accounts_autheventlog" in q["sql"]]
+        self.assertTrue(log_queries)
+        self.assertFalse([q for q in log_queries if "JSON_EXTRACT" in q.upper()])
+
+    def test_prefix_search_is_literal_and_normalized_like_writes(self):
+        from .admin_reports_views import _log_matches
+        for email in ("a_b@x.com", "axb@x.com"):
+            APIClient().post("/api/auth/login/", {"email": email, "password": "x"}, format="json")
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.client.get("/api/admin/reports/login-logs/", {"search": " A_B@ "})
+        self.assertEqual([i["meta"]["email"] for i in r.data["items"]], ["a_b@x.com"])
+        self.assertTrue([q for q in ctx.captured_queries if "LIKE" in q["sql"] and "attempted_email" in q["sql"]])
+        self.assertEqual(self.client.get("/api/admin/reports/login-logs/", {"search": "%"}).data["total"], 0)
+        # Bellekteki yol (arşiv / canlı akış) aynı normalizasyonu kullanır
+        event = AuthEventLog.objects.get(attempted_email="a_b@x.com")
+        self.assertTrue(_log_matches(event, None, None, "A_B@", {}))
+
+    def test_user_fields_still_match(self):
+        from .utils.auth_event_writer import persist_events
+        user = User.objects.create_user(email="ayse@test.com", password="x", first_name="Ayşe")
+        persist_events([AuthEventLog(user=user, event_type=AuthEventLog.EventType.LOGIN_SUCCESS)])
+        r = self.client.get("/api/admin/reports/login-logs/", {"search": "Ayş"})
+        self.assertEqual(r.data["total"], 1)
+
+
+@override_settings(AUTH_EVENT_LOG_ASYNC=False)
+class ClientInfoTests(AuthTestCase):
+    ANDROID_UA = (
+        "Mozilla/5.0 (Linux; Android 14; Pixel 8) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Mobile Safari/537.36"
+    )
+
+    def setUp(self):
+        super().setUp()
+        self.authenticate_admin()
+
+    def test_classifiers(self):
+        from .utils.client_info import classify_ip, parse_user_agent
+        self.assertEqual(parse_user_agent(self.ANDROID_UA), ("MOBILE", "Android", "Chrome"))
+        self.assertEqual(parse_user_agent("curl/8.4.0")[0], "BOT")
+        self.assertEqual(parse_user_agent(""), ("", "", ""))
+        self.assertEqual(classify_ip("127.0.0.1"), "LOCAL")
+        self.assertEqual(classify_ip("172.20.1.1"), "PRIVATE")
+        self.assertEqual(classify_ip("fd00::1"), "PRIVATE")
+        self.assertEqual(classify_ip("8.8.8.8"), "PUBLIC")
+        self.assertEqual(classify_ip("2001:4860::8888"), "IPV6")
+        self.assertEqual(classify_ip("not-an-ip"), "")
+
+    def test_fields_stored_at_write_time_and_filterable(self):
+        APIClient().post(
+            "/api/auth/login/",
+            {"email": "x@test.com", "password": "x"},
+            format="json",
+            HTTP_USER_AGENT=self.ANDROID_UA,
+            HTTP_X_FORWARDED_FOR="8.8.8.8, 10.0.0.1",
+        )
+        event = AuthEventLog.objects.get(event_type=AuthEventLog.EventType.LOGIN_FAIL)
+        self.assertEqual((event.device_family, event.os, event.ip_class), ("MOBILE", "Android", "PUBLIC"))
+        self.assertTrue(event.via_proxy)
+
+        r = self.client.get("/api/admin/reports/login-logs/", {"ip_class": "PUBLIC"})
+        self.assertEqual(r.data["total"], 1)
+        self.assertEqual(r.data["items"][0]["browser"], "Chrome")
+        r = self.client.get("/api/admin/reports/login-logs/", {"device_family": "DESKTOP"})
+        self.assertEqual(r.data["total"], 0)
+
+        r = self.client.get(
+            "/api/admin/reports/login-clients/", {"event_type": "LOGIN_FAIL", "group_by": "os"}
+        )
+        self.assertEqual(r.data["results"], [{"value": "Android", "count": 1, "unique_users": 0}])
+
+
+@override_settings(
+    AUTH_EVENT_LOG_ASYNC=False, AUTH_EVENT_STREAM_MAX_SECONDS=0.3, AUTH_EVENT_STREAM_SYNC_SECONDS=0.1
+)
+class LoginLogsStreamTests(AuthTestCase):
+    def setUp(self):
+        from .utils.auth_event_stream import hub
+        super().setUp()
+        hub.clear()
+        self.authenticate_admin()
+
+    def _events(self, response):
+        import json
+        body = b"".join(response.streaming_content).decode()
+        return [
+            json.loads(line[len("data: "):])
+            for line in body.splitlines()
+            if line.startswith("data: ")
+        ]
+
+    def test_hub_wakes_waiting_reader(self):
+        import threading
+        from .utils.auth_event_stream import hub
+        from .utils.auth_event_writer import persist_events
+        result = []
+        seq = hub.seq
+        reader = threading.Thread(target=lambda: result.extend(hub.wait(seq, timeout=5)[1]))
+        reader.start()
+        with self.captureOnCommitCallbacks(execute=True):
+            persist_events([AuthEventLog(user=self.admin, event_type=AuthEventLog.EventType.LOGOUT)])
+        reader.join(5)
+        self.assertEqual([e.event_type for e in result], ["LOGOUT"])
+
+    @override_settings(AUTH_EVENT_STREAM_SYNC_SECONDS=0)
+    def test_lower_pk_committed_later_is_not_dropped(self):
+        import json
+        from .admin_reports_views import _stream_logs
+        from .utils.auth_event_stream import hub
+        seq = hub.seq
+        late, early = (
+            AuthEventLog.objects.create(user=self.admin, event_type=t)
+            for t in (AuthEventLog.EventType.LOGIN_SUCCESS, AuthEventLog.EventType.LOGOUT)
+        )
+        hub.publish([early])
+        seq, events = hub.wait(seq, timeout=0)
+        self.assertEqual([e.pk for e in events], [early.pk])
+        hub.publish([late])
+        _, events = hub.wait(seq, timeout=0)
+        self.assertEqual([e.pk for e in events], [late.pk])
+
+        # Başka worker'da yazılan (hub'a gelmeyen) satırlar veritabanı taramasıyla gelir
+        def ids(chunk):
+            return [i["id"] for i in json.loads(chunk.split("data: ", 1)[1])["items"]]
+
+        high = AuthEventLog.objects.create(id=1000, user=self.admin, event_type=AuthEventLog.EventType.LOGIN_SUCCESS)
+        stream = _stream_logs(high.pk - 1, (None, None, "", {}))
+        next(stream)  # retry
+        self.assertEqual(ids(next(stream)), [high.pk])
+        low = AuthEventLog.objects.create(id=500, user=self.admin, event_type=AuthEventLog.EventType.LOGOUT)
+        chunk = next(stream)
+        # Örtüşme penceresindeki satırlar yeniden okunur; gönderilmiş olan (high) tekrar gitmez
+        self.assertIn(low.pk, ids(chunk))
+        self.assertNotIn(high.pk, ids(chunk))
+        self.assertTrue(chunk.startswith(f"id: {high.pk}\n"))
+        stream.close()
+
+    def test_stream_sends_new_filtered_rows_once(self):
+        from .utils.auth_event_writer import persist_events
+        with self.captureOnCommitCallbacks(execute=True):
+            persist_events([
+                AuthEventLog(user=self.admin, event_type=AuthEventLog.EventType.LOGIN_SUCCESS),
+                AuthEventLog(user=self.admin, event_type=AuthEventLog.EventType.REFRESH),
+            ])
+        r = self.client.get(
+            "/api/admin/reports/login-logs/stream/",
+            {"after_id": 0, "event_type": "LOGIN_SUCCESS"},
+            HTTP_ACCEPT="text/event-stream",
+        )
+        self.assertEqual(r.status_code, 200)
+        self.assertTrue(r["Content-Type"].startswith("text/event-stream"))
+        items = [item for e in self._events(r) for item in e["items"]]
+        self.assertEqual([i["event_type"] for i in items], ["LOGIN_SUCCESS"])
+        self.assertEqual(items[0]["user"]["email"], "admin@test.com")
+
+    def test_requires_admin(self):
+        self.client.credentials()
+        r = self.client.get("/api/admin/reports/login-logs/stream/", HTTP_ACCEPT="text/event-stream")
+        self.assertEqual(r.status_code, 401)
+
+
+class UniqueUserSketchTests(AuthTestCase):
+    def setUp(self):
+        super().setUp()
+        self.authenticate_admin()
+        self.teacher = User.objects.create_user(email="t@test.com", password="test123")
+
+    def test_hyperloglog_estimate_and_merge(self):
+        from shared.utils import HyperLogLog
+        a, b = HyperLogLog(), HyperLogLog()
+        a.update(range(0, 30000))
+        b.update(range(20000, 50000))
+        self.assertAlmostEqual(a.count(), 30000, delta=30000 * 0.05)
+        self.assertAlmostEqual(a.merge(b).count(), 50000, delta=50000 * 0.05)
+        self.assertEqual(HyperLogLog.from_bytes(b.to_bytes()).count(), b.count())
+
+    def test_incremental_sketches_match_rebuild_and_feed_dashboard(self):
+        from django.core.management import call_command
+        from django.utils import timezone
+        from .models import LoginDailySketch
+        from .services import estimate_unique_users
+        persist_logins(self.teacher, self.admin)
+        persist_logins(self.teacher)
+        today = timezone.localdate()
+        self.assertEqual(estimate_unique_users(today, today), 2)
+        incremental = list(LoginDailySketch.objects.values_list("day", "event_type", "registers"))
+        call_command("rebuild_login_rollup", stdout=mock.MagicMock())
+        rebuilt = list(LoginDailySketch.objects.values_list("day", "event_type", "registers"))
+        self.assertEqual(
+            [(d, e, bytes(r)) for d, e, r in incremental], [(d, e, bytes(r)) for d, e, r in rebuilt]
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.client.get("/api/admin/analytics/dashboard/")
+        self.assertEqual(r.data["active_users"], {"dau": 2, "wau": 2, "mau": 2})
+        self.assertEqual(r.data["weekly_active_trend"][-1]["count"], 2)
+        self.assertFalse([q for q in ctx.captured_queries if "accounts_autheventlog" in q["sql"]])
+        r = self.client.get("/api/admin/reports/daily-logins/")
+        self.assertEqual(r.data["period_unique_users"], 2)
+
+
+class LoginLogsKeysetTests(ArchivedEventsTestCase):
+    def test_login_logs_keyset_mode_continues_into_archive_without_count(self):
+        from django.core.management import call_command
+        call_command("archive_auth_events", days=90, stdout=mock.MagicMock())
+        params = {"date_from": "2000-01-01", "page_size": 2, "cursor": ""}
+        ids = []
+        with CaptureQueriesContext(connection) as ctx:
+            while True:
+                r = self.client.get("/api/admin/reports/login-logs/", params)
+                self.assertEqual(r.status_code, 200)
+                ids += [i["id"] for i in r.data["items"]]
+                if not r.data["has_more"]:
+                    break
+                params["cursor"] = r.data["next_cursor"]
+        self.assertEqual(len(ids), 5)
+        self.assertEqual(len(set(ids)), 5)
+        self.assertNotIn("total", r.data)
+        self.assertFalse([q for q in ctx.captured_queries if "COUNT(" in q["sql"].upper()])
+
+        r = self.client.get(
+            "/api/admin/reports/login-logs/",
+            {"date_from": "2000-01-01", "cursor": "", "include_total": "exact"},
+        )
+        self.assertEqual(r.data["total"], 5)
+        r = self.client.get("/api/admin/reports/login-logs/", {"cursor": "bogus"})
+        self.assertEqual(r.status_code, 400)
+
+    def test_naive_cursor_timestamp_is_400(self):
+        import base64
+        import json
+        from django.core.management import call_command
+        call_command("archive_auth_events", days=90, stdout=mock.MagicMock())
+        raw = json.dumps({"t": "2026-01-01T10:00:00", "id": 10 ** 9}).encode()
+        cursor = base64.urlsafe_b64encode(raw).decode().rstrip("=")
+        for params in ({"cursor": cursor}, {"cursor": cursor, "date_from": "2000-01-01"}):
+            r = self.client.get("/api/admin/reports/login-logs/", params)
+            self.assertEqual(r.status_code, 400)
+
+
+@override_settings(AUTH_EVENT_LOG_ASYNC=False)
+class ReportCacheTests(AuthTestCase):
+    def setUp(self):
+        super().setUp()
+        self.authenticate_admin()
+
+    def _write_login(self, **kwargs):
+        from .utils.auth_event_writer import persist_events
+        with self.captureOnCommitCallbacks(execute=True):
+            persist_events([
+                AuthEventLog(user=self.admin, event_type=AuthEventLog.EventType.LOGIN_SUCCESS, **kwargs)
+            ])
+
+    def test_hit_and_user_write_invalidation(self):
+        url = "/api/admin/reports/student-progress/"
+        self.assertEqual(self.client.get(url)["X-Report-Cache"], "MISS")
+        self.assertEqual(self.client.get(url)["X-Report-Cache"], "HIT")
+        # Parametre sırası / biçimi farklı ama aynı aralık -> aynı kayıt
+        r1 = self.client.get(url, {"date_from": "2026-01-01", "date_to": "2026-01-31T23:59:59"})
+        r2 = self.client.get(url, {"date_to": "2026-01-31 23:59:59", "date_from": "2026-01-01T00:00:00"})
+        self.assertEqual((r1["X-Report-Cache"], r2["X-Report-Cache"]), ("MISS", "HIT"))
+
+        User.objects.create_user(email="new@test.com", password="x", role=User.Role.STUDENT)
+        self.assertEqual(self.client.get(url)["X-Report-Cache"], "MISS")
+
+    def test_panel_assignment_invalidates_user_reports(self):
+        from .models import StudentProfile, TeacherProfile
+        url = "/api/admin/reports/teacher-performance/"
+        tp = TeacherProfile.objects.create(user=User.objects.create_user(email="t@test.com", password="x"))
+        sp = StudentProfile.objects.create(user=User.objects.create_user(email="s@test.com", password="x"))
+        self.assertEqual(self.client.get(url)["X-Report-Cache"], "MISS")
+        self.assertEqual(self.client.get(url)["X-Report-Cache"], "HIT")
+
+        panel = f"/api/panel/teachers/{tp.pk}/"
+        with mock.patch("accounts.panel_views._check_teacher_quota", return_value=(True, 10, 0, "")):
+            with self.captureOnCommitCallbacks(execute=True):
+                r = self.client.post(f"{panel}assign-students/", {"student_ids": [sp.pk]}, format="json")
+        self.assertEqual(r.data["assigned_count"], 1)
+        r = self.client.get(url)
+        self.assertEqual((r["X-Report-Cache"], r.data["results"][0]["students_count"]), ("MISS", 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f"{panel}unassign-students/", {"student_ids": [sp.pk]}, format="json")
+        r = self.client.get(url)
+        self.assertEqual((r["X-Report-Cache"], r.data["results"][0]["students_count"]), ("MISS", 0))
+
+    def test_auth_events_only_invalidate_overlapping_windows(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        url = "/api/admin/reports/daily-logins/"
+        past = {"date_from": "2020-01-01", "date_to": "2020-01-31"}
+        self.client.get(url)
+        self.client.get(url, past)
+        self._write_login()
+        self.assertEqual(self.client.get(url)["X-Report-Cache"], "MISS")
+        self.assertEqual(self.client.get(url, past)["X-Report-Cache"], "HIT")
+        self._write_login(created_at=timezone.now() - timedelta(days=2000))
+        self.assertEqual(self.client.get(url)["X-Report-Cache"], "HIT")
+
+    @override_settings(REPORT_CACHE_STALE_WHILE_REVALIDATE=True)
+    def test_stale_while_revalidate_and_stats(self):
+        from .report_cache import report_cache
+        url = "/api/admin/reports/daily-logins/"
+        self.client.get(url)
+        self._write_login()
+        with mock.patch.object(report_cache, "refresh_async") as refresh:
+            r = self.client.get(url)
+        self.assertEqual(r["X-Report-Cache"], "STALE")
+        refresh.assert_called_once()
+        refresh.call_args[0][1]()  # arka plan yenilemesini senkron çalıştır
+        r = self.client.get(url)
+        self.assertEqual(r["X-Report-Cache"], "HIT")
+        self.assertEqual(r.data["results"][-1]["logins"], 1)
+
+        stats = self.client.get("/api/admin/reports/cache-stats/").data
+        self.assertEqual((stats["hit"], stats["stale"], stats["miss"]), (1, 1, 1))
+        self.assertAlmostEqual(stats["hit_rate"], 0.6667, places=3)
+
+
+class TeacherPerformanceReportTests(AuthTestCase):
+    def setUp(self):
+        super().setUp()
+        self.authenticate_admin()
+        self.teacher = User.objects.create_user(email="t@test.com", password="test123")
+
+    def test_teacher_performance_sql_ordering_and_pagination(self):
+        from .models import StudentProfile, TeacherProfile
+        busy = TeacherProfile.objects.create(user=self.teacher)
+        idle = TeacherProfile.objects.create(
+            user=User.objects.create_user(email="t2@test.com", password="test123")
+        )
+        for i in range(3):
+            StudentProfile.objects.create(
+                user=User.objects.create_user(email=f"s{i}@test.com", password="test123"),
+                teacher=busy,
+            )
+        User.objects.filter(email="s0@test.com").update(must_change_password=True)
+        persist_logins(self.teacher, self.teacher)
+
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.client.get("/api/admin/reports/teacher-performance/", {"page_size": 1})
+        self.assertEqual((r.data["total"], r.data["page"], r.data["page_size"]), (2, 1, 1))
+        self.assertEqual([row["teacher_profile_id"] for row in r.data["results"]], [idle.id])
+        self.assertFalse([q for q in ctx.captured_queries if "accounts_autheventlog" in q["sql"]])
+        # Öğrenciler ayrıca çekilmez: rapor için yalnızca sayım + sayfa sorgusu
+        report_queries = [q for q in ctx.captured_queries if "accounts_teacherprofile" in q["sql"]]
+        self.assertEqual(len(report_queries), 2)
+
+        r = self.client.get("/api/admin/reports/teacher-performance/", {"page_size": 1, "page": 2})
+        row = r.data["results"][0]
+        self.assertEqual(row["teacher_profile_id"], busy.id)
+        self.assertEqual((row["students_count"], row["must_change_password_count"]), (3, 1))
+        self.assertEqual(row["logins_count"], 2)
+
+        r = self.client.get("/api/admin/reports/teacher-performance/", {"ordering": "last_login_at"})
+        self.assertEqual([row["teacher_profile_id"] for row in r.data["results"]], [busy.id, idle.id])
+        self.assertIsNone(r.data["results"][1]["last_login_at"])
+
+
+class InactiveStudentsReportTests(AuthTestCase):
+    def setUp(self):
+        super().setUp()
+        self.authenticate_admin()
+        self.student = User.objects.create_user(email="s@test.com", password="test123")
+
+    def test_inactive_students_ordered_and_paged_in_sql(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from .models import StudentProfile, UserLastActivity
+        StudentProfile.objects.create(user=self.student)
+        for email, age in (("old@test.com", 40), ("older@test.com", 90)):
+            user = User.objects.create_user(email=email, password="test123")
+            UserLastActivity.objects.create(user=user, last_login_success_at=timezone.now() - timedelta(days=age))
+            StudentProfile.objects.create(user=user)
+
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.client.get("/api/admin/reports/inactive-students/", {"days": 14, "page_size": 2})
+        self.assertEqual(r.data["total"], 3)
+        self.assertEqual([i["days_inactive"] for i in r.data["items"]], [90, 40])
+        page_query = next(q["sql"] for q in ctx.captured_queries if "accounts_studentprofile" in q["sql"])
+        self.assertIn("LIMIT", page_query.upper())
+
+        r = self.client.get("/api/admin/reports/inactive-students/", {"days": 14, "page_size": 2, "page": 2})
+        self.assertEqual([i["student_user_id"] for i in r.data["items"]], [self.student.id])
+        self.assertEqual(r.data["items"][0]["days_inactive"], 14)
+
+
+@override_settings(AUTH_EVENT_LOG_ASYNC=False)
+class RiskyTeachersReportTests(AuthTestCase):
+    def setUp(self):
+        from .models import StudentProfile, TeacherProfile
+        super().setUp()
+        self.authenticate_admin()
+        # risky: 2 öğrenci (biri şifre değiştirmeli), hiç giriş yok; active: 3 giriş; empty: öğrencisiz
+        self.risky, self.active, self.empty = (
+            TeacherProfile.objects.create(user=User.objects.create_user(email=f"{n}@test.com", password="x"))
+            for n in ("risky", "active", "empty")
+        )
+        for i, (teacher, mcp) in enumerate(((self.risky, True), (self.risky, False), (self.active, False))):
+            StudentProfile.objects.create(
+                user=User.objects.create_user(email=f"s{i}@test.com", password="x", must_change_password=mcp),
+                teacher=teacher,
+            )
+        AuthEventLog.objects.bulk_create(
+            AuthEventLog(user=self.active.user, event_type=AuthEventLog.EventType.LOGIN_SUCCESS) for _ in range(3)
+        )
+
+    def test_scores_and_top_n(self):
+        r = self.client.get("/api/admin/reports/risky-teachers/")
+        rows = {row["teacher_profile_id"]: row for row in r.data["results"]}
+        self.assertEqual([row["teacher_profile_id"] for row in r.data["results"]], [self.risky.id, self.active.id, self.empty.id])
+        # 40 * 2/2 + 30 * 1/2 + 30 * 1.0
+        self.assertEqual(rows[self.risky.id]["risk_score"], 85.0)
+        self.assertEqual(rows[self.risky.id]["must_change_password_ratio"], 0.5)
+        # 40 * 1/1 + 30 * 0.3 (3-5 giriş)
+        self.assertEqual(rows[self.active.id]["risk_score"], 49.0)
+        self.assertEqual(rows[self.active.id]["teacher_logins_last_14_days"], 3)
+        self.assertEqual(rows[self.active.id]["login_window_days"], 14)
+        self.assertEqual(rows[self.empty.id]["risk_score"], 0.0)
+
+        r = self.client.get("/api/admin/reports/risky-teachers/", {"limit": 1})
+        self.assertEqual([row["teacher_profile_id"] for row in r.data["results"]], [self.risky.id])
+
+    @override_settings(
+        RISKY_TEACHER_WEIGHTS={"inactive_students": 0, "must_change_password": 0, "low_login_activity": 100},
+        RISKY_TEACHER_LOGIN_BUCKETS=[(0, 1.0), (3, 0.5)],
+    )
+    def test_configurable_weights_and_buckets(self):
+        r = self.client.get("/api/admin/reports/risky-teachers/")
+        rows = {row["teacher_profile_id"]: row["risk_score"] for row in r.data["results"]}
+        self.assertEqual(rows, {self.risky.id: 100.0, self.active.id: 50.0, self.empty.id: 0.0})
+
+    @override_settings(RISKY_TEACHER_INACTIVE_DAYS=7)
+    def test_teacher_deleted_after_scoring_is_skipped(self):
+        from . import admin_reports_views
+        from .models import TeacherProfile
+        load = admin_reports_views.load_teacher_risk_columns
+
+        def load_then_delete(cutoff):
+            columns = load(cutoff)
+            TeacherProfile.objects.filter(pk=self.risky.pk).delete()
+            return columns
+
+        with mock.patch.object(admin_reports_views, "load_teacher_risk_columns", load_then_delete):
+            r = self.client.get("/api/admin/reports/risky-teachers/")
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual([row["teacher_profile_id"] for row in r.data["results"]], [self.active.id, self.empty.id])
+        self.assertEqual(r.data["results"][0]["login_window_days"], 7)
+
+    def test_top_matches_full_sort_with_ties(self):
+        import numpy as np
+        from .utils.risk_scoring import RiskScoringEngine
+        rng = np.random.default_rng(7)
+        columns = {
+            "teacher_profile_id": np.arange(1, 501),
+            "students_count": rng.integers(0, 4, 500),
+        }
+        risk = rng.choice([0.0, 12.5, 40.0, 85.0], 500)
+        expected = sorted(range(500), key=lambda i: (-risk[i], -columns["students_count"][i], i))[:25]
+        self.assertEqual(RiskScoringEngine.top(risk, columns, 25).tolist(), expected)
+
+
+@override_settings(AUTH_EVENT_LOG_ASYNC=False)
+class ReportSnapshotTests(AuthTestCase):
+    def setUp(self):
+        from .models import StudentProfile, TeacherProfile
+        super().setUp()
+        self.authenticate_admin()
+        self.teacher = User.objects.create_user(email="t@test.com", password="x")
+        TeacherProfile.objects.create(user=self.teacher)
+        StudentProfile.objects.create(user=User.objects.create_user(email="s@test.com", password="x"))
+
+    def _snapshot(self, only=""):
+        from django.core.management import call_command
+        call_command("snapshot_reports", only=only, stdout=mock.MagicMock())
+
+    def test_command_covers_every_report_view(self):
+        from .models import ReportSnapshot
+        self._snapshot()
+        reports = set(ReportSnapshot.objects.values_list("report", flat=True))
+        # Penceresi "şimdi"de biten event raporlarının (log / giriş sayımı) snapshot'ı yok
+        self.assertEqual(
+            reports, {"StudentProgressReportView", "MostUsedCoursesReportView", "InactiveStudentsReportView"}
+        )
+        self.assertEqual(ReportSnapshot.objects.get(report="InactiveStudentsReportView").row_count, 1)
+
+    def test_windowed_reports_show_todays_events(self):
+        from django.utils import timezone
+        from .models import ReportSnapshot
+        from .report_snapshots import store_snapshot
+        store_snapshot("DailyLoginsReportView", "", {"results": []}, timezone.now())
+        persist_logins(self.admin)
+        r = self.client.get("/api/admin/reports/daily-logins/")
+        self.assertEqual(r["X-Report-Cache"], "MISS")
+        self.assertEqual(r.data["results"][-1]["logins"], 1)
+        self.assertTrue(ReportSnapshot.objects.exists())
+
+    def test_login_count_reports_show_todays_logins(self):
+        from django.utils import timezone
+        from .report_snapshots import store_snapshot
+        store_snapshot("MostActiveTeachersReportView", "", {"results": []}, timezone.now())
+        persist_logins(self.teacher)
+        r = self.client.get("/api/admin/reports/most-active-teachers/")
+        self.assertEqual(r["X-Report-Cache"], "MISS")
+        self.assertEqual(r.data["results"][0]["logins_count"], 1)
+
+    def test_missing_snapshot_lookup_is_cached(self):
+        from .report_cache import report_cache
+        url = "/api/admin/reports/inactive-students/"
+        self.client.get(url)
+        report_cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.client.get(url)["X-Report-Cache"], "MISS")
+        self.assertFalse([q for q in ctx.captured_queries if "accounts_reportsnapshot" in q["sql"]])
+        # Yeni yazılan snapshot aramayı geçersiz kılar
+        self._snapshot(only="inactive-students")
+        report_cache.clear()
+        self.assertEqual(self.client.get(url)["X-Report-Cache"], "SNAPSHOT")
+
+    def test_default_params_served_from_snapshot(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from .models import StudentProfile
+        self._snapshot(only="inactive-students")
+        url = "/api/admin/reports/inactive-students/"
+        today = timezone.localdate()
+        page_params = {
+            "date_from": f"{today - timedelta(days=30)}T00:00:00",
+            "date_to": f"{today}T23:59:59",
+            "days": 14,
+            "page": 1,
+            "page_size": 20,
+        }
+        for params in ({}, page_params):
+            r = self.client.get(url, params)
+            self.assertEqual(r["X-Report-Cache"], "SNAPSHOT")
+            self.assertEqual(r.data["total"], 1)
+            self.assertGreaterEqual(r.data["snapshot"]["age_seconds"], 0)
+            self.assertIn("X-Report-Snapshot-Age", r)
+
+        r = self.client.get(url, {"days": 7})
+        self.assertEqual(r["X-Report-Cache"], "MISS")
+        self.assertNotIn("snapshot", r.data)
+
+        # Snapshot sonrası kullanıcı yazımı (TOPIC_USERS) snapshot'ı geçersiz kılar
+        StudentProfile.objects.create(user=User.objects.create_user(email="s2@test.com", password="x"))
+        r = self.client.get(url)
+        self.assertEqual(r["X-Report-Cache"], "MISS")
+        self.assertEqual(r.data["total"], 2)
+
+        stats = self.client.get("/api/admin/reports/cache-stats/").data
+        self.assertEqual((stats["snapshot"], stats["miss"]), (2, 2))
+
+
+@override_settings(AUTH_EVENT_LOG_ASYNC=False)
+class ReportJobTests(AuthTestCase):
+    def setUp(self):
+        import shutil
+        import tempfile
+        super().setUp()
+        media, job_root = tempfile.mkdtemp(), tempfile.mkdtemp()
+        for path in (media, job_root):
+            self.addCleanup(shutil.rmtree, path, ignore_errors=True)
+        storage_override = self.settings(MEDIA_ROOT=media, REPORT_JOB_ROOT=job_root)
+        storage_override.enable()
+        self.addCleanup(storage_override.disable)
+        self.authenticate_admin()
+        for _ in range(3):
+            AuthEventLog.objects.create(user=self.admin, event_type=AuthEventLog.EventType.LOGIN_SUCCESS)
+
+    def _run_worker(self):
+        from django.core.management import call_command
+        call_command("run_report_jobs", once=True, stdout=mock.MagicMock())
+
+    def test_job_lifecycle_and_download(self):
+        url = "/api/admin/reports/jobs/"
+        r = self.client.post(
+            url, {"report": "login-logs", "format": "csv", "params": {"date_from": "2020-01-01"}}, format="json"
+        )
+        self.assertEqual(r.status_code, 202)
+        self.assertEqual(r.data["status"], "QUEUED")
+        job_url = f"{url}{r.data['id']}/"
+
+        self._run_worker()
+        r = self.client.get(job_url)
+        self.assertEqual(r.data["status"], "SUCCEEDED")
+        self.assertEqual(r.data["rows_written"], 3)
+        self.assertTrue(r.data["download_url"].endswith(f"{job_url}download/"))
+
+        r = self.client.get(f"{job_url}download/")
+        self.assertEqual(r.status_code, 200)
+        self.assertIn("attachment;", r["Content-Disposition"])
+        lines = b"".join(r.streaming_content).decode("utf-8").lstrip("\ufeff").splitlines()
+        self.assertTrue(lines[0].startswith("id;created_at;event_type"))
+        self.assertEqual(len(lines), 4)
+
+    def test_result_file_is_only_served_by_download_view(self):
+        import os
+        from django.conf import settings
+        from django.http import Http404
+        from django.test import RequestFactory
+        from django.views.static import serve
+        from .report_jobs import claim_next, enqueue, run_job
+        job = enqueue("login-logs", {}, "csv")
+        run_job(claim_next())
+        job.refresh_from_db()
+        other = enqueue("login-logs", {}, "csv")
+        run_job(claim_next())
+        other.refresh_from_db()
+
+        path = job.result_file.path
+        self.assertTrue(path.startswith(settings.REPORT_JOB_ROOT + os.sep))
+        self.assertFalse(path.startswith(settings.MEDIA_ROOT + os.sep))
+        # Aynı rapor/gün/ardışık pk'dan yol tahmin edilemez
+        self.assertNotEqual(job.result_file.name.split("/")[2], other.result_file.name.split("/")[2])
+        with self.assertRaises(NotImplementedError):
+            job.result_file.url
+        # DEBUG'daki /media/ servisi dosyayı bulamaz
+        with self.assertRaises(Http404):
+            serve(RequestFactory().get("/"), job.result_file.name, document_root=settings.MEDIA_ROOT)
+
+        download_url = f"/api/admin/reports/jobs/{job.pk}/download/"
+        self.assertEqual(self.client.get(download_url).status_code, 200)
+        self.client.credentials()
+        self.assertEqual(self.client.get(download_url).status_code, 401)
+
+    def test_json_job_and_failures(self):
+        from .models import ReportJob
+        r = self.client.post("/api/admin/reports/jobs/", {"report": "login-logs", "format": "json"}, format="json")
+        bad = self.client.post(
+            "/api/admin/reports/jobs/",
+            {"report": "risky-teachers", "format": "json", "params": {"limit": "bozuk"}},
+            format="json",
+        )
+        self.assertEqual(self.client.post("/api/admin/reports/jobs/", {"report": "nope"}, format="json").status_code, 400)
+        self._run_worker()
+        job = ReportJob.objects.get(pk=r.data["id"])
+        self.assertEqual(job.status, ReportJob.Status.SUCCEEDED)
+        self.assertEqual(job.rows_written, 3)
+        self.assertEqual(ReportJob.objects.get(pk=bad.data["id"]).status, ReportJob.Status.FAILED)
+        self.assertEqual(self.client.get(f"/api/admin/reports/jobs/{bad.data['id']}/download/").status_code, 404)
+
+    def test_json_job_covers_every_page(self):
+        import json
+        from .models import ReportJob
+        from .report_jobs import claim_next, enqueue, run_job
+        job = enqueue("login-logs", {"page_size": 1, "page": 1}, "json")
+        run_job(claim_next())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.rows_written), (ReportJob.Status.SUCCEEDED, 3))
+        with job.result_file.open("rb") as fh:
+            self.assertEqual(len(json.load(fh)["results"]), 3)
+
+    def test_stale_runner_cannot_overwrite_requeued_job(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from .models import ReportJob
+        from .report_jobs import _Heartbeat, claim_next, enqueue, requeue_stale, run_job
+        job = enqueue("login-logs", {}, "csv")
+        old_run = claim_next()
+        ReportJob.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+        requeue_stale()
+        new_run = claim_next()
+        self.assertEqual(new_run.attempts, 2)
+
+        heartbeat = _Heartbeat(old_run)
+        heartbeat.beat()
+        self.assertTrue(heartbeat.lost)
+        run_job(old_run)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result_file.name), (ReportJob.Status.RUNNING, ""))
+
+        _Heartbeat(new_run).beat()
+        job.refresh_from_db()
+        self.assertGreater(job.heartbeat_at, timezone.now() - timedelta(minutes=1))
+        run_job(new_run)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.rows_written), (ReportJob.Status.SUCCEEDED, 3))
+
+    def test_claim_is_exclusive_and_stale_jobs_requeue(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from .models import ReportJob
+        from .report_jobs import claim_next, enqueue, requeue_stale
+        job = enqueue("daily-logins", {}, "json")
+        self.assertEqual(claim_next().pk, job.pk)
+        self.assertIsNone(claim_next())
+        ReportJob.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(requeue_stale(), (1, 0))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (ReportJob.Status.QUEUED, 1))
@@ -0,0 +1,192 @@
+"""
+Login brute-force throttle.
+IP ve normalize e-posta başına kayan pencere (sliding window) limiti.
+DRF throttle olarak view seviyesinde çalışır: reddedilen denemede authenticate()
+(PBKDF2 hash) hiç çalışmaz. Limitler SiteSettings'ten okunur.
+
+Varsayılan sayaç süreç içidir; LOGIN_THROTTLE_CACHE_ALIAS verilirse (ör. Redis)
+sayaçlar o Django cache backend'inde paylaşılır.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.exceptions import Throttled
+from rest_framework.throttling import BaseThrottle
+
+from site_settings.utils import get_cached_site_settings
+
+from .models import AuthEventLog
+from .utils.auth_logging import log_auth_event, normalize_attempted_email
+
+THROTTLE_MESSAGE = "Çok fazla giriş denemesi. Lütfen daha sonra tekrar deneyin."
+
+
+class MemorySlidingWindowLimiter:
+    """Anahtar başına zaman damgası kuyruğu; anahtar sayısı LRU ile sınırlı."""
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._hits = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key, limit, window, now=None):
+        """Denemeyi sayar. (izin_var_mı, kaç_saniye_sonra) döner."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            hits = self._hits.get(key)
+            if hits is None:
+                hits = self._hits[key] = deque()
+            self._hits.move_to_end(key)
+            while hits and hits[0] <= now - window:
+                hits.popleft()
+            if len(hits) >= limit:
+                return False, hits[0] + window - now
+            hits.append(now)
+            while len(self._hits) > self.max_keys:
+                self._hits.popitem(last=False)
+            return True, 0
+
+    def reset(self, key):
+        with self._lock:
+            self._hits.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._hits.clear()
+
+
+class CacheSlidingWindowLimiter:
+    """
+    Paylaşımlı cache üzerinde kayan pencere yaklaşımı: mevcut ve önceki sabit pencere
+    sayaçları, önceki pencerenin örtüşen kısmı oranında ağırlıklandırılır.
+    """
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _keys(self, key, window, now):
+        bucket = int(now // window)
+        return f"login-throttle:{key}:{bucket}", f"login-throttle:{key}:{bucket - 1}"
+
+    def hit(self, key, limit, window, now=None):
+        now = time.time() if now is None else now
+        cur_key, prev_key = self._keys(key, window, now)
+        counts = self.cache.get_many([cur_key, prev_key])
+        elapsed = (now % window) / window
+        estimated = counts.get(prev_key, 0) * (1 - elapsed) + counts.get(cur_key, 0)
+        if estimated >= limit:
+            return False, window * (1 - elapsed)
+        self.cache.add(cur_key, 0, timeout=window * 2)
+        try:
+            self.cache.incr(cur_key)
+        except ValueError:
+            self.cache.set(cur_key, 1, timeout=window * 2)
+        return True, 0
+
+    def reset(self, key):
+        now = time.time()
+        window = get_login_throttle_config()["window"]
+        self.cache.delete_many(list(self._keys(key, window, now)))
+
+    def clear(self):
+        pass
+
+
+def _build_limiter():
+    alias = getattr(settings, "LOGIN_THROTTLE_CACHE_ALIAS", None)
+    if alias:
+        return CacheSlidingWindowLimiter(alias)
+    return MemorySlidingWindowLimiter()
+
+
+limiter = _build_limiter()
+
+
+def get_login_throttle_config():
+    obj = get_cached_site_settings()
+    if obj is None:
+        return {"enabled": True, "window": 300, "ip_limit": 30, "email_limit": 10}
+    return {
+        "enabled": obj.login_throttle_enabled,
+        "window": obj.login_throttle_window_seconds,
+        "ip_limit": obj.login_throttle_ip_limit,
+        "email_limit": obj.login_throttle_email_limit,
+    }
+
+
+def normalize_login_email(value):
+    return normalize_attempted_email(value)
+
+
+def get_throttle_ip(request):
+    """
+    IP limiti anahtarı. X-Forwarded-For istemcinin yazdığı bir başlık olduğundan yalnızca
+    LOGIN_THROTTLE_TRUSTED_PROXY_COUNT kadar güvenilen proxy arkasında ve sağdan okunur.
+    """
+    remote_addr = request.META.get("REMOTE_ADDR") or ""
+    proxies = getattr(settings, "LOGIN_THROTTLE_TRUSTED_PROXY_COUNT", 0)
+    xff = request.META.get("HTTP_X_FORWARDED_FOR")
+    if proxies <= 0 or not xff:
+        return remote_addr
+    addrs = [a.strip() for a in xff.split(",") if a.strip()]
+    if not addrs:
+        return remote_addr
+    return addrs[-min(proxies, len(addrs))]
+
+
+def reset_login_attempts(email):
+    """Başarılı login sonrası e-posta sayacını sıfırlar (IP sayacı korunur)."""
+    email = normalize_login_email(email)
+    if email:
+        limiter.reset(f"email:{email}")
+
+
+class LoginAttemptThrottle(BaseThrottle):
+    """/auth/login/ için IP + e-posta kayan pencere limiti."""
+
+    def allow_request(self, request, view):
+        config = get_login_throttle_config()
+        if not config["enabled"]:
+            return True
+
+        # Nesne olmayan gövdeyi (ör. JSON liste) serializer 400 ile reddeder
+        data = request.data if isinstance(request.data, Mapping) else {}
+        email = normalize_login_email(data.get("email"))
+        checks = [
+            ("THROTTLED_IP", f"ip:{get_throttle_ip(request) or 'unknown'}", config["ip_limit"]),
+        ]
+        if email:
+            checks.append(("THROTTLED_EMAIL", f"email:{email}", config["email_limit"]))
+
+        for reason, key, limit in checks:
+            allowed, wait = limiter.hit(key, limit, config["window"])
+            if not allowed:
+                self._wait = wait
+                log_auth_event(
+                    request,
+                    AuthEventLog.EventType.LOGIN_FAIL,
+                    meta={"email": email, "reason": reason},
+                )
+                return False
+        return True
+
+    def wait(self):
+        return math.ceil(getattr(self, "_wait", 0)) or None
+
+
+class LoginThrottleMixin:
+    """View mixin: throttle reddinde Türkçe mesajla 429 döner."""
+
+    throttle_classes = [LoginAttemptThrottle]
+
+    def throttled(self, request, wait):
+        raise Throttled(wait=wait, detail=THROTTLE_MESSAGE)
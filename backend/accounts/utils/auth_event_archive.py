@@ -0,0 +1,261 @@
+"""
+AuthEventLog saklama (retention) ve arşivi.
+Saklama süresinden eski satırlar aylık gzip JSONL dosyalarına taşınır ve sıcak tablodan
+sınırlı batch'ler halinde silinir. Kesim noktası gün başına hizalıdır: sıcak tabloda her zaman
+tam günler kalır (LoginDailyRollup yeniden hesaplaması bozulmaz).
+
+Dosya: AUTH_EVENT_ARCHIVE_DIR/auth_events-YYYY-MM.jsonl.gz. Batch'ler dosyaya ek gzip
+üyesi (member) olarak yazılır; silme, yazım diske alındıktan sonra yapılır. Silme öncesi
+kesinti olursa satır bir sonraki çalışmada tekrar yazılır.
+
+Çalışma sonunda değişen aylar sıkıştırılır (compact_archives): satırlar id ile tekilleştirilip
+yeniden eskiye (created_at, id) sıralı tek gzip akışı olarak yeniden yazılır ve yanına
+auth_events-YYYY-MM.index.json yazılır (satır sayısı, olay tipi sayıları, zaman aralığı, dosya
+boyutu). Okuma tarafı indeksi güncel ayları satır satır akışla okur ve aralığın altına inince
+durur; bellek kullanımı ay boyutundan bağımsızdır. İndeksi olmayan / eskimiş ay (sıkıştırma
+öncesi kesinti) bellekte sıralanarak okunur.
+"""
+import gzip
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from accounts.models import AuthEventLog
+
+
+def get_retention_days():
+    return getattr(settings, "AUTH_EVENT_LOG_RETENTION_DAYS", 90)
+
+
+def get_archive_dir():
+    return Path(getattr(settings, "AUTH_EVENT_ARCHIVE_DIR", settings.BASE_DIR / "archive" / "auth_events"))
+
+
+def get_archive_cutoff(days=None):
+    """Bu andan eski satırlar arşivlenir (yerel gün başı)."""
+    days = get_retention_days() if days is None else days
+    start_day = timezone.localdate() - timedelta(days=days)
+    return timezone.make_aware(datetime.combine(start_day, datetime.min.time()))
+
+
+def archive_path(year, month):
+    return get_archive_dir() / f"auth_events-{year:04d}-{month:02d}.jsonl.gz"
+
+
+def index_path(path):
+    return path.with_name(path.name.replace(".jsonl.gz", ".index.json"))
+
+
+def _serialize(event):
+    row = {}
+    for field in AuthEventLog._meta.concrete_fields:
+        value = getattr(event, field.attname)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        row[field.attname] = value
+    return row
+
+
+def _deserialize(row):
+    """Arşiv satırından kaydedilmemiş AuthEventLog (bilinmeyen alanlar atlanır)."""
+    fields = {f.attname: f for f in AuthEventLog._meta.concrete_fields}
+    data = {}
+    for key, value in row.items():
+        if key not in fields:
+            continue
+        if value is not None and fields[key].get_internal_type() == "DateTimeField":
+            value = parse_datetime(value)
+        data[key] = value
+    return AuthEventLog(**data)
+
+
+def _append(path, rows):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "ab") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="ab") as gz:
+            for row in rows:
+                gz.write(json.dumps(row, ensure_ascii=False, separators=(",", ":")).encode())
+                gz.write(b"\n")
+        raw.flush()
+        os.fsync(raw.fileno())
+
+
+def _write_atomic(path, write):
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as raw:
+        write(raw)
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(tmp, path)
+
+
+def read_index(path):
+    """Aylık dosyanın indeksi; dosya sıkıştırmadan sonra değiştiyse (ek batch) None."""
+    try:
+        index = json.loads(index_path(path).read_text())
+    except (OSError, ValueError):
+        return None
+    if not path.exists() or index.get("size") != path.stat().st_size:
+        return None
+    return index
+
+
+def compact_month(path):
+    """
+    Aylık dosyayı id ile tekilleştirip yeniden eskiye sıralı yeniden yazar, indeksini günceller.
+    Ayın tamamı bellekte sıralanır; yalnızca arşiv komutu (çevrim dışı) çağırır.
+    """
+    rows = {}
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        for line in fh:
+            if line.strip():
+                row = json.loads(line)
+                rows[row["id"]] = row
+    ordered = sorted(rows.values(), key=lambda r: (parse_datetime(r["created_at"]), r["id"]), reverse=True)
+
+    def write(raw):
+        with gzip.GzipFile(fileobj=raw, mode="wb") as gz:
+            for row in ordered:
+                gz.write(json.dumps(row, ensure_ascii=False, separators=(",", ":")).encode())
+                gz.write(b"\n")
+
+    _write_atomic(path, write)
+    by_event_type = {}
+    for row in ordered:
+        by_event_type[row["event_type"]] = by_event_type.get(row["event_type"], 0) + 1
+    index = {
+        "rows": len(ordered),
+        "by_event_type": by_event_type,
+        "newest": ordered[0]["created_at"] if ordered else None,
+        "oldest": ordered[-1]["created_at"] if ordered else None,
+        "size": path.stat().st_size,
+    }
+    _write_atomic(index_path(path), lambda raw: raw.write(json.dumps(index).encode()))
+    return index
+
+
+def compact_archives():
+    """İndeksi olmayan veya eskimiş tüm aylık dosyaları sıkıştırır; sıkıştırılan dosya sayısı döner."""
+    directory = get_archive_dir()
+    if not directory.exists():
+        return 0
+    compacted = 0
+    for path in sorted(directory.glob("auth_events-*.jsonl.gz")):
+        if read_index(path) is None:
+            compact_month(path)
+            compacted += 1
+    return compacted
+
+
+def archive_events(before, batch_size=5000, max_batches=None):
+    """
+    created_at < before olan satırları arşive taşır. (taşınan satır, batch) sayısı döner.
+    Her batch ayrı transaction'dır; tablo kilidi kısa tutulur. Sonunda değişen aylar sıkıştırılır.
+    """
+    moved = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        with transaction.atomic():
+            events = list(
+                AuthEventLog.objects.filter(created_at__lt=before)
+                .order_by("created_at", "id")[:batch_size]
+            )
+            if not events:
+                break
+            by_month = {}
+            for e in events:
+                local = timezone.localtime(e.created_at)
+                by_month.setdefault((local.year, local.month), []).append(_serialize(e))
+            for (year, month), rows in by_month.items():
+                _append(archive_path(year, month), rows)
+            AuthEventLog.objects.filter(pk__in=[e.pk for e in events]).delete()
+        moved += len(events)
+        batches += 1
+    compact_archives()
+    return moved, batches
+
+
+def _months_between(start, end):
+    start = timezone.localtime(start)
+    end = timezone.localtime(end)
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _month_paths(date_from, date_to):
+    """Aralığa düşen mevcut aylık dosyalar, yeniden eskiye."""
+    for year, month in reversed(list(_months_between(date_from, date_to))):
+        path = archive_path(year, month)
+        if path.exists():
+            yield path
+
+
+def has_archived_months(date_from, date_to):
+    return next(_month_paths(date_from, date_to), None) is not None
+
+
+def _iter_sorted_month(path, date_from, date_to):
+    """Sıkıştırılmış (yeniden eskiye sıralı, tekil) ay: akış halinde, aralığın altında durur."""
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            event = _deserialize(json.loads(line))
+            if event.created_at > date_to:
+                continue
+            if event.created_at < date_from:
+                return
+            yield event
+
+
+def _iter_unsorted_month(path, date_from, date_to):
+    """İndeksi eskimiş ay (sıkıştırma öncesi kesinti): bellekte tekilleştirip sıralar."""
+    seen = {}
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            event = _deserialize(json.loads(line))
+            if date_from <= event.created_at <= date_to:
+                seen[event.pk] = event
+    yield from sorted(seen.values(), key=lambda e: (e.created_at, e.pk), reverse=True)
+
+
+def iter_archived_events(date_from, date_to):
+    """
+    [date_from, date_to] aralığındaki arşivlenmiş eventler (kaydedilmemiş AuthEventLog).
+    Sıra: yeniden eskiye (created_at, id). Yalnızca aralığa düşen ayların dosyaları açılır;
+    sıcak tablodaki satırların tamamı arşivdekilerden yenidir. Tüketici erken durabilir:
+    sıkıştırılmış aylar satır satır okunur.
+    """
+    for path in _month_paths(date_from, date_to):
+        if read_index(path) is None:
+            yield from _iter_unsorted_month(path, date_from, date_to)
+        else:
+            yield from _iter_sorted_month(path, date_from, date_to)
+
+
+def count_archived_events(date_from, date_to, event_type=None):
+    """
+    Aralıktaki arşivlenmiş event sayısı (isteğe bağlı olay tipiyle). Tamamı aralıkta kalan
+    sıkıştırılmış aylar indeksten sayılır; diğerleri akışla sayılır.
+    """
+    total = 0
+    for path in _month_paths(date_from, date_to):
+        index = read_index(path)
+        if index and index["rows"] and (
+            date_from <= parse_datetime(index["oldest"]) and parse_datetime(index["newest"]) <= date_to
+        ):
+            total += index["by_event_type"].get(event_type, 0) if event_type else index["rows"]
+            continue
+        read = _iter_sorted_month if index else _iter_unsorted_month
+        total += sum(1 for e in read(path, date_from, date_to) if not event_type or e.event_type == event_type)
+    return total
@@ -0,0 +1,54 @@
+"""
+Canlı auth event yayını (login-logs "canlı" modu için süreç içi fan-out).
+persist_events batch'i commit edildikten sonra eventleri hub'a bırakır; SSE bağlantıları
+Condition üzerinde bekler ve yeni satırları veritabanına sormadan alır.
+Tampon pk'ye göre değil yayın sırasına (seq) göre tutulur: senkron yazım yedeği veya istek
+thread'inden yazılan daha küçük pk'li bir satır, büyük pk'den sonra commit edilse de düşmez;
+tekrarları akış tarafı id ile ayıklar.
+Tampon sınırlıdır ve yalnızca bu sürecin yazdıklarını görür; başka worker'larda yazılan
+veya tampondan taşan satırlar için akış tarafı seyrek bir id > N PK aralık sorgusu yapar.
+"""
+import threading
+from collections import deque
+
+from django.conf import settings
+
+
+class AuthEventHub:
+    def __init__(self, buffer_size=1000):
+        self._events = deque(maxlen=buffer_size)  # (seq, event)
+        self._seq = 0
+        self._cond = threading.Condition()
+
+    @property
+    def seq(self):
+        """Son yayın sırası; abonelik bu değerden başlar."""
+        with self._cond:
+            return self._seq
+
+    def publish(self, events):
+        """Commit edilmiş eventleri (pk dolu) tampona ekler ve bekleyenleri uyandırır."""
+        events = sorted((e for e in events if e.pk is not None), key=lambda e: e.pk)
+        if not events:
+            return
+        with self._cond:
+            for e in events:
+                self._seq += 1
+                self._events.append((self._seq, e))
+            self._cond.notify_all()
+
+    def wait(self, after_seq, timeout):
+        """
+        (son seq, after_seq'ten sonra yayınlanan tampondaki eventler); yoksa en fazla timeout
+        saniye bekler.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq > after_seq, timeout=timeout)
+            return self._seq, [e for seq, e in self._events if seq > after_seq]
+
+    def clear(self):
+        with self._cond:
+            self._events.clear()
+
+
+hub = AuthEventHub(buffer_size=getattr(settings, "AUTH_EVENT_STREAM_BUFFER_SIZE", 1000))
@@ -0,0 +1,121 @@
+"""
+Buffered AuthEventLog writer.
+Eventler sınırlı bir bellek kuyruğuna atılır; arka plan thread'i her N event'te
+veya M milisaniyede bir bulk_create ile yazar. Kuyruk doluysa senkron yazılır,
+süreç kapanırken kuyrukta kalanlar flush edilir.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from accounts.models import AuthEventLog
+
+logger = logging.getLogger(__name__)
+
+
+def persist_events(events):
+    """Event listesini ve türetilmiş verileri tek transaction içinde yazar."""
+    from accounts.report_cache import report_cache
+    from accounts.services import on_auth_events_written
+    from .auth_event_stream import hub
+
+    if not events:
+        return
+    with transaction.atomic():
+        AuthEventLog.objects.bulk_create(events)
+        on_auth_events_written(events)
+        transaction.on_commit(lambda: hub.publish(events))
+        transaction.on_commit(lambda: report_cache.note_auth_events(events))
+
+
+class AuthEventWriter:
+    def __init__(self, max_queue_size=10000, batch_size=200, flush_interval_ms=500):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000.0
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def submit(self, event):
+        """Event'i kuyruğa atar; async kapalıysa veya kuyruk doluysa senkron yazar."""
+        if not getattr(settings, "AUTH_EVENT_LOG_ASYNC", False):
+            self._write([event])
+            return
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self._write([event])
+
+    def flush(self):
+        """Kuyrukta bekleyen tüm eventleri çağıran thread'de yazar."""
+        batch = self._drain(block=False)
+        while batch:
+            self._write(batch)
+            batch = self._drain(block=False)
+
+    def shutdown(self, timeout=5.0):
+        self._stop.set()
+        thread = self._thread
+        if thread and thread.is_alive() and self._pid == os.getpid():
+            thread.join(timeout)
+        self.flush()
+
+    def _ensure_started(self):
+        pid = os.getpid()
+        if self._thread is not None and self._pid == pid and self._thread.is_alive():
+            return
+        with self._lock:
+            # fork sonrası (gunicorn preload) her süreç kendi thread'ini başlatır
+            if self._thread is not None and self._pid == pid and self._thread.is_alive():
+                return
+            self._pid = pid
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="auth-event-writer", daemon=True
+            )
+            self._thread.start()
+
+    def _drain(self, block):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if block and timeout > 0:
+                    batch.append(self._queue.get(timeout=timeout))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._drain(block=True)
+            if batch:
+                self._write(batch)
+                close_old_connections()
+
+    def _write(self, batch):
+        try:
+            persist_events(batch)
+        except Exception:
+            # Log hatası uygulama akışını bozmasın
+            logger.exception("AuthEventLog yazılamadı (%d event)", len(batch))
+
+
+writer = AuthEventWriter(
+    max_queue_size=getattr(settings, "AUTH_EVENT_LOG_QUEUE_SIZE", 10000),
+    batch_size=getattr(settings, "AUTH_EVENT_LOG_BATCH_SIZE", 200),
+    flush_interval_ms=getattr(settings, "AUTH_EVENT_LOG_FLUSH_INTERVAL_MS", 500),
+)
+atexit.register(writer.shutdown)
@@ -1,7 +1,12 @@
 """
 Auth event logging utility. IP ve user_agent request.META'dan alınır.
+Yazma işi AuthEventWriter'a devredilir (AUTH_EVENT_LOG_ASYNC ile toplu/arka planda).
 """
+from django.utils import timezone
+
 from accounts.models import AuthEventLog
+from .auth_event_writer import writer
+from .client_info import classify_ip, parse_user_agent
 
 
 def _get_client_ip(request):
@@ -19,19 +24,48 @@ def _get_user_agent(request):
     return request.META.get("HTTP_USER_AGENT", "")[:500]
 
 
-def log_auth_event(request, event_type, user=None, meta=None):
+def normalize_attempted_email(value):
+    """Aranabilir biçim: baş/son boşluksuz, küçük harf."""
+    return str(value or "").strip().lower()[:254]
+
+
+def build_auth_event(request, event_type, user=None, meta=None, user_id=None):
+    """
+    Kaydedilmemiş AuthEventLog nesnesi kurar (created_at = event anı).
+    user nesnesi yüklenmemişse yalnızca user_id verilebilir.
+    """
+    m = dict(meta) if meta else {}
+    if request and request.META.get("HTTP_X_FORWARDED_FOR"):
+        m["x_forwarded_for"] = request.META["HTTP_X_FORWARDED_FOR"]
+    final_meta = m if m else None
+    ip_address = _get_client_ip(request)
+    user_agent = _get_user_agent(request)
+    device_family, os_name, browser = parse_user_agent(user_agent)
+    event = AuthEventLog(
+        event_type=event_type,
+        created_at=timezone.now(),
+        ip_address=ip_address,
+        user_agent=user_agent,
+        meta=final_meta,
+        attempted_email=normalize_attempted_email(m.get("email")),
+        device_family=device_family,
+        os=os_name,
+        browser=browser,
+        ip_class=classify_ip(ip_address),
+        via_proxy="x_forwarded_for" in m,
+    )
+    if user is not None:
+        event.user = user
+    elif user_id is not None:
+        event.user_id = user_id
+    return event
+
+
+def log_auth_event(request, event_type, user=None, meta=None, user_id=None):
     """Auth event log kaydı oluşturur."""
     try:
-        m = dict(meta) if meta else {}
-        if request and request.META.get("HTTP_X_FORWARDED_FOR"):
-            m["x_forwarded_for"] = request.META["HTTP_X_FORWARDED_FOR"]
-        final_meta = m if m else None
-        AuthEventLog.objects.create(
-            user=user,
-            event_type=event_type,
-            ip_address=_get_client_ip(request),
-            user_agent=_get_user_agent(request),
-            meta=final_meta,
+        writer.submit(
+            build_auth_event(request, event_type, user=user, meta=meta, user_id=user_id)
         )
     except Exception:
         pass  # Log hatası uygulama akışını bozmasın
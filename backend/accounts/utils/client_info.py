@@ -0,0 +1,84 @@
+"""
+İstemci sınıflandırması (auth event yazımında bir kez hesaplanır).
+User agent: derlenmiş regex'ler + LRU önbellek (aynı UA metni tekrar tekrar gelir).
+IP: önceden kurulmuş ipaddress ağlarıyla yerel / özel ağ / genel / IPv6 sınıfı.
+"""
+import ipaddress
+import re
+from functools import lru_cache
+
+DEVICE_DESKTOP = "DESKTOP"
+DEVICE_MOBILE = "MOBILE"
+DEVICE_TABLET = "TABLET"
+DEVICE_BOT = "BOT"
+DEVICE_OTHER = "OTHER"
+
+IP_LOCAL = "LOCAL"
+IP_PRIVATE = "PRIVATE"
+IP_PUBLIC = "PUBLIC"
+IP_IPV6 = "IPV6"
+
+# Sıra önemli: ilk eşleşen kazanır (Edge/Opera UA'sında "Chrome" da geçer)
+_BROWSERS = [
+    (re.compile(r"Edg/", re.I), "Edge"),
+    (re.compile(r"OPR/", re.I), "Opera"),
+    (re.compile(r"Chrome|CriOS", re.I), "Chrome"),
+    (re.compile(r"Firefox|FxiOS", re.I), "Firefox"),
+    (re.compile(r"Safari", re.I), "Safari"),
+    (re.compile(r"MSIE|Trident", re.I), "IE"),
+]
+
+# Android UA'sında "Linux", iOS UA'sında "Mac OS X" da geçer: önce bunlar denenir
+_OS = [
+    (re.compile(r"Android", re.I), "Android"),
+    (re.compile(r"iPhone|iPad|iPod", re.I), "iOS"),
+    (re.compile(r"Windows", re.I), "Windows"),
+    (re.compile(r"Mac OS X|Macintosh", re.I), "macOS"),
+    (re.compile(r"CrOS", re.I), "ChromeOS"),
+    (re.compile(r"Linux", re.I), "Linux"),
+]
+
+_BOT = re.compile(r"bot|crawl|spider|slurp|curl|wget|python-requests|httpclient", re.I)
+_TABLET = re.compile(r"iPad|Tablet|Android(?!.*Mobile)", re.I)
+_MOBILE = re.compile(r"Mobile|iPhone|iPod|Android|Windows Phone", re.I)
+
+_LOCAL_NETWORKS = [ipaddress.ip_network(n) for n in ("127.0.0.0/8", "::1/128")]
+_PRIVATE_NETWORKS = [
+    ipaddress.ip_network(n)
+    for n in ("10.0.0.0/8", "172.16.0.0/12", "192.168.0.0/16", "169.254.0.0/16", "100.64.0.0/10", "fc00::/7", "fe80::/10")
+]
+
+
+@lru_cache(maxsize=2048)
+def parse_user_agent(user_agent):
+    """(device_family, os, browser) döner; boş UA için boş değerler."""
+    if not user_agent:
+        return "", "", ""
+    browser = next((name for pattern, name in _BROWSERS if pattern.search(user_agent)), "Other")
+    os_name = next((name for pattern, name in _OS if pattern.search(user_agent)), "Other")
+    if _BOT.search(user_agent):
+        device = DEVICE_BOT
+    elif _TABLET.search(user_agent):
+        device = DEVICE_TABLET
+    elif _MOBILE.search(user_agent):
+        device = DEVICE_MOBILE
+    elif os_name in ("Windows", "macOS", "Linux", "ChromeOS"):
+        device = DEVICE_DESKTOP
+    else:
+        device = DEVICE_OTHER
+    return device, os_name, browser
+
+
+def classify_ip(ip):
+    """LOCAL / PRIVATE / PUBLIC / IPV6 (genel IPv6); geçersiz veya boş IP için ""."""
+    if not ip:
+        return ""
+    try:
+        addr = ipaddress.ip_address(ip)
+    except ValueError:
+        return ""
+    if any(addr in net for net in _LOCAL_NETWORKS if net.version == addr.version):
+        return IP_LOCAL
+    if any(addr in net for net in _PRIVATE_NETWORKS if net.version == addr.version):
+        return IP_PRIVATE
+    return IP_IPV6 if addr.version == 6 else IP_PUBLIC
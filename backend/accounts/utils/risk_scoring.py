@@ -0,0 +1,104 @@
+"""
+Riskli öğretmen skoru (vektörel).
+Öğretmen başı sayaçlar birkaç aggregate sorguyla sütun dizileri olarak çekilir, skor
+NumPy ile tek seferde hesaplanır; top-N için tam sıralama yerine argpartition kullanılır.
+Ağırlıklar ve düşük giriş aktivitesi eşikleri ayarlardan gelir (RISKY_TEACHER_*).
+"""
+import numpy as np
+from django.conf import settings
+from django.db.models import Count, Q
+
+from accounts.models import AuthEventLog, TeacherProfile
+
+DEFAULT_WEIGHTS = {"inactive_students": 40, "must_change_password": 30, "low_login_activity": 30}
+# (en fazla giriş, skor): 0 => 1.0, 1-2 => 0.6, 3-5 => 0.3, daha fazlası => 0.0
+DEFAULT_LOGIN_BUCKETS = [(0, 1.0), (2, 0.6), (5, 0.3)]
+
+
+def load_teacher_risk_columns(cutoff):
+    """
+    Sütun dizileri (öğretmen sırası tüm dizilerde aynı): teacher_profile_id, teacher_user_id,
+    students_count, inactive_students_count, must_change_password_count, teacher_logins.
+    Öğretmen sayaçları tek sorgu, cutoff sonrası öğretmen girişleri tek sorgu.
+    """
+    inactive = Q(students__user__last_activity__last_login_success_at__isnull=True) | Q(
+        students__user__last_activity__last_login_success_at__lt=cutoff
+    )
+    rows = list(
+        TeacherProfile.objects.order_by("id").annotate(
+            students_count=Count("students"),
+            inactive_count=Count("students", filter=inactive),
+            mcp_count=Count("students", filter=Q(students__user__must_change_password=True)),
+        ).values_list("id", "user_id", "students_count", "inactive_count", "mcp_count")
+    )
+    logins = dict(
+        AuthEventLog.objects.filter(
+            user__teacher_profile__isnull=False,
+            event_type=AuthEventLog.EventType.LOGIN_SUCCESS,
+            created_at__gte=cutoff,
+        )
+        .order_by()
+        .values("user_id")
+        .annotate(c=Count("id"))
+        .values_list("user_id", "c")
+    )
+    table = np.array(rows, dtype=np.int64).reshape(-1, 5)
+    user_ids = table[:, 1]
+    return {
+        "teacher_profile_id": table[:, 0],
+        "teacher_user_id": user_ids,
+        "students_count": table[:, 2],
+        "inactive_students_count": table[:, 3],
+        "must_change_password_count": table[:, 4],
+        "teacher_logins": np.fromiter((logins.get(u, 0) for u in user_ids.tolist()), np.int64, len(user_ids)),
+    }
+
+
+class RiskScoringEngine:
+    def __init__(self, weights=None, login_buckets=None):
+        weights = {**DEFAULT_WEIGHTS, **(weights or getattr(settings, "RISKY_TEACHER_WEIGHTS", {}))}
+        buckets = sorted(login_buckets or getattr(settings, "RISKY_TEACHER_LOGIN_BUCKETS", DEFAULT_LOGIN_BUCKETS))
+        self.weights = weights
+        self._bucket_bounds = np.array([limit for limit, _ in buckets], dtype=np.int64)
+        # Son eşiği aşan giriş sayısı 0.0 alır
+        self._bucket_scores = np.array([score for _, score in buckets] + [0.0])
+
+    def low_login_activity(self, logins):
+        return self._bucket_scores[np.searchsorted(self._bucket_bounds, logins, side="left")]
+
+    def score(self, columns):
+        """(risk_score, inactive_ratio, must_change_password_ratio); öğrencisi olmayanın skoru 0."""
+        students = columns["students_count"]
+        has_students = students > 0
+        safe = np.where(has_students, students, 1)
+        inactive_ratio = np.where(has_students, columns["inactive_students_count"] / safe, 0.0)
+        mcp_ratio = np.where(has_students, columns["must_change_password_count"] / safe, 0.0)
+        raw = (
+            self.weights["inactive_students"] * inactive_ratio
+            + self.weights["must_change_password"] * mcp_ratio
+            + self.weights["low_login_activity"] * self.low_login_activity(columns["teacher_logins"])
+        )
+        risk = np.where(has_students, np.clip(raw, 0.0, 100.0), 0.0).round(2)
+        return risk, inactive_ratio, mcp_ratio
+
+    @staticmethod
+    def top(risk, columns, limit):
+        """
+        risk azalan, eşitlikte öğrenci sayısı azalan (sonra id) ilk limit indeks.
+        argpartition ile adaylar seçilir; yalnızca adaylar sıralanır.
+        """
+        n = len(risk)
+        if limit <= 0 or n == 0:
+            return np.empty(0, dtype=np.int64)
+        if limit < n:
+            kth = risk[np.argpartition(-risk, limit - 1)[:limit]].min()
+            # Sınırdaki eşit skorlar da aday: öğrenci sayısı sıralaması bozulmasın
+            candidates = np.flatnonzero(risk >= kth)
+        else:
+            candidates = np.arange(n)
+        order = np.lexsort((
+            columns["teacher_profile_id"][candidates],
+            -columns["students_count"][candidates],
+            -risk[candidates],
+        ))
+        return candidates[order][:limit]
@@ -0,0 +1,83 @@
+"""
+Tekil token (jti) iptali için süreç içi denylist.
+Kaynak RevokedToken tablosudur; her süreç tabloyu TOKEN_DENYLIST_SYNC_SECONDS'ta bir
+artımlı (revoked_at'e göre) okur. Aradaki isteklerde kontrol tamamen bellektedir:
+iptal edilmemiş token için sorgu yok. Kayıtlar token süresi dolunca budanır.
+Aynı süreçte yapılan iptal anında etkilidir; diğer süreçlerde en fazla sync aralığı kadar gecikir.
+"""
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+
+from accounts.models import RevokedToken
+
+# Farklı süreçlerde geç commit edilen satırlar kaçmasın diye okuma penceresi örtüşür
+_SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class TokenDenylist:
+    def __init__(self, sync_seconds=15):
+        self.sync_seconds = sync_seconds
+        self._entries = {}  # jti -> exp (epoch saniye)
+        self._lock = threading.Lock()
+        self._next_sync = 0.0
+        self._synced_until = None
+
+    def is_revoked(self, jti):
+        if not jti:
+            return False
+        self._maybe_sync()
+        exp = self._entries.get(jti)
+        return exp is not None and exp > time.time()
+
+    def add(self, jti, exp):
+        with self._lock:
+            self._entries[jti] = exp
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._next_sync = 0.0
+            self._synced_until = None
+
+    def _maybe_sync(self):
+        if time.monotonic() < self._next_sync:
+            return
+        with self._lock:
+            if time.monotonic() < self._next_sync:
+                return
+            now = timezone.now()
+            qs = RevokedToken.objects.filter(expires_at__gt=now)
+            if self._synced_until is not None:
+                qs = qs.filter(revoked_at__gte=self._synced_until - _SYNC_OVERLAP)
+            for jti, expires_at in qs.values_list("jti", "expires_at"):
+                self._entries[jti] = expires_at.timestamp()
+            cutoff = time.time()
+            self._entries = {j: e for j, e in self._entries.items() if e > cutoff}
+            self._synced_until = now
+            self._next_sync = time.monotonic() + self.sync_seconds
+
+
+denylist = TokenDenylist(sync_seconds=getattr(settings, "TOKEN_DENYLIST_SYNC_SECONDS", 15))
+
+
+def revoke_token(token, user=None):
+    """Token'ı (access veya refresh) süresi dolana kadar iptal eder."""
+    jti = token.get("jti")
+    exp = token.get("exp")
+    if not jti or not exp:
+        return
+    expires_at = datetime.fromtimestamp(exp, tz=dt_timezone.utc)
+    RevokedToken.objects.get_or_create(
+        jti=jti, defaults={"user": user, "expires_at": expires_at}
+    )
+    denylist.add(jti, exp)
+    # Süresi dolmuş kayıtlar artık hiçbir token'ı eşlemez
+    RevokedToken.objects.filter(expires_at__lt=timezone.now()).delete()
+
+
+def is_token_revoked(token):
+    return denylist.is_revoked(token.get("jti"))
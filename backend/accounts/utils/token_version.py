@@ -0,0 +1,55 @@
+"""
+token_version önbelleği.
+Her JWT doğrulamasında users tablosuna gitmemek için (token_version, is_active) çifti
+süreç içinde TTL + LRU ile tutulur. Aynı süreçte bump/invalidate anında etkilidir;
+diğer worker'larda en fazla TOKEN_VERSION_CACHE_TTL saniye gecikir.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+
+from shared.utils import TTLCache, MISSING
+
+_cache = TTLCache(
+    maxsize=getattr(settings, "TOKEN_VERSION_CACHE_MAX_SIZE", 10000),
+    ttl=getattr(settings, "TOKEN_VERSION_CACHE_TTL", 60),
+)
+
+
+def _key(user_id):
+    return str(user_id)
+
+
+def get_auth_state(user_id):
+    """
+    (token_version, is_active) döner; kullanıcı yoksa None.
+    Önbellekte yoksa tek kolonlu hafif bir sorgu atılır.
+    """
+    state = _cache.get(_key(user_id))
+    if state is not MISSING:
+        return state
+    User = get_user_model()
+    row = User.objects.filter(pk=user_id).values_list("token_version", "is_active").first()
+    state = (row[0] or 0, row[1]) if row else None
+    _cache.set(_key(user_id), state)
+    return state
+
+
+def remember_user(user):
+    """Zaten yüklenmiş user satırından önbelleği ısıtır (ek sorgu yok)."""
+    _cache.set(_key(user.pk), (getattr(user, "token_version", 0) or 0, user.is_active))
+
+
+def invalidate(user_id):
+    _cache.delete(_key(user_id))
+
+
+def clear():
+    _cache.clear()
+
+
+def bump_token_version(user):
+    """token_version'ı artırır: kullanıcının tüm mevcut tokenları geçersiz olur."""
+    user.token_version = (getattr(user, "token_version", 0) or 0) + 1
+    user.save(update_fields=["token_version"])
+    remember_user(user)
+    return user.token_version
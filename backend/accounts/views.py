@@ -1,4 +1,8 @@
-from rest_framework.decorators import api_view, permission_classes
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -8,9 +12,16 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
 from rest_framework_simplejwt.settings import api_settings
-from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
+from shared.utils import InvalidCursor, keyset_page
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from .serializers import TeacherRegisterSerializer, ForgotPasswordSerializer, ResetPasswordSerializer, MeUpdateSerializer, ChangePasswordSerializer
 from .utils.auth_logging import log_auth_event
+from .utils.token_version import bump_token_version, get_auth_state
+from .utils.token_denylist import is_token_revoked, revoke_token
+from .authentication import TRProfileAuthentication, add_user_claims
+from .services import record_login_success
+from .throttling import LoginThrottleMixin, reset_login_attempts
 from .models import AuthEventLog
 
 
@@ -57,15 +68,57 @@ def _me_response(user, request=None):
     })
 
 
+def _me_validators(user):
+    """
+    /auth/me/ için (ETag, Last-Modified). Sürüm damgası user.updated_at'tir; last_login
+    queryset update ile yazıldığından ve onaylayan e-postası başka satırda olduğundan ayrıca katılır.
+    """
+    stamps = [ts for ts in (user.updated_at, user.last_login) if ts]
+    last_modified = max(stamps) if stamps else None
+    ab = getattr(user, "approved_by", None)
+    raw = "|".join(
+        str(v) for v in (
+            user.pk,
+            user.updated_at.isoformat() if user.updated_at else "",
+            user.last_login.isoformat() if user.last_login else "",
+            ab.email if ab else "",
+        )
+    )
+    etag = 'W/"%s"' % hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+    return etag, last_modified
+
+
 @api_view(["GET", "PATCH"])
+@authentication_classes([TRProfileAuthentication])
 @permission_classes([IsAuthenticated])
 def me(request):
+    """
+    GET: ETag / If-Modified-Since destekli; profil değişmediyse 304 (gövdesiz) döner.
+    approved_by, kimlik doğrulamada user satırıyla aynı sorguda yüklenir.
+    """
     user = request.user
     if request.method == "PATCH":
         ser = MeUpdateSerializer(user, data=request.data, partial=True)
         ser.is_valid(raise_exception=True)
         ser.save()
-    return _me_response(user, request)
+
+    etag, last_modified = _me_validators(user)
+    last_modified_ts = int(last_modified.timestamp()) if last_modified else None
+    response = None
+    if request.method == "GET":
+        response = get_conditional_response(
+            request._request, etag=etag, last_modified=last_modified_ts
+        )
+    if response is None:
+        response = _me_response(user, request)
+
+    response.headers["ETag"] = etag
+    if last_modified_ts:
+        response.headers["Last-Modified"] = http_date(last_modified_ts)
+    # Tarayıcı cache'i her seferinde doğrulasın; yanıt kullanıcıya özel
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ["Authorization"])
+    return response
 
 
 class RegisterTeacherView(APIView):
@@ -76,8 +129,7 @@ class RegisterTeacherView(APIView):
         ser.is_valid(raise_exception=True)
         user = ser.save()
 
-        refresh = RefreshToken.for_user(user)
-        refresh["token_version"] = getattr(user, "token_version", 0)
+        refresh = add_user_claims(RefreshToken.for_user(user), user)
 
         return Response(
             {
@@ -102,8 +154,7 @@ class TRTokenObtainPairSerializer(TokenObtainPairSerializer):
     @classmethod
     def get_token(cls, user):
         token = super().get_token(user)
-        token["token_version"] = getattr(user, "token_version", 0)
-        return token
+        return add_user_claims(token, user)
 
     def validate(self, attrs):
         request = self.context.get("request")
@@ -120,54 +171,83 @@ class TRTokenObtainPairSerializer(TokenObtainPairSerializer):
             )
             raise AuthenticationFailed("E-posta veya şifre hatalı.")
 
-        # Başarılı login logla
-        log_auth_event(request, AuthEventLog.EventType.LOGIN_SUCCESS, user=self.user)
-
-        # JWT login sonrası last_login güncelle
-        self.user.last_login = timezone.now()
-        self.user.save(update_fields=["last_login"])
+        # Başarılı login: LOGIN_SUCCESS + last_login tek yazım biriminde
+        record_login_success(request, self.user)
+        reset_login_attempts(self.user.email)
 
         return data
 
 
-class TRTokenObtainPairView(TokenObtainPairView):
+class TRTokenObtainPairView(LoginThrottleMixin, TokenObtainPairView):
+    """Brute-force throttle authenticate() çalışmadan önce uygulanır."""
     serializer_class = TRTokenObtainPairSerializer
 
 
 class TRTokenRefreshSerializer(TokenRefreshSerializer):
-    """Refresh token doğrulamasında token_version kontrolü yapar."""
+    """
+    Refresh token tek kez decode edilir; token_version ve is_active önbellekten
+    (token_version.get_auth_state) kontrol edilir. Çözülen user_id event log için saklanır.
+    """
 
     def validate(self, attrs):
         refresh = self.token_class(attrs["refresh"])
+        self.user_id = None
+        if is_token_revoked(refresh):
+            raise AuthenticationFailed(
+                "Oturum sonlandırıldı. Lütfen tekrar giriş yapın.",
+                code="token_revoked",
+            )
+
         user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
         if user_id:
-            from django.contrib.auth import get_user_model
-            User = get_user_model()
-            try:
-                user = User.objects.get(**{api_settings.USER_ID_FIELD: user_id})
-            except User.DoesNotExist:
-                pass
-            else:
-                token_version = refresh.payload.get("token_version", 0)
-                user_version = getattr(user, "token_version", 0)
-                if token_version != user_version:
-                    raise AuthenticationFailed(
-                        "Token geçersiz. Lütfen tekrar giriş yapın.",
-                        code="token_version_mismatch",
-                    )
-        return super().validate(attrs)
+            state = get_auth_state(user_id)
+            if state is None or not state[1]:
+                raise AuthenticationFailed(
+                    self.error_messages["no_active_account"],
+                    "no_active_account",
+                )
+            if refresh.payload.get("token_version", 0) != state[0]:
+                raise AuthenticationFailed(
+                    "Token geçersiz. Lütfen tekrar giriş yapın.",
+                    code="token_version_mismatch",
+                )
+            self.user_id = user_id
+
+        data = {"access": str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                try:
+                    refresh.blacklist()
+                except AttributeError:
+                    pass  # blacklist app kurulu değil
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data["refresh"] = str(refresh)
+
+        return data
 
 
 class TRTokenRefreshView(TokenRefreshView):
     serializer_class = TRTokenRefreshSerializer
-    """Refresh token sonrası REFRESH event loglar."""
+    """Refresh token sonrası REFRESH event loglar (serializer'ın çözdüğü user_id ile)."""
 
     def post(self, request, *args, **kwargs):
-        response = super().post(request, *args, **kwargs)
-        # Token'dan user çıkarmak için decode gerekir; basit tutmak için
-        # refresh sonrası user bilgisi olmadan log atıyoruz (opsiyonel)
-        log_auth_event(request, AuthEventLog.EventType.REFRESH, user=None, meta={"event": "token_refresh"})
-        return response
+        serializer = self.get_serializer(data=request.data)
+        try:
+            serializer.is_valid(raise_exception=True)
+        except TokenError as e:
+            raise InvalidToken(e.args[0]) from e
+
+        log_auth_event(
+            request,
+            AuthEventLog.EventType.REFRESH,
+            user_id=serializer.user_id,
+            meta={"event": "token_refresh"},
+        )
+        return Response(serializer.validated_data, status=status.HTTP_200_OK)
 
 
 
@@ -198,11 +278,28 @@ class ResetPasswordView(APIView):
 
 
 class LogoutView(APIView):
-    """Logout sırasında LOGOUT event loglanır."""
+    """
+    Yalnızca bu oturumu kapatır: kullanılan access token ve gönderilen refresh token
+    (jti) iptal edilir. Diğer cihazlardaki oturumlar etkilenmez. LOGOUT event loglanır.
+    """
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
-        log_auth_event(request, AuthEventLog.EventType.LOGOUT, user=request.user)
+        user = request.user
+        if request.auth is not None:
+            revoke_token(request.auth, user=user)
+
+        raw_refresh = request.data.get("refresh") if hasattr(request.data, "get") else None
+        if raw_refresh:
+            try:
+                refresh = RefreshToken(raw_refresh)
+            except TokenError:
+                refresh = None
+            # Başka kullanıcıya ait refresh token ile iptal yapılamaz
+            if refresh is not None and str(refresh.get(api_settings.USER_ID_CLAIM)) == str(user.pk):
+                revoke_token(refresh, user=user)
+
+        log_auth_event(request, AuthEventLog.EventType.LOGOUT, user=user)
         return Response({"detail": "Başarıyla çıkış yapıldı."}, status=status.HTTP_200_OK)
 
 
@@ -212,8 +309,7 @@ class LogoutAllView(APIView):
 
     def post(self, request):
         user = request.user
-        user.token_version = (getattr(user, "token_version", 0) or 0) + 1
-        user.save(update_fields=["token_version"])
+        bump_token_version(user)
         log_auth_event(request, AuthEventLog.EventType.LOGOUT, user=user, meta={"logout_all": True})
         return Response({"success": True}, status=status.HTTP_200_OK)
 
@@ -230,7 +326,10 @@ class ChangePasswordView(APIView):
 
 
 class MeEventsView(APIView):
-    """GET /auth/me/events/ - kullanıcının kendi auth event logları (paginated)."""
+    """
+    GET /auth/me/events/ - kullanıcının kendi auth event logları.
+    Keyset sayfalama: ?cursor=<next_cursor>. Toplam sayı yalnızca ?include_total=1 ile hesaplanır.
+    """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
@@ -238,15 +337,16 @@ class MeEventsView(APIView):
 
         user = request.user
         days = int(request.query_params.get("days", 30))
-        page = max(1, int(request.query_params.get("page", 1)))
         page_size = min(50, max(1, int(request.query_params.get("page_size", 20))))
+        cursor = request.query_params.get("cursor") or None
 
         since = timezone.now() - timedelta(days=days)
-        qs = AuthEventLog.objects.filter(user=user, created_at__gte=since).order_by("-created_at")
+        qs = AuthEventLog.objects.filter(user=user, created_at__gte=since)
 
-        total = qs.count()
-        offset = (page - 1) * page_size
-        items_qs = qs[offset : offset + page_size]
+        try:
+            rows, next_cursor = keyset_page(qs, cursor, page_size)
+        except InvalidCursor as e:
+            raise ValidationError({"cursor": str(e)})
 
         items = [
             {
@@ -255,14 +355,21 @@ class MeEventsView(APIView):
                 "event_type": e.event_type,
                 "ip_address": e.ip_address or "",
                 "user_agent": e.user_agent or "",
+                "device_family": e.device_family,
+                "os": e.os,
+                "browser": e.browser,
+                "ip_class": e.ip_class,
+                "via_proxy": e.via_proxy,
                 "meta": e.meta or {},
             }
-            for e in items_qs
+            for e in rows
         ]
 
-        return Response({
+        data = {
             "items": items,
-            "total": total,
-            "page": page,
+            "next_cursor": next_cursor,
             "page_size": page_size,
-        })
+        }
+        if request.query_params.get("include_total") in ("1", "true"):
+            data["total"] = qs.count()
+        return Response(data)
@@ -458,10 +458,13 @@ class LessonTopicViewSet(AdminOnlyViewSet):
 
 # --- Legacy (IsAdminForWrite for read by non-admin) ---
 from rest_framework.viewsets import ModelViewSet
+from accounts.authentication import TRJWTClaimsAuthentication
 from .permissions import IsAdminForWrite
 
 
 class BaseCatalogViewSet(ModelViewSet):
+    # Okuma istekleri users tablosuna gitmez (claims-only JWT)
+    authentication_classes = [TRJWTClaimsAuthentication]
     permission_classes = [IsAuthenticated, IsApprovedUser, IsAdminForWrite]
 
 
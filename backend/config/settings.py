@@ -111,6 +111,20 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing policy
+# Listenin ilk elemanı tercih edilen algoritmadır; diğerleri eski hash'leri doğrulamak içindir.
+# Algoritma veya iteration değişince kullanıcı bir sonraki başarılı login'de yeniden hash'lenir.
+# Değeri seçmek için: python manage.py benchmark_login --iterations 600000,1000000
+PASSWORD_HASHERS = [
+    "accounts.hashers.TRPBKDF2PasswordHasher",
+    "accounts.hashers.TRPBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",  # argon2-cffi gerekir
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",  # bcrypt gerekir
+]
+PASSWORD_HASH_ITERATIONS = None  # PBKDF2 iteration; None = Django varsayılanı
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/6.0/topics/i18n/
 
@@ -141,8 +155,8 @@ CORS_ALLOWED_ORIGINS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.SessionAuthentication",  # ✅ admin login ile çalışır
-        "accounts.authentication.TRJWTAuthentication",  # ✅ frontend JWT + token_version
+        # ✅ Bearer -> JWT + token_version; session sadece SESSION_AUTH_PATH_PREFIXES altında
+        "accounts.authentication.TRRoutingAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -156,6 +170,68 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
+# Session auth'un denendiği path önekleri (SPA trafiği JWT ile gelir)
+SESSION_AUTH_PATH_PREFIXES = ("/admin/",)
+
+# token_version önbelleği (process-local). TTL, çoklu worker'da logout-all'un
+# diğer süreçlere yansıma gecikmesinin üst sınırıdır.
+TOKEN_VERSION_CACHE_TTL = 60  # saniye
+TOKEN_VERSION_CACHE_MAX_SIZE = 10000
+
+# Tekil logout (jti iptali): her süreç RevokedToken tablosunu bu aralıkla senkronlar.
+TOKEN_DENYLIST_SYNC_SECONDS = 15
+
+# Login throttle sayaçları: None = süreç içi; Django cache alias'ı verilirse paylaşımlı.
+# Limit ve pencere değerleri SiteSettings'ten okunur.
+LOGIN_THROTTLE_CACHE_ALIAS = None
+# IP limiti için güvenilen reverse proxy sayısı. 0: yalnızca REMOTE_ADDR (X-Forwarded-For
+# istemci tarafından yazılabilir). N: X-Forwarded-For'un sağdan N. adresi istemci sayılır.
+LOGIN_THROTTLE_TRUSTED_PROXY_COUNT = 0
+
+# AuthEventLog toplu yazıcı: kuyruk dolarsa senkron yazılır.
+AUTH_EVENT_LOG_ASYNC = True
+AUTH_EVENT_LOG_QUEUE_SIZE = 10000
+AUTH_EVENT_LOG_BATCH_SIZE = 200
+AUTH_EVENT_LOG_FLUSH_INTERVAL_MS = 500
+
+# AuthEventLog saklama: daha eski satırlar archive_auth_events ile aylık gzip JSONL'e taşınır.
+AUTH_EVENT_LOG_RETENTION_DAYS = 90
+AUTH_EVENT_ARCHIVE_DIR = BASE_DIR / "archive" / "auth_events"
+
+# Login-logs canlı akışı (SSE): süreç içi tampon + başka worker'lar için seyrek PK aralık sorgusu.
+AUTH_EVENT_STREAM_BUFFER_SIZE = 1000
+AUTH_EVENT_STREAM_SYNC_SECONDS = 5
+# Başka worker'da geç commit edilen (daha düşük id'li) satırlar için tarama örtüşmesi
+AUTH_EVENT_STREAM_SYNC_OVERLAP_SECONDS = 60
+AUTH_EVENT_STREAM_HEARTBEAT_SECONDS = 15
+AUTH_EVENT_STREAM_MAX_SECONDS = 300
+
+# Admin rapor önbelleği (süreç içi): TTL saniye taze, sonra STALE_TTL boyunca
+# STALE_WHILE_REVALIDATE açıksa bayat sonuç döner ve arka planda yenilenir.
+REPORT_CACHE_TTL = 60
+REPORT_CACHE_STALE_TTL = 300
+REPORT_CACHE_STALE_WHILE_REVALIDATE = False
+REPORT_CACHE_MAX_ENTRIES = 256
+# Gece snapshot'ları (snapshot_reports komutu): varsayılan parametreli istekler aynı gün
+# üretilmiş ReportSnapshot'tan döner. Snapshot araması (yoksa da) süreç içinde LOOKUP_TTL sn tutulur.
+REPORT_SNAPSHOTS_ENABLED = True
+REPORT_SNAPSHOT_LOOKUP_TTL = 60
+
+# Arka plan rapor işleri (run_report_jobs worker'ı, kuyruk ReportJob tablosu).
+REPORT_JOB_POLL_SECONDS = 2
+REPORT_JOB_STALE_SECONDS = 600
+REPORT_JOB_MAX_ATTEMPTS = 3
+# Çalışan iş bu aralıkla heartbeat yazar (satır akışından bağımsız); STALE_SECONDS bundan çok büyük olmalı.
+REPORT_JOB_HEARTBEAT_SECONDS = 30
+# İş sonuçları (e-posta/IP içerir) MEDIA_ROOT dışında tutulur; yalnızca admin indirme view'ı okur.
+REPORT_JOB_ROOT = BASE_DIR / "private" / "report_jobs"
+
+# Riskli öğretmen skoru: ağırlıklar (toplam 100) ve öğretmenin son INACTIVE_DAYS gündeki
+# giriş sayısına göre düşük aktivite skoru ((en fazla giriş, skor); son eşiğin üstü 0.0).
+RISKY_TEACHER_INACTIVE_DAYS = 14
+RISKY_TEACHER_WEIGHTS = {"inactive_students": 40, "must_change_password": 30, "low_login_activity": 30}
+RISKY_TEACHER_LOGIN_BUCKETS = [(0, 1.0), (2, 0.6), (5, 0.3)]
+
 # --- Password reset (DEV) ---
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 DEFAULT_FROM_EMAIL = "EDUMATH <no-reply@edumath.local>"
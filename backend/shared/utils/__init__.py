@@ -1,4 +1,27 @@
 from .strings import tr_capitalize_first, tr_upper
 from .phone import normalize_tr_phone
+from .ttl_cache import TTLCache, MISSING
+from .cursor import (
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    estimate_count,
+    keyset_filter_rows,
+    keyset_page,
+)
+from .hyperloglog import HyperLogLog
 
-__all__ = ["tr_capitalize_first", "tr_upper", "normalize_tr_phone"]
+__all__ = [
+    "tr_capitalize_first",
+    "tr_upper",
+    "normalize_tr_phone",
+    "TTLCache",
+    "MISSING",
+    "InvalidCursor",
+    "decode_cursor",
+    "encode_cursor",
+    "keyset_page",
+    "keyset_filter_rows",
+    "estimate_count",
+    "HyperLogLog",
+]
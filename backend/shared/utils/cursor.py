@@ -0,0 +1,82 @@
+"""
+Keyset (cursor) sayfalama: (zaman alanı, id) üzerinde azalan sıralama.
+OFFSET yerine son görülen satırın anahtarından devam edilir; maliyet sayfa derinliğinden bağımsızdır.
+Cursor, istemci için opak bir base64 token'dır.
+"""
+import base64
+import json
+
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(ts, pk):
+    raw = json.dumps({"t": ts.isoformat(), "id": pk}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Token'ı (saat dilimli datetime, id) olarak çözer; bozuksa InvalidCursor."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        ts = parse_datetime(data["t"])
+        pk = int(data["id"])
+    except (ValueError, TypeError, KeyError, AttributeError):
+        raise InvalidCursor("Geçersiz cursor.")
+    # encode_cursor hep saat dilimli yazar; elle düzenlenmiş naive zaman karşılaştırmada patlar
+    if ts is None or timezone.is_naive(ts):
+        raise InvalidCursor("Geçersiz cursor.")
+    return ts, pk
+
+
+def keyset_page(qs, cursor, page_size, field="created_at"):
+    """
+    qs'i (-field, -id) sırasıyla keser. (satırlar, next_cursor) döner;
+    sonraki sayfa yoksa next_cursor None'dır. Tek sorgu, page_size + 1 satır.
+    """
+    qs = qs.order_by(f"-{field}", "-id")
+    if cursor:
+        ts, pk = decode_cursor(cursor)
+        qs = qs.filter(Q(**{f"{field}__lt": ts}) | Q(**{field: ts, "id__lt": pk}))
+    rows = list(qs[: page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, field), last.pk)
+    return rows, next_cursor
+
+
+def keyset_filter_rows(rows, cursor):
+    """Bellekteki (created_at, pk) azalan sıralı satırları cursor'dan sonrasıyla sınırlar (üreteç)."""
+    if not cursor:
+        yield from rows
+        return
+    ts, pk = decode_cursor(cursor)
+    for row in rows:
+        if (row.created_at, row.pk) < (ts, pk):
+            yield row
+
+
+def estimate_count(qs):
+    """
+    Sorgunun satır sayısı için planner tahmini (yalnızca PostgreSQL; EXPLAIN, tablo taranmaz).
+    Desteklenmeyen veritabanlarında None döner.
+    """
+    connection = connections[qs.db]
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = qs.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,56 @@
+"""
+Süreç içi (process-local) TTL + LRU önbellek.
+Thread-safe; Django cache framework'üne gerek duymayan sıcak yollar için.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+MISSING = object()
+
+
+class TTLCache:
+    """
+    Boyutu sınırlı, süreli önbellek.
+    maxsize aşılınca en eski kullanılan (LRU) kayıt atılır; ttl saniye sonra kayıt geçersizdir.
+    get() bulunamayan/süresi dolan kayıt için MISSING döner (None geçerli bir değer olabilir).
+    """
+
+    def __init__(self, maxsize=1024, ttl=60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key, MISSING)
+            if item is MISSING:
+                return MISSING
+            expires_at, value = item
+            if expires_at <= now:
+                del self._data[key]
+                return MISSING
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
@@ -0,0 +1,33 @@
+# Generated by Django 6.0.2
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("site_settings", "0002_create_singleton"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="sitesettings",
+            name="login_throttle_enabled",
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddField(
+            model_name="sitesettings",
+            name="login_throttle_window_seconds",
+            field=models.PositiveIntegerField(default=300),
+        ),
+        migrations.AddField(
+            model_name="sitesettings",
+            name="login_throttle_ip_limit",
+            field=models.PositiveIntegerField(default=30),
+        ),
+        migrations.AddField(
+            model_name="sitesettings",
+            name="login_throttle_email_limit",
+            field=models.PositiveIntegerField(default=10),
+        ),
+    ]
@@ -40,6 +40,12 @@ class SiteSettings(models.Model):
     force_must_change_password_on_admin_reset = models.BooleanField(default=True)
     session_notice_enabled = models.BooleanField(default=True)
 
+    # Login brute-force throttle (kayan pencere, IP ve e-posta başına)
+    login_throttle_enabled = models.BooleanField(default=True)
+    login_throttle_window_seconds = models.PositiveIntegerField(default=300)
+    login_throttle_ip_limit = models.PositiveIntegerField(default=30)
+    login_throttle_email_limit = models.PositiveIntegerField(default=10)
+
     # Integrations
     analytics_tracking_id = models.CharField(max_length=255, blank=True, default="")
     sentry_dsn = models.CharField(max_length=500, blank=True, default="")
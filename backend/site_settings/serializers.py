@@ -35,6 +35,10 @@ class SiteSettingsSerializer(serializers.ModelSerializer):
             "force_strong_passwords",
             "force_must_change_password_on_admin_reset",
             "session_notice_enabled",
+            "login_throttle_enabled",
+            "login_throttle_window_seconds",
+            "login_throttle_ip_limit",
+            "login_throttle_email_limit",
             "analytics_tracking_id",
             "sentry_dsn",
             "updated_at",
@@ -93,6 +97,10 @@ class SiteSettingsUpdateSerializer(serializers.ModelSerializer):
             "force_strong_passwords",
             "force_must_change_password_on_admin_reset",
             "session_notice_enabled",
+            "login_throttle_enabled",
+            "login_throttle_window_seconds",
+            "login_throttle_ip_limit",
+            "login_throttle_email_limit",
             "analytics_tracking_id",
             "sentry_dsn",
         ]
@@ -105,6 +113,21 @@ class SiteSettingsUpdateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Port 1-65535 arasında olmalıdır.")
         return value
 
+    def validate_login_throttle_window_seconds(self, value):
+        if value < 1 or value > 86400:
+            raise serializers.ValidationError("Pencere 1-86400 saniye arasında olmalıdır.")
+        return value
+
+    def validate_login_throttle_ip_limit(self, value):
+        if value < 1:
+            raise serializers.ValidationError("Limit en az 1 olmalıdır.")
+        return value
+
+    def validate_login_throttle_email_limit(self, value):
+        if value < 1:
+            raise serializers.ValidationError("Limit en az 1 olmalıdır.")
+        return value
+
     def validate_timezone(self, value):
         if not value or not value.strip():
             raise serializers.ValidationError("Timezone boş olamaz.")
@@ -0,0 +1,24 @@
+"""
+SiteSettings okuma yardımcıları.
+Sıcak yollar (ör. login throttle) her istekte singleton satırını sorgulamasın diye
+kısa süreli süreç içi önbellek; PATCH sonrası bu süreçte hemen temizlenir.
+"""
+from shared.utils import TTLCache, MISSING
+
+from .models import SiteSettings
+
+SINGLETON_ID = 1
+_cache = TTLCache(maxsize=1, ttl=30)
+
+
+def get_cached_site_settings():
+    """Singleton SiteSettings (id=1) veya None. En fazla 30 sn bayat olabilir."""
+    obj = _cache.get(SINGLETON_ID)
+    if obj is MISSING:
+        obj = SiteSettings.objects.filter(id=SINGLETON_ID).first()
+        _cache.set(SINGLETON_ID, obj)
+    return obj
+
+
+def invalidate_site_settings_cache():
+    _cache.clear()
@@ -11,6 +11,7 @@ from accounts.permissions import IsAdminOnly
 
 from .models import SiteSettings
 from .serializers import SiteSettingsSerializer, SiteSettingsUpdateSerializer
+from .utils import invalidate_site_settings_cache
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +50,7 @@ class SiteSettingsView(APIView):
             setattr(obj, key, value)
         obj.updated_by = request.user
         obj.save()
+        invalidate_site_settings_cache()
 
         out_serializer = SiteSettingsSerializer(obj, context={"request": request})
         return Response(out_serializer.data)
@@ -390,8 +390,9 @@ export function AuthProvider({ children }: { children: ReactNode }) {
       broadcastLogout("logout_no_redirect")
     }
 
-    // Logout endpoint logs the event (token still valid here)
-    api.post("/auth/logout/").then(doLocalLogout).catch(doLocalLogout)
+    // Logout endpoint logs the event and revokes this session's access + refresh tokens
+    const refresh = localStorage.getItem(REFRESH_KEY)
+    api.post("/auth/logout/", refresh ? { refresh } : {}).then(doLocalLogout).catch(doLocalLogout)
   }
 
   const logoutAll = async () => {
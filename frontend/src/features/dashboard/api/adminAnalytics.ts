@@ -12,6 +12,7 @@ export type DashboardAnalytics = {
   role_distribution: { role: string; count: number }[]
   students_per_teacher: { teacher_id: number; teacher_name: string; count: number }[]
   weekly_active_trend: { week: string; count: number }[]
+  active_users: { dau: number; wau: number; mau: number }
 }
 
 export const adminAnalyticsKeys = {
@@ -34,7 +34,7 @@ export function WeeklyActiveTrendChart({ data, isLoading }: Props) {
       <CardHeader>
         <h3 className="text-sm font-medium">Haftalık Aktiflik Trendi</h3>
         <p className="text-xs text-muted-foreground">
-          Son 8 hafta (şimdilik yeni kayıt sayısı)
+          Son 8 hafta, giriş yapan tekil kullanıcı (yaklaşık)
         </p>
       </CardHeader>
       <CardContent>
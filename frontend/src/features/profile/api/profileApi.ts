@@ -12,11 +12,17 @@ export const profileApi = {
     return res.data
   },
 
-  async getEvents(params: { days?: number; page?: number; page_size?: number }): Promise<MeEventsResponse> {
+  async getEvents(params: {
+    days?: number
+    cursor?: string | null
+    page_size?: number
+    include_total?: boolean
+  }): Promise<MeEventsResponse> {
     const searchParams = new URLSearchParams()
     if (params.days != null) searchParams.set("days", String(params.days))
-    if (params.page != null) searchParams.set("page", String(params.page))
+    if (params.cursor) searchParams.set("cursor", params.cursor)
     if (params.page_size != null) searchParams.set("page_size", String(params.page_size))
+    if (params.include_total) searchParams.set("include_total", "1")
     const qs = searchParams.toString()
     const url = qs ? `/auth/me/events/?${qs}` : "/auth/me/events/"
     const res = await apiClient.get<MeEventsResponse>(url)
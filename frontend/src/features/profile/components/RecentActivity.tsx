@@ -35,19 +35,22 @@ function BrowserIcon({ browser }: { browser: string }) {
 
 export function RecentActivity() {
   const [days, setDays] = useState<7 | 30 | 90>(30)
-  const [page, setPage] = useState(1)
+  // Keyset sayfalama: ziyaret edilen sayfaların cursor yığını (ilk sayfa = null)
+  const [cursors, setCursors] = useState<(string | null)[]>([null])
   const pageSize = 20
+  const cursor = cursors[cursors.length - 1]
+  const page = cursors.length
 
   const { data, isLoading, refetch, isFetching } = useQuery({
-    queryKey: ["profile", "events", days, page, pageSize],
-    queryFn: () => profileApi.getEvents({ days, page, page_size: pageSize }),
+    queryKey: ["profile", "events", days, cursor, pageSize],
+    queryFn: () => profileApi.getEvents({ days, cursor, page_size: pageSize }),
   })
 
   const handleRefresh = useCallback(() => {
     refetch()
   }, [refetch])
 
-  const totalPages = data ? Math.ceil(data.total / pageSize) || 1 : 1
+  const hasNext = !!data?.next_cursor
 
   return (
     <div className="rounded-2xl border border-border bg-card p-6 shadow-sm">
@@ -60,7 +63,7 @@ export function RecentActivity() {
               type="button"
               onClick={() => {
                 setDays(opt.days)
-                setPage(1)
+                setCursors([null])
               }}
               className={`rounded-lg px-3 py-1.5 text-sm font-medium transition-colors ${
                 days === opt.days
@@ -102,8 +105,8 @@ export function RecentActivity() {
             <tbody>
               {data.items.map((row: AuthEventItem) => {
                 const badge = EVENT_BADGES[row.event_type] ?? { label: row.event_type, variant: "muted" as const }
-                const ipInfo = getIpInfo(row.ip_address, row.meta as { x_forwarded_for?: string })
-                const ua = parseUserAgent(row.user_agent)
+                const ipInfo = getIpInfo(row.ip_address, row.meta as { x_forwarded_for?: string }, row)
+                const ua = parseUserAgent(row.user_agent, row)
                 return (
                   <TableRow key={row.id} className="hover:bg-muted/60 transition-colors">
                     <TableCell className="whitespace-nowrap">
@@ -149,28 +152,25 @@ export function RecentActivity() {
               })}
             </tbody>
           </Table>
-          {totalPages > 1 && (
-            <div className="flex items-center justify-between pt-2">
-              <p className="text-sm text-muted-foreground">
-                Toplam {new Intl.NumberFormat("tr-TR").format(data.total)} kayıt
-              </p>
+          {(page > 1 || hasNext) && (
+            <div className="flex items-center justify-end pt-2">
               <div className="flex gap-2">
                 <Button
                   variant="ghost"
                   size="sm"
-                  onClick={() => setPage((p) => Math.max(1, p - 1))}
+                  onClick={() => setCursors((c) => (c.length > 1 ? c.slice(0, -1) : c))}
                   disabled={page <= 1}
                 >
                   Önceki
                 </Button>
                 <span className="flex items-center px-3 py-1 text-sm">
-                  {page} / {totalPages}
+                  Sayfa {page}
                 </span>
                 <Button
                   variant="ghost"
                   size="sm"
-                  onClick={() => setPage((p) => Math.min(totalPages, p + 1))}
-                  disabled={page >= totalPages}
+                  onClick={() => data?.next_cursor && setCursors((c) => [...c, data.next_cursor])}
+                  disabled={!hasNext}
                 >
                   Sonraki
                 </Button>
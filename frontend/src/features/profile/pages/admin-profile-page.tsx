@@ -43,7 +43,7 @@ function useProfileMe() {
 function useDevicesFromEvents() {
   const { data } = useQuery({
     queryKey: ["profile", "events", "devices", 30],
-    queryFn: () => profileApi.getEvents({ days: 30, page: 1, page_size: 50 }),
+    queryFn: () => profileApi.getEvents({ days: 30, page_size: 50 }),
   })
   return useMemo(() => {
     if (!data?.items) return []
@@ -104,7 +104,7 @@ function DevicesCard({ devices, onViewAll }: { devices: AuthEventItem[]; onViewA
       ) : (
         <ul className="space-y-3">
           {devices.map((e) => {
-            const ua = parseUserAgent(e.user_agent)
+            const ua = parseUserAgent(e.user_agent, e)
             return (
               <li key={e.id} className="flex items-center gap-3 text-sm">
                 <Smartphone className="h-4 w-4 text-muted-foreground shrink-0" />
@@ -28,14 +28,19 @@ export type AuthEventItem = {
   event_type: "LOGIN_SUCCESS" | "LOGIN_FAIL" | "LOGOUT" | "REFRESH"
   ip_address: string
   user_agent: string
+  device_family?: string
+  os?: string
+  browser?: string
+  ip_class?: string
+  via_proxy?: boolean
   meta: Record<string, unknown>
 }
 
 export type MeEventsResponse = {
   items: AuthEventItem[]
-  total: number
-  page: number
+  next_cursor: string | null
   page_size: number
+  total?: number
 }
 
 export type MeUpdatePayload = {
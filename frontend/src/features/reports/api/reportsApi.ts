@@ -1,4 +1,4 @@
-import { apiClient } from "@shared/api/client"
+import { apiClient, getAccessToken } from "@shared/api/client"
 import type {
   TeacherPerformanceItem,
   StudentProgressItem,
@@ -6,6 +6,7 @@ import type {
   MostUsedCourseItem,
   DailyLoginItem,
   LoginLogItem,
+  LoginClientItem,
   RiskyTeacherItem,
   InactiveStudentItem,
 } from "../types"
@@ -21,8 +22,13 @@ export type ReportQueryParams = {
   ordering?: string
   event_type?: string
   user_id?: string
+  device_family?: string
+  ip_class?: string
+  group_by?: "device_family" | "os" | "browser" | "ip_class"
   page?: number
   page_size?: number
+  cursor?: string | null
+  include_total?: "estimate" | "exact"
 }
 
 export const reportsKeys = {
@@ -39,10 +45,13 @@ export const reportsKeys = {
     [...reportsKeys.all, "daily-logins", params] as const,
   loginLogs: (params?: ReportQueryParams) =>
     [...reportsKeys.all, "login-logs", params] as const,
+  loginClients: (params?: ReportQueryParams) =>
+    [...reportsKeys.all, "login-clients", params] as const,
   riskyTeachers: (params?: ReportQueryParams) =>
     [...reportsKeys.all, "risky-teachers", params] as const,
   inactiveStudents: (params?: ReportQueryParams) =>
     [...reportsKeys.all, "inactive-students", params] as const,
+  reportJob: (id: number | null) => [...reportsKeys.all, "jobs", id] as const,
 }
 
 function buildParams(p?: ReportQueryParams): Record<string, string | number> {
@@ -57,7 +66,12 @@ function buildParams(p?: ReportQueryParams): Record<string, string | number> {
   if (p.limit) out.limit = p.limit
   if (p.event_type) out.event_type = p.event_type
   if (p.user_id) out.user_id = p.user_id
+  if (p.device_family) out.device_family = p.device_family
+  if (p.ip_class) out.ip_class = p.ip_class
+  if (p.group_by) out.group_by = p.group_by
   if (p.page) out.page = p.page
+  if (p.cursor !== undefined) out.cursor = p.cursor ?? ""
+  if (p.include_total) out.include_total = p.include_total
   if (p.page_size) out.page_size = p.page_size
   if (p.days != null) out.days = p.days
   if (p.limit != null) out.limit = p.limit
@@ -91,10 +105,17 @@ export async function fetchInactiveStudents(
   return res.data
 }
 
+export type TeacherPerformancePage = {
+  results: TeacherPerformanceItem[]
+  total: number
+  page: number
+  page_size: number
+}
+
 export async function fetchTeacherPerformance(
   params?: ReportQueryParams
-): Promise<{ results: TeacherPerformanceItem[] }> {
-  const res = await apiClient.get<{ results: TeacherPerformanceItem[] }>(
+): Promise<TeacherPerformancePage> {
+  const res = await apiClient.get<TeacherPerformancePage>(
     "/admin/reports/teacher-performance/",
     { params: buildParams(params) }
   )
@@ -133,27 +154,169 @@ export async function fetchMostUsedCourses(
 
 export async function fetchDailyLogins(
   params?: ReportQueryParams
-): Promise<{ results: DailyLoginItem[] }> {
-  const res = await apiClient.get<{ results: DailyLoginItem[] }>(
+): Promise<{ results: DailyLoginItem[]; period_unique_users: number }> {
+  const res = await apiClient.get<{ results: DailyLoginItem[]; period_unique_users: number }>(
     "/admin/reports/daily-logins/",
     { params: buildParams(params) }
   )
   return res.data
 }
 
-export async function fetchLoginLogs(
-  params?: ReportQueryParams
-): Promise<{
+export type LoginLogsPage = {
   items: LoginLogItem[]
-  total: number
-  page: number
+  next_cursor: string | null
+  has_more: boolean
   page_size: number
-}> {
-  const res = await apiClient.get<{
-    items: LoginLogItem[]
-    total: number
-    page: number
-    page_size: number
-  }>("/admin/reports/login-logs/", { params: buildParams(params) })
+  total_estimate?: number | null
+}
+
+/** Keyset modu (cursor): COUNT/OFFSET yok; ilk sayfa için cursor null. */
+export async function fetchLoginLogs(params?: ReportQueryParams): Promise<LoginLogsPage> {
+  const query = buildParams({ cursor: null, ...params })
+  delete query.page
+  const res = await apiClient.get<LoginLogsPage>("/admin/reports/login-logs/", { params: query })
+  return res.data
+}
+
+/**
+ * Login-logs canlı akışı (SSE). EventSource Authorization header gönderemediği için fetch
+ * ile okunur. Sunucu bağlantıyı periyodik kapatır; son event id ile yeniden bağlanılır.
+ * signal abort edilene kadar döner.
+ */
+export async function streamLoginLogs(
+  params: ReportQueryParams | undefined,
+  onItems: (items: LoginLogItem[]) => void,
+  signal: AbortSignal,
+  afterId?: number
+): Promise<void> {
+  const query = buildParams(params)
+  for (const key of ["page", "page_size", "cursor", "include_total", "date_from", "date_to"]) delete query[key]
+  let lastId: string | undefined = afterId != null ? String(afterId) : undefined
+
+  while (!signal.aborted) {
+    const search = new URLSearchParams(
+      Object.entries({ ...query, ...(lastId ? { after_id: lastId } : {}) }).map(([k, v]) => [k, String(v)])
+    )
+    try {
+      const res = await fetch(`${apiClient.defaults.baseURL}/admin/reports/login-logs/stream/?${search}`, {
+        headers: { Accept: "text/event-stream", Authorization: `Bearer ${getAccessToken() ?? ""}` },
+        signal,
+      })
+      if (!res.ok || !res.body) throw new Error(`stream ${res.status}`)
+      const reader = res.body.pipeThrough(new TextDecoderStream()).getReader()
+      let buffer = ""
+      for (;;) {
+        const { value, done } = await reader.read()
+        if (done) break
+        buffer += value
+        const frames = buffer.split("\n\n")
+        buffer = frames.pop() ?? ""
+        for (const frame of frames) {
+          let data = ""
+          for (const line of frame.split("\n")) {
+            if (line.startsWith("id: ")) lastId = line.slice(4)
+            else if (line.startsWith("data: ")) data += line.slice(6)
+          }
+          if (data) onItems((JSON.parse(data) as { items: LoginLogItem[] }).items)
+        }
+      }
+    } catch {
+      if (signal.aborted) return
+    }
+    // Sunucu kapattı veya hata: kısa bekleyip kaldığı yerden devam
+    await new Promise((resolve) => setTimeout(resolve, 3000))
+  }
+}
+
+export async function fetchLoginClients(
+  params?: ReportQueryParams
+): Promise<{ group_by: string; results: LoginClientItem[] }> {
+  const res = await apiClient.get<{ group_by: string; results: LoginClientItem[] }>(
+    "/admin/reports/login-clients/",
+    { params: buildParams(params) }
+  )
+  return res.data
+}
+
+export type ExportFormat = "csv" | "jsonl"
+
+/** Sunucu tarafı akış export'u (?format=csv|jsonl): sayfalama yok, filtreye uyan tüm satırlar. */
+export async function downloadReportExport(
+  report: string,
+  params?: ReportQueryParams,
+  format: ExportFormat = "csv"
+): Promise<void> {
+  const query = buildParams(params)
+  delete query.page
+  delete query.page_size
+  delete query.cursor
+  delete query.include_total
+  const res = await apiClient.get<Blob>(`/admin/reports/${report}/`, {
+    params: { ...query, format },
+    responseType: "blob",
+  })
+  const disposition = String(res.headers["content-disposition"] ?? "")
+  const match = disposition.match(/filename="([^"]+)"/)
+  const url = URL.createObjectURL(res.data)
+  const a = document.createElement("a")
+  a.href = url
+  a.download = match?.[1] ?? `report-${report}.${format}`
+  a.click()
+  URL.revokeObjectURL(url)
+}
+
+// --- Arka plan rapor işleri ---
+
+export type ReportJobStatus = "QUEUED" | "RUNNING" | "SUCCEEDED" | "FAILED"
+
+export type ReportJob = {
+  id: number
+  report: string
+  format: ExportFormat | "json"
+  params: Record<string, string>
+  status: ReportJobStatus
+  rows_written: number
+  attempts: number
+  error: string | null
+  created_at: string
+  started_at: string | null
+  finished_at: string | null
+  download_url: string | null
+}
+
+export async function createReportJob(
+  report: string,
+  params?: ReportQueryParams,
+  format: ExportFormat | "json" = "csv"
+): Promise<ReportJob> {
+  const query = buildParams(params)
+  delete query.page
+  delete query.page_size
+  delete query.cursor
+  delete query.include_total
+  const res = await apiClient.post<ReportJob>("/admin/reports/jobs/", {
+    report,
+    format,
+    params: query,
+  })
   return res.data
 }
+
+export async function fetchReportJob(id: number): Promise<ReportJob> {
+  const res = await apiClient.get<ReportJob>(`/admin/reports/jobs/${id}/`)
+  return res.data
+}
+
+export async function downloadReportJob(job: ReportJob): Promise<void> {
+  const res = await apiClient.get<Blob>(`/admin/reports/jobs/${job.id}/download/`, {
+    responseType: "blob",
+  })
+  const disposition = String(res.headers["content-disposition"] ?? "")
+  const match = disposition.match(/filename="?([^";]+)"?/)
+  const url = URL.createObjectURL(res.data)
+  const a = document.createElement("a")
+  a.href = url
+  a.download = match?.[1] ?? `report-${job.report}.${job.format}`
+  a.click()
+  URL.revokeObjectURL(url)
+}
@@ -1,6 +1,6 @@
 import { Button } from "@shared/ui/button"
 import { Input } from "@shared/ui/input"
-import { Download } from "lucide-react"
+import { Clock, Download } from "lucide-react"
 import type { DateRangePreset } from "../types"
 
 type ReportFiltersProps = {
@@ -16,6 +16,9 @@ type ReportFiltersProps = {
   showSearch?: boolean
   onExportCsv?: () => void
   exportLoading?: boolean
+  /** Uzun aralıklar için: dışa aktarmayı arka plan işi olarak başlatır */
+  onExportJob?: () => void
+  exportJobBusy?: boolean
 }
 
 const presets: { value: DateRangePreset; label: string }[] = [
@@ -38,6 +41,8 @@ export function ReportFilters({
   showSearch = false,
   onExportCsv,
   exportLoading = false,
+  onExportJob,
+  exportJobBusy = false,
 }: ReportFiltersProps) {
   return (
     <div className="flex flex-wrap items-center gap-3">
@@ -90,6 +95,12 @@ export function ReportFilters({
           CSV İndir
         </Button>
       )}
+      {onExportJob && (
+        <Button variant="secondary" size="sm" onClick={onExportJob} disabled={exportJobBusy}>
+          <Clock className="mr-2 h-4 w-4" />
+          Arka Planda Hazırla
+        </Button>
+      )}
     </div>
   )
 }
@@ -60,21 +60,22 @@ type Props = {
   data: LoginLogItem[]
   isLoading?: boolean
   page: number
-  total: number
-  pageSize: number
-  onPageChange?: (page: number) => void
+  hasMore: boolean
+  /** Yaklaşık toplam (planner / rollup tahmini); bilinmiyorsa null */
+  totalEstimate?: number | null
+  onPrev?: () => void
+  onNext?: () => void
 }
 
 export function LoginLogsTable({
   data,
   isLoading,
   page,
-  total,
-  pageSize,
-  onPageChange,
+  hasMore,
+  totalEstimate,
+  onPrev,
+  onNext,
 }: Props) {
-  const totalPages = Math.ceil(total / pageSize) || 1
-
   if (isLoading) {
     return (
       <div className="space-y-2">
@@ -108,8 +109,8 @@ export function LoginLogsTable({
         <tbody>
           {data.map((row) => {
             const badge = EVENT_BADGES[row.event_type] ?? { label: row.event_type, variant: "muted" as const }
-            const ipInfo = getIpInfo(row.ip_address, row.meta as { x_forwarded_for?: string })
-            const ua = parseUserAgent(row.user_agent)
+            const ipInfo = getIpInfo(row.ip_address, row.meta as { x_forwarded_for?: string }, row)
+            const ua = parseUserAgent(row.user_agent, row)
 
             const userDisplay = row.user
               ? `${row.user.name || row.user.email} (${row.user.email})`
@@ -186,27 +187,29 @@ export function LoginLogsTable({
           })}
         </tbody>
       </Table>
-      {totalPages > 1 && onPageChange && (
+      {(page > 1 || hasMore) && onPrev && onNext && (
         <div className="flex items-center justify-between">
           <p className="text-sm text-muted-foreground">
-            Toplam {new Intl.NumberFormat("tr-TR").format(total)} kayıt
+            {totalEstimate != null
+              ? `Yaklaşık ${new Intl.NumberFormat("tr-TR").format(totalEstimate)} kayıt`
+              : ""}
           </p>
           <div className="flex gap-2">
             <button
               type="button"
-              onClick={() => onPageChange(page - 1)}
+              onClick={onPrev}
               disabled={page <= 1}
               className="rounded border border-border px-3 py-1 text-sm disabled:opacity-50 hover:bg-muted"
             >
               Önceki
             </button>
             <span className="flex items-center px-3 py-1 text-sm">
-              {page} / {totalPages}
+              {page}. sayfa
             </span>
             <button
               type="button"
-              onClick={() => onPageChange(page + 1)}
-              disabled={page >= totalPages}
+              onClick={onNext}
+              disabled={!hasMore}
               className="rounded border border-border px-3 py-1 text-sm disabled:opacity-50 hover:bg-muted"
             >
               Sonraki
@@ -37,7 +37,7 @@ export function RiskyTeachersTable({ data, isLoading }: Props) {
     try {
       const res = await fetchInactiveStudents({
         teacher_profile_id: row.teacher_profile_id,
-        days: 14,
+        days: row.login_window_days,
         page_size: 100,
       })
       setStudents(res.items)
@@ -66,6 +66,8 @@ export function RiskyTeachersTable({ data, isLoading }: Props) {
     )
   }
 
+  const windowDays = data[0].login_window_days
+
   return (
     <>
       <Table>
@@ -76,7 +78,7 @@ export function RiskyTeachersTable({ data, isLoading }: Props) {
             <TableHead className="text-right">Öğrenci</TableHead>
             <TableHead className="text-right">Pasif Oran</TableHead>
             <TableHead className="text-right">Şifre Değiştir Oran</TableHead>
-            <TableHead className="text-right">Öğr. Giriş (14g)</TableHead>
+            <TableHead className="text-right">Öğr. Giriş ({windowDays}g)</TableHead>
             <TableHead>Risk Skoru</TableHead>
           </TableRow>
         </thead>
@@ -143,7 +145,7 @@ export function RiskyTeachersTable({ data, isLoading }: Props) {
           >
             <div className="flex items-center justify-between border-b border-border px-4 py-3">
               <h3 className="font-semibold">
-                {selectedTeacher.teacher_name} — Pasif Öğrenciler (14 gün)
+                {selectedTeacher.teacher_name} — Pasif Öğrenciler ({selectedTeacher.login_window_days} gün)
               </h3>
               <Button
                 variant="ghost"
@@ -16,9 +16,22 @@ function formatDate(s: string | null) {
 type Props = {
   data: TeacherPerformanceItem[]
   isLoading?: boolean
+  page: number
+  total: number
+  pageSize: number
+  onPageChange?: (page: number) => void
 }
 
-export function TeacherPerformanceTable({ data, isLoading }: Props) {
+export function TeacherPerformanceTable({
+  data,
+  isLoading,
+  page,
+  total,
+  pageSize,
+  onPageChange,
+}: Props) {
+  const totalPages = Math.ceil(total / pageSize) || 1
+
   if (isLoading) {
     return (
       <div className="space-y-2">
@@ -38,35 +51,65 @@ export function TeacherPerformanceTable({ data, isLoading }: Props) {
   }
 
   return (
-    <Table>
-      <thead>
-        <TableRow>
-          <TableHead>Öğretmen</TableHead>
-          <TableHead>Branş</TableHead>
-          <TableHead className="text-right">Öğrenci</TableHead>
-          <TableHead className="text-right">Şifre Değiştir</TableHead>
-          <TableHead className="text-right">Giriş Sayısı</TableHead>
-          <TableHead>Son Giriş</TableHead>
-        </TableRow>
-      </thead>
-      <tbody>
-        {data.map((row) => (
-          <TableRow key={row.teacher_profile_id}>
-            <TableCell className="font-medium">{row.teacher_name}</TableCell>
-            <TableCell>{row.branch_label ?? "—"}</TableCell>
-            <TableCell className="text-right">
-              {new Intl.NumberFormat("tr-TR").format(row.students_count)}
-            </TableCell>
-            <TableCell className="text-right">
-              {new Intl.NumberFormat("tr-TR").format(row.must_change_password_count)}
-            </TableCell>
-            <TableCell className="text-right">
-              {new Intl.NumberFormat("tr-TR").format(row.logins_count)}
-            </TableCell>
-            <TableCell>{formatDate(row.last_login_at)}</TableCell>
+    <div className="space-y-4">
+      <Table>
+        <thead>
+          <TableRow>
+            <TableHead>Öğretmen</TableHead>
+            <TableHead>Branş</TableHead>
+            <TableHead className="text-right">Öğrenci</TableHead>
+            <TableHead className="text-right">Şifre Değiştir</TableHead>
+            <TableHead className="text-right">Giriş Sayısı</TableHead>
+            <TableHead>Son Giriş</TableHead>
           </TableRow>
-        ))}
-      </tbody>
-    </Table>
+        </thead>
+        <tbody>
+          {data.map((row) => (
+            <TableRow key={row.teacher_profile_id}>
+              <TableCell className="font-medium">{row.teacher_name}</TableCell>
+              <TableCell>{row.branch_label ?? "—"}</TableCell>
+              <TableCell className="text-right">
+                {new Intl.NumberFormat("tr-TR").format(row.students_count)}
+              </TableCell>
+              <TableCell className="text-right">
+                {new Intl.NumberFormat("tr-TR").format(row.must_change_password_count)}
+              </TableCell>
+              <TableCell className="text-right">
+                {new Intl.NumberFormat("tr-TR").format(row.logins_count)}
+              </TableCell>
+              <TableCell>{formatDate(row.last_login_at)}</TableCell>
+            </TableRow>
+          ))}
+        </tbody>
+      </Table>
+      {totalPages > 1 && onPageChange && (
+        <div className="flex items-center justify-between">
+          <p className="text-sm text-muted-foreground">
+            Toplam {new Intl.NumberFormat("tr-TR").format(total)} öğretmen
+          </p>
+          <div className="flex gap-2">
+            <button
+              type="button"
+              onClick={() => onPageChange(page - 1)}
+              disabled={page <= 1}
+              className="rounded border border-border px-3 py-1 text-sm disabled:opacity-50 hover:bg-muted"
+            >
+              Önceki
+            </button>
+            <span className="flex items-center px-3 py-1 text-sm">
+              {page} / {totalPages}
+            </span>
+            <button
+              type="button"
+              onClick={() => onPageChange(page + 1)}
+              disabled={page >= totalPages}
+              className="rounded border border-border px-3 py-1 text-sm disabled:opacity-50 hover:bg-muted"
+            >
+              Sonraki
+            </button>
+          </div>
+        </div>
+      )}
+    </div>
   )
 }
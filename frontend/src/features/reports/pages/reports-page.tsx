@@ -1,5 +1,5 @@
-import { useState, useMemo } from "react"
-import { useQuery } from "@tanstack/react-query"
+import { useState, useMemo, useEffect } from "react"
+import { useQuery, useQueryClient } from "@tanstack/react-query"
 import { Button } from "@shared/ui/button"
 import { Switch } from "@shared/ui/switch"
 import { RefreshCw } from "lucide-react"
@@ -19,12 +19,18 @@ import {
   fetchMostUsedCourses,
   fetchDailyLogins,
   fetchLoginLogs,
+  streamLoginLogs,
   fetchRiskyTeachers,
   fetchInactiveStudents,
+  downloadReportExport,
+  createReportJob,
+  fetchReportJob,
+  downloadReportJob,
   reportsKeys,
 } from "../api/reportsApi"
+import type { LoginLogsPage, ReportQueryParams } from "../api/reportsApi"
 import { fetchTeachers } from "@features/admin/assignments/api"
-import type { DateRangePreset } from "../types"
+import type { DateRangePreset, ReportSnapshotInfo } from "../types"
 
 type TabId =
   | "teacher-performance"
@@ -45,6 +51,11 @@ const TABS: { id: TabId; label: string }[] = [
   { id: "alerts", label: "Uyarılar" },
 ]
 
+function formatSnapshotAge(seconds: number): string {
+  if (seconds < 3600) return `${Math.max(1, Math.round(seconds / 60))} dk önce`
+  return `${Math.round(seconds / 3600)} saat önce`
+}
+
 function getDateRange(preset: DateRangePreset): { from: string; to: string } {
   const now = new Date()
   const to = now.toISOString().slice(0, 10)
@@ -82,11 +93,13 @@ export function ReportsPage() {
   })
   const [search, setSearch] = useState("")
   const [teacherProfileId, setTeacherProfileId] = useState<string>("")
-  const [loginLogsPage, setLoginLogsPage] = useState(1)
+  // Login logs keyset sayfalama: ziyaret edilen sayfaların cursor yığını (ilk sayfa = null)
+  const [loginLogsCursors, setLoginLogsCursors] = useState<(string | null)[]>([null])
   const [eventTypeFilter, setEventTypeFilter] = useState("")
   const [loginLogsLive, setLoginLogsLive] = useState(false)
   const [inactiveDays, setInactiveDays] = useState(14)
   const [inactivePage, setInactivePage] = useState(1)
+  const [teacherPerfPage, setTeacherPerfPage] = useState(1)
 
   const params = useMemo(
     () => ({
@@ -94,11 +107,30 @@ export function ReportsPage() {
       date_to: `${dateTo}T23:59:59`,
       search: search || undefined,
       teacher_profile_id: teacherProfileId ? Number(teacherProfileId) : undefined,
-      page: loginLogsPage,
       page_size: 20,
       event_type: eventTypeFilter || undefined,
     }),
-    [dateFrom, dateTo, search, teacherProfileId, loginLogsPage, eventTypeFilter]
+    [dateFrom, dateTo, search, teacherProfileId, eventTypeFilter]
+  )
+
+  // Filtre değişince login logs ve öğretmen performansı ilk sayfaya döner
+  useEffect(() => {
+    setLoginLogsCursors([null])
+    setTeacherPerfPage(1)
+  }, [params])
+
+  const teacherPerfParams = useMemo(
+    (): ReportQueryParams => ({ ...params, page: teacherPerfPage }),
+    [params, teacherPerfPage]
+  )
+
+  const loginLogsParams = useMemo(
+    (): ReportQueryParams => ({
+      ...params,
+      cursor: loginLogsCursors[loginLogsCursors.length - 1],
+      include_total: "estimate",
+    }),
+    [params, loginLogsCursors]
   )
 
   const handlePresetChange = (p: DateRangePreset) => {
@@ -109,8 +141,8 @@ export function ReportsPage() {
   }
 
   const teacherPerf = useQuery({
-    queryKey: reportsKeys.teacherPerformance(params),
-    queryFn: () => fetchTeacherPerformance(params),
+    queryKey: reportsKeys.teacherPerformance(teacherPerfParams),
+    queryFn: () => fetchTeacherPerformance(teacherPerfParams),
     enabled: activeTab === "teacher-performance",
   })
 
@@ -145,12 +177,40 @@ export function ReportsPage() {
   })
 
   const loginLogs = useQuery({
-    queryKey: reportsKeys.loginLogs(params),
-    queryFn: () => fetchLoginLogs(params),
+    queryKey: reportsKeys.loginLogs(loginLogsParams),
+    queryFn: () => fetchLoginLogs(loginLogsParams),
     enabled: activeTab === "login-logs",
-    refetchInterval: activeTab === "login-logs" && loginLogsLive ? 30_000 : false,
   })
 
+  // Canlı mod: ilk sayfadayken yeni satırlar SSE ile gelir ve önbelleğe eklenir (yeniden sorgu yok)
+  const queryClient = useQueryClient()
+  const liveTail = activeTab === "login-logs" && loginLogsLive && loginLogsCursors.length === 1
+  useEffect(() => {
+    if (!liveTail) return
+    const controller = new AbortController()
+    const key = reportsKeys.loginLogs(loginLogsParams)
+    const shown = queryClient.getQueryData<LoginLogsPage>(key)?.items ?? []
+    streamLoginLogs(
+      params,
+      (items) =>
+        queryClient.setQueryData<LoginLogsPage>(key, (old) => {
+          if (!old) return old
+          const seen = new Set(old.items.map((i) => i.id))
+          const fresh = items.filter((i) => !seen.has(i.id))
+          if (!fresh.length) return old
+          return {
+            ...old,
+            items: [...fresh, ...old.items].slice(0, old.page_size),
+            has_more: old.has_more || old.items.length + fresh.length > old.page_size,
+            total_estimate: old.total_estimate != null ? old.total_estimate + fresh.length : old.total_estimate,
+          }
+        }),
+      controller.signal,
+      shown.length ? Math.max(...shown.map((i) => i.id)) : undefined
+    )
+    return () => controller.abort()
+  }, [liveTail, params, loginLogsParams, queryClient])
+
   const riskyTeachersParams = useMemo(
     () => ({
       date_from: `${dateFrom}T00:00:00`,
@@ -183,40 +243,47 @@ export function ReportsPage() {
     enabled: activeTab === "alerts",
   })
 
-  const handleExportTeacherCsv = () => {
-    const data = teacherPerf.data?.results ?? []
-    if (data.length === 0) return
-    const headers = ["Öğretmen", "Branş", "Öğrenci", "Şifre Değiştir", "Giriş", "Son Giriş"]
-    const rows = data.map((r) =>
-      [r.teacher_name, r.branch_label ?? "", r.students_count, r.must_change_password_count, r.logins_count, r.last_login_at ?? ""].join(";")
-    )
-    const csv = [headers.join(";"), ...rows].join("\n")
-    const blob = new Blob(["\ufeff" + csv], { type: "text/csv;charset=utf-8" })
-    const url = URL.createObjectURL(blob)
-    const a = document.createElement("a")
-    a.href = url
-    a.download = `report-teacher-performance-${dateFrom}-${dateTo}.csv`
-    a.click()
-    URL.revokeObjectURL(url)
+  const [exportLoading, setExportLoading] = useState(false)
+
+  const exportTargets: Partial<Record<TabId, { report: string; params: ReportQueryParams }>> = {
+    "teacher-performance": { report: "teacher-performance", params },
+    "student-progress": { report: "student-progress", params },
+    "most-active-teachers": { report: "most-active-teachers", params: { ...params, limit: 10 } },
+    "most-used-courses": { report: "most-used-courses", params: { ...params, limit: 10 } },
+    "daily-logins": { report: "daily-logins", params },
+    "login-logs": { report: "login-logs", params },
+    "alerts": { report: "inactive-students", params: inactiveStudentsParams },
+  }
+  const exportTarget = exportTargets[activeTab]
+
+  // Arka plan işi: oluşturulur, bitene kadar durumu yoklanır, sonra indirilir
+  const [reportJobId, setReportJobId] = useState<number | null>(null)
+  const reportJob = useQuery({
+    queryKey: reportsKeys.reportJob(reportJobId),
+    queryFn: () => fetchReportJob(reportJobId as number),
+    enabled: reportJobId != null,
+    refetchInterval: (query) => {
+      const jobStatus = query.state.data?.status
+      return jobStatus === "SUCCEEDED" || jobStatus === "FAILED" ? false : 2000
+    },
+  })
+  const reportJobBusy =
+    reportJob.data?.status === "QUEUED" || reportJob.data?.status === "RUNNING"
+
+  const handleExportJob = async () => {
+    if (!exportTarget) return
+    const job = await createReportJob(exportTarget.report, exportTarget.params, "csv")
+    setReportJobId(job.id)
   }
 
-  const handleExportLoginLogsCsv = () => {
-    const items = loginLogs.data?.items ?? []
-    if (items.length === 0) return
-    const headers = ["Tarih", "Olay", "Kullanıcı", "Email", "IP", "User Agent"]
-    const rows = items.map((r) => {
-      const email = r.user?.email ?? (r.meta as { email?: string })?.email ?? ""
-      const name = r.user?.name ?? ""
-      return [r.created_at, r.event_type, name, email, r.ip_address ?? "", r.user_agent ?? ""].join(";")
-    })
-    const csv = [headers.join(";"), ...rows].join("\n")
-    const blob = new Blob(["\ufeff" + csv], { type: "text/csv;charset=utf-8" })
-    const url = URL.createObjectURL(blob)
-    const a = document.createElement("a")
-    a.href = url
-    a.download = `report-login-logs-${dateFrom}-${dateTo}.csv`
-    a.click()
-    URL.revokeObjectURL(url)
+  const handleExportCsv = async () => {
+    if (!exportTarget) return
+    setExportLoading(true)
+    try {
+      await downloadReportExport(exportTarget.report, exportTarget.params, "csv")
+    } finally {
+      setExportLoading(false)
+    }
   }
 
   const activeQuery = {
@@ -228,6 +295,7 @@ export function ReportsPage() {
     "login-logs": loginLogs,
     "alerts": riskyTeachers,
   }[activeTab]
+  const snapshotInfo = (activeQuery.data as { snapshot?: ReportSnapshotInfo } | undefined)?.snapshot
 
   return (
     <div className="space-y-6">
@@ -237,6 +305,12 @@ export function ReportsPage() {
           <p className="mt-1 text-sm text-muted-foreground">
             Öğretmen, öğrenci ve sistem analitiği.
           </p>
+          {snapshotInfo && (
+            <p className="mt-1 text-xs text-muted-foreground">
+              Gece özetinden gösteriliyor ({formatSnapshotAge(snapshotInfo.age_seconds)} hesaplandı).
+              Güncel veri için filtreleri değiştirin.
+            </p>
+          )}
         </div>
         <Button
           variant="secondary"
@@ -300,15 +374,36 @@ export function ReportsPage() {
           showSearch={
             activeTab === "student-progress" || activeTab === "login-logs" || activeTab === "alerts"
           }
-          onExportCsv={
-            activeTab === "teacher-performance"
-              ? handleExportTeacherCsv
-              : activeTab === "login-logs"
-                ? handleExportLoginLogsCsv
-                : undefined
-          }
-          exportLoading={false}
+          onExportCsv={exportTarget ? handleExportCsv : undefined}
+          exportLoading={exportLoading}
+          onExportJob={exportTarget ? handleExportJob : undefined}
+          exportJobBusy={reportJobBusy}
         />
+        {reportJob.data && (
+          <div className="mt-3 flex items-center justify-between gap-4 rounded border border-border px-3 py-2 text-sm">
+            <span>
+              {reportJob.data.status === "QUEUED" && "Rapor sırada bekliyor…"}
+              {reportJob.data.status === "RUNNING" &&
+                `Rapor hazırlanıyor… (${new Intl.NumberFormat("tr-TR").format(reportJob.data.rows_written)} satır)`}
+              {reportJob.data.status === "SUCCEEDED" &&
+                `Rapor hazır: ${new Intl.NumberFormat("tr-TR").format(reportJob.data.rows_written)} satır.`}
+              {reportJob.data.status === "FAILED" &&
+                `Rapor hazırlanamadı: ${reportJob.data.error ?? "bilinmeyen hata"}`}
+            </span>
+            <div className="flex gap-2">
+              {reportJob.data.status === "SUCCEEDED" && (
+                <Button size="sm" onClick={() => reportJob.data && downloadReportJob(reportJob.data)}>
+                  İndir
+                </Button>
+              )}
+              {!reportJobBusy && (
+                <Button variant="secondary" size="sm" onClick={() => setReportJobId(null)}>
+                  Kapat
+                </Button>
+              )}
+            </div>
+          </div>
+        )}
         {activeTab === "student-progress" && (
           <div className="mt-3 flex gap-2">
             <select
@@ -365,7 +460,6 @@ export function ReportsPage() {
               value={eventTypeFilter}
               onChange={(e) => {
                 setEventTypeFilter(e.target.value)
-                setLoginLogsPage(1)
               }}
               className="rounded border border-border bg-background px-3 py-2 text-sm"
             >
@@ -380,7 +474,7 @@ export function ReportsPage() {
                 checked={loginLogsLive}
                 onCheckedChange={setLoginLogsLive}
               />
-              <span>Canlı (30 sn)</span>
+              <span>Canlı</span>
             </label>
           </div>
         )}
@@ -392,6 +486,10 @@ export function ReportsPage() {
           <TeacherPerformanceTable
             data={teacherPerf.data?.results ?? []}
             isLoading={teacherPerf.isLoading}
+            page={teacherPerf.data?.page ?? 1}
+            total={teacherPerf.data?.total ?? 0}
+            pageSize={teacherPerf.data?.page_size ?? 20}
+            onPageChange={setTeacherPerfPage}
           />
         )}
         {activeTab === "student-progress" && (
@@ -486,10 +584,14 @@ export function ReportsPage() {
           <LoginLogsTable
             data={loginLogs.data?.items ?? []}
             isLoading={loginLogs.isLoading}
-            page={loginLogs.data?.page ?? 1}
-            total={loginLogs.data?.total ?? 0}
-            pageSize={loginLogs.data?.page_size ?? 20}
-            onPageChange={setLoginLogsPage}
+            page={loginLogsCursors.length}
+            hasMore={loginLogs.data?.has_more ?? false}
+            totalEstimate={loginLogs.data?.total_estimate ?? null}
+            onPrev={() => setLoginLogsCursors((c) => (c.length > 1 ? c.slice(0, -1) : c))}
+            onNext={() => {
+              const next = loginLogs.data?.next_cursor
+              if (next) setLoginLogsCursors((c) => [...c, next])
+            }}
           />
         )}
       </div>
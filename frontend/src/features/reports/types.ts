@@ -1,5 +1,11 @@
 // Raporlama modülü tipleri
 
+/** Yanıt gece snapshot'ından geldiyse dolu (varsayılan parametreli istekler). */
+export type ReportSnapshotInfo = {
+  generated_at: string
+  age_seconds: number
+}
+
 export type TeacherPerformanceItem = {
   teacher_profile_id: number
   teacher_user_id: number
@@ -52,9 +58,20 @@ export type LoginLogItem = {
   user: { id: number; email: string; name: string; role?: string } | null
   ip_address: string | null
   user_agent: string | null
+  device_family?: string
+  os?: string
+  browser?: string
+  ip_class?: string
+  via_proxy?: boolean
   meta: Record<string, unknown> | null
 }
 
+export type LoginClientItem = {
+  value: string
+  count: number
+  unique_users: number
+}
+
 export type DateRangePreset = "7" | "30" | "90" | "custom"
 
 export type RiskyTeacherItem = {
@@ -67,7 +84,9 @@ export type RiskyTeacherItem = {
   inactive_students_ratio: number
   must_change_password_count: number
   must_change_password_ratio: number
+  /** Girişlerin sayıldığı pencere (RISKY_TEACHER_INACTIVE_DAYS); adı eski 14 günlük varsayılandan kalır */
   teacher_logins_last_14_days: number
+  login_window_days: number
   risk_score: number
 }
 
@@ -1,5 +1,6 @@
 /**
- * IP adresi sınıflandırması (frontend, basit regex/startsWith).
+ * IP adresi sınıflandırması. Backend'in yazım anında hesapladığı ip_class / via_proxy
+ * varsa o kullanılır; yoksa (eski arşiv satırları) basit regex/startsWith yedeği çalışır.
  * Tooltip için etiket üretir.
  */
 
@@ -8,9 +9,25 @@ export type IpInfo = {
   proxyHint?: string
 }
 
-export function getIpInfo(ip: string | null, meta?: { x_forwarded_for?: string } | null): IpInfo | null {
+const IP_CLASS_LABELS: Record<string, string> = {
+  LOCAL: "Yerel",
+  PRIVATE: "Özel Ağ",
+  PUBLIC: "Genel IP",
+  IPV6: "IPv6",
+}
+
+export function getIpInfo(
+  ip: string | null,
+  meta?: { x_forwarded_for?: string } | null,
+  server?: { ip_class?: string | null; via_proxy?: boolean | null }
+): IpInfo | null {
   if (!ip || !ip.trim()) return null
 
+  const serverLabel = server?.ip_class ? IP_CLASS_LABELS[server.ip_class] : undefined
+  if (serverLabel) {
+    return { label: `${serverLabel} (${ip})`, proxyHint: server?.via_proxy ? "Proxy olabilir" : undefined }
+  }
+
   let label: string
   if (ip === "127.0.0.1" || ip === "::1" || ip.startsWith("127.")) {
     label = "Yerel"
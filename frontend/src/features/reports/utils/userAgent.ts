@@ -1,6 +1,7 @@
 /**
  * Lightweight user agent parser – browser ve OS.
- * Ekstra kütüphane yok.
+ * Backend artık yazım anında browser/os alanlarını dolduruyor; bu parser yalnızca
+ * bu alanlar boşsa (eski arşiv satırları) yedek olarak çalışır. Ekstra kütüphane yok.
  */
 
 export type ParsedUserAgent = {
@@ -18,18 +19,22 @@ const BROWSERS = [
   { pattern: /MSIE|Trident/i, name: "IE" },
 ]
 
+// Android UA'sında "Linux", iOS UA'sında "Mac OS X" da geçer: önce bunlar denenir
 const OS_PATTERNS = [
-  { pattern: /Windows NT 10/i, name: "Windows" },
-  { pattern: /Windows NT 6\.[23]/i, name: "Windows" },
-  { pattern: /Windows/i, name: "Windows" },
-  { pattern: /Mac OS X/i, name: "macOS" },
-  { pattern: /Macintosh/i, name: "macOS" },
-  { pattern: /Linux/i, name: "Linux" },
   { pattern: /Android/i, name: "Android" },
   { pattern: /iPhone|iPad|iPod/i, name: "iOS" },
+  { pattern: /Windows/i, name: "Windows" },
+  { pattern: /Mac OS X|Macintosh/i, name: "macOS" },
+  { pattern: /Linux/i, name: "Linux" },
 ]
 
-export function parseUserAgent(ua: string | null | undefined): ParsedUserAgent {
+export function parseUserAgent(
+  ua: string | null | undefined,
+  server?: { browser?: string | null; os?: string | null }
+): ParsedUserAgent {
+  if (server?.browser && server?.os) {
+    return { browser: server.browser, os: server.os, label: `${server.browser} · ${server.os}` }
+  }
   const s = ua ?? ""
   let browser = "Other"
   let os = "Other"
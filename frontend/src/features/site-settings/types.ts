@@ -22,6 +22,10 @@ export type SiteSettings = {
   force_strong_passwords: boolean
   force_must_change_password_on_admin_reset: boolean
   session_notice_enabled: boolean
+  login_throttle_enabled: boolean
+  login_throttle_window_seconds: number
+  login_throttle_ip_limit: number
+  login_throttle_email_limit: number
   analytics_tracking_id: string
   sentry_dsn: string
   updated_at: string
@@ -49,6 +53,10 @@ export type SiteSettingsPatchPayload = Partial<{
   force_strong_passwords: boolean
   force_must_change_password_on_admin_reset: boolean
   session_notice_enabled: boolean
+  login_throttle_enabled: boolean
+  login_throttle_window_seconds: number
+  login_throttle_ip_limit: number
+  login_throttle_email_limit: number
   analytics_tracking_id: string
   sentry_dsn: string
 }>